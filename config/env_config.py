@@ -9,7 +9,32 @@ BROWSER = os.getenv("BROWSER", "chrome")
 SHORT_TIMEOUT = int(os.getenv("SHORT_TIMEOUT", 3))
 LONG_TIMEOUT = int(os.getenv("LONG_TIMEOUT", 10))
 VIDEO_RECORDING = os.getenv("VIDEO_RECORDING", "False").lower() == "true"
+VIDEO_RECORDER_MODE = os.getenv("VIDEO_RECORDER_MODE", "pipe").lower()
+VIDEO_JPEG_QUALITY = int(os.getenv("VIDEO_JPEG_QUALITY", 80))
+VIDEO_MAX_WIDTH = int(os.getenv("VIDEO_MAX_WIDTH", 1920))
+VIDEO_MAX_HEIGHT = int(os.getenv("VIDEO_MAX_HEIGHT", 1080))
+VIDEO_RING_SECONDS = float(os.getenv("VIDEO_RING_SECONDS", 30))
+VIDEO_ENCODE_SLOTS = int(os.getenv("VIDEO_ENCODE_SLOTS", 0))
+SCREENSHOT_FORMAT = os.getenv("SCREENSHOT_FORMAT", "webp").lower()
+SCREENSHOT_QUALITY = int(os.getenv("SCREENSHOT_QUALITY", 80))
+SCREENSHOT_SCALE = float(os.getenv("SCREENSHOT_SCALE", 1.0))
+ARTIFACT_STORE_DIR = os.getenv("ARTIFACT_STORE_DIR", "artifact_store")
+ARTIFACT_STORE_MAX_MB = int(os.getenv("ARTIFACT_STORE_MAX_MB", 2048))
+PERF_MODE = os.getenv("PERF_MODE", "False").lower() == "true"
+PERF_MODE_SCREENSHOT_EVERY = int(os.getenv("PERF_MODE_SCREENSHOT_EVERY", 10))
+DURATION_HISTORY = os.getenv("DURATION_HISTORY", "False").lower() == "true"
+DURATION_HISTORY_DB = os.getenv("DURATION_HISTORY_DB", "test_history/durations.sqlite")
+WORK_QUEUE = os.getenv("WORK_QUEUE", "")
+WORK_QUEUE_RUN_ID = os.getenv("WORK_QUEUE_RUN_ID", "")
+WORK_QUEUE_RERUNS = int(os.getenv("WORK_QUEUE_RERUNS", 1))
+WORK_QUEUE_LEASE_SECONDS = int(os.getenv("WORK_QUEUE_LEASE_SECONDS", 900))
+RESULT_CACHE = os.getenv("RESULT_CACHE", "False").lower() == "true"
+RESULT_CACHE_DB = os.getenv("RESULT_CACHE_DB", "test_history/result_cache.sqlite")
+RESULT_CACHE_MAX_AGE_HOURS = float(os.getenv("RESULT_CACHE_MAX_AGE_HOURS", 24))
+AUT_VERSION_HEADER = os.getenv("AUT_VERSION_HEADER", "")
+LOG_DIR = os.getenv("LOG_DIR", "test_logs")
 HEADLESS = os.getenv("HEADLESS", "True").lower() == "true"
 MAXIMIZED = os.getenv("MAXIMIZED", "False").lower() == "true"
 USERNAME = os.getenv("USERNAME", "tomsmith")
 PASSWORD = os.getenv("PASSWORD", "SuperSecretPassword!")
+UPLOAD_BENCHMARK_SIZES = os.getenv("UPLOAD_BENCHMARK_SIZES", "1KB,1MB,100MB")
@@ -3,16 +3,32 @@
 from __future__ import annotations
 
 import logging
+import os
+import socket
+from pathlib import Path
 
+import config.env_config as env_config
 from utils.logging_helper import configure_root_logger
+from utils.perf_mode import install_step_switch
+
+# Before any page object is imported: @allure.step wraps methods at import time
+install_step_switch()
 
 # Register plugin modules
 pytest_plugins = [
     "pytest_plugins.browser_fixtures",
     "pytest_plugins.directory_fixtures",
     "pytest_plugins.test_fixtures",
+    "pytest_plugins.http_fixtures",
+    "pytest_plugins.upload_fixtures",
     "pytest_plugins.recording_fixtures",
+    "pytest_plugins.perf_fixtures",
+    "pytest_plugins.duration_history",
+    "pytest_plugins.sharding",
     "pytest_plugins.hooks",
+    "pytest_plugins.work_queue",
+    "pytest_plugins.impact_selection",
+    "pytest_plugins.result_cache",
 ]
 
 # Constants shared across plugins
@@ -21,5 +37,8 @@ DEBUG_PORT_BASE = 9222
 WINDOW_WIDTH, WINDOW_HEIGHT = 1920, 1080
 CACHE_VALID_RANGE = 30
 
-# Configure root logger once for the test session
-root_logger = configure_root_logger(log_file="test_logs.log", level=logging.INFO)
+# Configure root logger once for the test session, one indexed log file per process: xdist workers by
+# worker id, other processes by host and pid (several --work-queue consumers may share the directory)
+PROCESS_LOG_NAME = os.environ.get("PYTEST_XDIST_WORKER") or f"main-{socket.gethostname()}-{os.getpid()}"
+LOG_FILE = Path(env_config.LOG_DIR) / f"{PROCESS_LOG_NAME}.log"
+root_logger = configure_root_logger(log_file=str(LOG_FILE), level=logging.INFO)
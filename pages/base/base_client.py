@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from logging import Logger
+from typing import TYPE_CHECKING, Any, TypeVar
+from urllib.parse import urljoin
+
+from config.env_config import BASE_URL
+from utils.http_client import DEFAULT_TIMEOUT, create_http_session
+from utils.logging_helper import get_logger
+
+if TYPE_CHECKING:
+    import requests
+
+ClientT = TypeVar("ClientT", bound="BaseClient")
+
+
+class BaseClient:
+    """
+    Base HTTP client for feature checks that don't need a browser.
+
+    Shares a pooled keep-alive requests.Session so consecutive (and parametrized) calls
+    reuse the same connections instead of opening a new one per request. A client created without
+    a session owns its own and closes it on exit when used as a context manager.
+    """
+
+    def __init__(self, session: requests.Session | None = None, logger: Logger | None = None) -> None:
+        self._owns_session = session is None
+        self.session = session if session is not None else create_http_session()
+        self.logger = logger if logger is not None else get_logger(self.__class__.__name__)
+        self.timeout = DEFAULT_TIMEOUT
+        self.base_url = BASE_URL
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a GET request through the pooled session.
+
+        Args:
+            url: Absolute URL or path relative to the base URL
+            **kwargs: Extra arguments forwarded to requests.Session.get
+
+        Returns:
+            requests.Response: The response object
+        """
+        full_url = urljoin(self.base_url, url)
+        kwargs.setdefault("timeout", self.timeout)
+        self.logger.debug(f"GET {full_url}.")
+        response = self.session.get(full_url, **kwargs)
+        self.logger.debug(f"GET {full_url} returned {response.status_code}.")
+        return response
+
+    def close(self) -> None:
+        """Close the session if this client created it; a shared session is closed by its owner."""
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self: ClientT) -> ClientT:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
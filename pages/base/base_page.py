@@ -15,13 +15,19 @@ from selenium.common.exceptions import (
     TimeoutException,
 )
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
 from config.env_config import BASE_URL, LONG_TIMEOUT, SHORT_TIMEOUT
+from utils.asset_validator import DEFAULT_CONCURRENCY, AssetReport, validate_assets
+from utils.dom_snapshot import DomSnapshot, snapshot_cache, source_slice
+from utils.download_manager import is_partial_download
+from utils.http_client import create_session_from_driver
 from utils.logging_helper import get_logger
+from utils.table_data import TableData
 
 if TYPE_CHECKING:
     Locator = tuple[str, str]
@@ -30,6 +36,22 @@ else:
 
 T = TypeVar("T")
 
+# Reads header texts and body cells column by column in one pass over the DOM
+READ_TABLE_JS = """
+const table = document.querySelector(arguments[0]);
+if (!table) { return null; }
+const headers = Array.from(table.querySelectorAll('thead th'), th => th.textContent.trim());
+const columns = headers.map(() => []);
+for (const body of table.tBodies) {
+    for (const row of body.rows) {
+        for (let i = 0; i < headers.length; i++) {
+            columns[i].push(row.cells[i] ? row.cells[i].textContent.trim() : '');
+        }
+    }
+}
+return {headers: headers, columns: columns};
+"""
+
 
 class BasePage:
     """
@@ -612,6 +634,58 @@ class BasePage:
             self.logger.error(f"Failed to get {attr}: {str(e)}")
             return None
 
+    def get_elements_property_js(self, locator: Locator, prop: str) -> list[Any]:
+        """
+        Read a property from every element matching a CSS locator in a single script call.
+
+        Args:
+            locator: Element locator tuple (must use By.CSS_SELECTOR)
+            prop: DOM property to read (e.g. "src", "href" - resolved to absolute URLs)
+
+        Returns:
+            list: Property values in document order (empty if none found)
+
+        Raises:
+            ValueError: If the locator is not a CSS selector
+            JavascriptException: If script execution fails
+        """
+        if locator[0] != By.CSS_SELECTOR:
+            raise ValueError(f"Only CSS selector locators are supported, got '{locator[0]}'")
+        try:
+            values = self.driver.execute_script(
+                "return Array.from(document.querySelectorAll(arguments[0]), e => e[arguments[1]]);",
+                locator[1],
+                prop,
+            )
+            self.logger.debug(f"Retrieved {len(values)} '{prop}' values for locator '{locator}'.")
+            return values
+        except JavascriptException as e:
+            self.logger.error(f"Failed to get '{prop}' for locator '{locator}': {str(e)}")
+            raise
+
+    def read_table(self, locator: Locator) -> TableData | None:
+        """
+        Read a whole table into a columnar structure with a single script call.
+
+        Args:
+            locator: Table locator tuple (must use By.CSS_SELECTOR)
+
+        Returns:
+            TableData | None: Headers and per-column cell text, or None if the table is not found
+
+        Raises:
+            ValueError: If the locator is not a CSS selector
+        """
+        if locator[0] != By.CSS_SELECTOR:
+            raise ValueError(f"Only CSS selector locators are supported, got '{locator[0]}'")
+        data = self.driver.execute_script(READ_TABLE_JS, locator[1])
+        if data is None:
+            self.logger.warning(f"Table not found for locator '{locator}'.")
+            return None
+        table = TableData(headers=data["headers"], columns=data["columns"])
+        self.logger.debug(f"Read table '{locator}': {len(table.headers)} columns, {table.row_count} rows.")
+        return table
+
     def get_current_url(self) -> str:
         """
         Get the current page URL.
@@ -634,6 +708,35 @@ class BasePage:
         self.logger.debug(f"Base URL: {url}")
         return url
 
+    def _wait_for_document_ready(self, timeout: int | float) -> None:
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                lambda d: d.execute_script("return document.readyState") == "complete",
+                message=f"Page not ready after {timeout}s",
+            )
+        except TimeoutException as e:
+            # Snapshot the document anyway even if not fully ready
+            self.logger.warning(f"Timeout waiting for page ready state: {str(e)}")
+
+    def get_dom_snapshot(self, timeout: int | float | None = None) -> DomSnapshot:
+        """
+        Get a structured snapshot of the current document.
+        The DOM is transferred only when it changed since the last snapshot (new navigation or mutation).
+
+        Args:
+            timeout: Optional timeout for waiting for document ready state
+
+        Returns:
+            DomSnapshot: Snapshot supporting local CSS/XPath/text queries
+        """
+        timeout = self._get_timeout(timeout, use_long=True)
+        self._wait_for_document_ready(timeout)
+        try:
+            return snapshot_cache.get(self.driver)
+        except Exception as e:
+            self.logger.error(f"Error getting DOM snapshot: {str(e)}")
+            raise
+
     def get_page_source(self, timeout: int | float | None = None, lowercase: bool = False) -> str:
         """
         Get the page source with optional wait for page readiness.
@@ -644,53 +747,65 @@ class BasePage:
 
         Returns:
             str: Page source HTML (optionally lowercased)
-
-        Raises:
-            TimeoutException: If page doesn't reach ready state within timeout
         """
-        timeout = self._get_timeout(timeout, use_long=True)
         self.logger.info("Getting page source.")
+        page_source = self.get_dom_snapshot(timeout).source
+        return page_source.lower() if lowercase else page_source
 
-        try:
-            # Wait for document ready state
-            wait = WebDriverWait(self.driver, timeout)
-            wait.until(
-                lambda d: d.execute_script("return document.readyState") == "complete",
-                message=f"Page not ready after {timeout}s",
-            )
-
-            time.sleep(1)
-            page_source = self.driver.page_source
-
-            if lowercase:
-                page_source = page_source.lower()
-                self.logger.debug("Retrieved page source (lowercased).")
-            else:
-                self.logger.debug("Retrieved page source.")
+    def get_page_source_slice(self, start: int = 0, end: int | None = None) -> str:
+        """
+        Get a slice of the page source without transferring the whole document.
 
-            return page_source
+        Args:
+            start: Start offset
+            end: End offset (None for the end of the document)
 
-        except TimeoutException as e:
-            self.logger.warning(f"Timeout waiting for page ready state: {str(e)}")
-            # Return page source anyway even if not fully ready
-            page_source = self.driver.page_source
-            return page_source.lower() if lowercase else page_source
-        except Exception as e:
-            self.logger.error(f"Error getting page source: {str(e)}")
-            raise
+        Returns:
+            str: The requested slice of the serialized DOM
+        """
+        page_source = source_slice(self.driver, start, end)
+        self.logger.debug(f"Retrieved page source slice [{start}:{end}] ({len(page_source)} chars).")
+        return page_source
 
     # ============================================================================
     # UTILITY METHODS
     # ============================================================================
 
+    def validate_assets(self, locator: Locator, prop: str, concurrency: int = DEFAULT_CONCURRENCY) -> list[AssetReport]:
+        """
+        Check reachability of all asset URLs on the page as one concurrent HTTP batch.
+
+        URLs are collected in a single script call and checked over a pooled session that
+        reuses the browser's cookies, without going through the WebDriver.
+
+        Args:
+            locator: CSS locator of the asset elements
+            prop: URL property to read from each element ("src" or "href")
+            concurrency: Maximum number of requests in flight
+
+        Returns:
+            list[AssetReport]: One report per element, each URL requested once
+        """
+        self.logger.info(f"Validating '{prop}' assets for locator '{locator}'.")
+        urls = self.get_elements_property_js(locator, prop)
+        session = create_session_from_driver(self.driver, pool_size=concurrency)
+        try:
+            return validate_assets(urls, session, concurrency=concurrency)
+        finally:
+            session.close()
+
     def get_files_in_directory(self, directory_path: Path) -> list:
         """
-        Get all files in a directory.
+        Get all completed files in a directory.
 
         Args:
             directory_path: Path to the directory
 
         Returns:
-            list: List of file paths in the directory
+            list: List of file paths in the directory (in-progress downloads and lock files excluded)
         """
-        return [item for item in directory_path.iterdir() if item.is_file()]
+        return [
+            item
+            for item in directory_path.iterdir()
+            if item.is_file() and not is_partial_download(item) and item.suffix != ".lock"
+        ]
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pages.features.basic_auth.basic_auth_client import BasicAuthClient
+from utils.logging_helper import get_logger
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+    import requests
+
+
+class ClientManager:
+    def __init__(self, session: requests.Session, logger: Logger | None = None) -> None:
+        self.session = session
+        # Share the pooled session so every client reuses the same keep-alive connections.
+        self.logger = logger if logger is not None else get_logger(__name__)
+
+    def get_basic_auth_client(self) -> BasicAuthClient:
+        return BasicAuthClient(self.session, self.logger)
@@ -107,8 +107,11 @@ class PageManager:
     def get_file_download_page(self) -> FilesDownloadPage:
         return self.main_page.click_file_download_link()
 
-    def get_file_upload_page(self) -> FileUploadPage:
-        return self.main_page.click_file_upload_link()
+    def get_file_upload_page(self, url: str | None = None) -> FileUploadPage:
+        if url is None:
+            return self.main_page.click_file_upload_link()
+        self.main_page.navigate_to(url)
+        return FileUploadPage(self.driver, self.logger)
 
     def get_floating_menu_page(self) -> FloatingMenuPage:
         return self.main_page.click_floating_menu_link()
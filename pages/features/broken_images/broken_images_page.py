@@ -11,7 +11,8 @@ if TYPE_CHECKING:
     from logging import Logger
 
     from selenium.webdriver.remote.webdriver import WebDriver
-    from selenium.webdriver.remote.webelement import WebElement
+
+    from utils.asset_validator import AssetReport
 
 
 class BrokenImagesPage(BasePage):
@@ -21,36 +22,24 @@ class BrokenImagesPage(BasePage):
         super().__init__(driver, logger)
         self.wait_for_page_to_load(BrokenImagesPageLocators.PAGE_LOADED_INDICATOR)
 
-    @allure.step("Get all image elements")
-    def _get_all_images(self) -> list:
-        self.logger.info("Get all image elements.")
-        return self.get_all_elements(BrokenImagesPageLocators.IMAGES)
-
-    @allure.step("Check if image is broken")
-    def _is_image_broken(self, image: WebElement) -> dict:
+    @allure.step("Validate all images in one parallel batch")
+    def get_images_report(self) -> list[AssetReport]:
         """
-        Check if an image is broken by verifying its natural width.
-
-        Args:
-            image: WebElement representing the image
+        Check every image source on the page concurrently over HTTP.
 
         Returns:
-            dict: Contains image source, broken status and natural width
+            list[AssetReport]: One report per image element
         """
-        self.logger.info("Check if image is broken.")
-        src = image.get_attribute("src")
-        natural_width = self.get_element_attr_js(image, "naturalWidth")
+        self.logger.info("Validate all images in one parallel batch.")
+        return self.validate_assets(BrokenImagesPageLocators.IMAGES, "src")
 
-        return {"src": src, "is_broken": not natural_width, "natural_width": natural_width}
+    def _is_image_broken(self, report: AssetReport) -> bool:
+        return not report.ok or not report.content_type.startswith("image/")
 
     @allure.step("Get count of broken images")
     def get_broken_images_count(self) -> int:
-        images = self._get_all_images()
-        results = [self._is_image_broken(img) for img in images]
-        return len([img for img in results if img["is_broken"]])
+        return len([report for report in self.get_images_report() if self._is_image_broken(report)])
 
     @allure.step("Get count of valid images")
     def get_valid_images_count(self) -> int:
-        images = self._get_all_images()
-        results = [self._is_image_broken(img) for img in images]
-        return len([img for img in results if not img["is_broken"]])
+        return len([report for report in self.get_images_report() if not self._is_image_broken(report)])
@@ -12,6 +12,23 @@ if TYPE_CHECKING:
 
     from selenium.webdriver.remote.webdriver import WebDriver
 
+    from utils.table_data import TableData
+
+# Starts counting DOM mutations of the table; the random token changes whenever the document is replaced
+TRACK_TABLE_JS = """
+const table = document.querySelector(arguments[0]);
+if (!table) { return null; }
+if (!window.__tableVersion) {
+    window.__tableToken = Math.random().toString(36).slice(2);
+    window.__tableVersion = 1;
+    new MutationObserver(() => { window.__tableVersion++; })
+        .observe(table, {childList: true, subtree: true, characterData: true});
+}
+return window.__tableToken + ':' + window.__tableVersion;
+"""
+
+TABLE_VERSION_JS = "return window.__tableVersion ? window.__tableToken + ':' + window.__tableVersion : null;"
+
 
 class ChallengingDomPage(BasePage):
     """Page object for the Challenging DOM page containing methods to interact with and validate page web elements."""
@@ -19,6 +36,9 @@ class ChallengingDomPage(BasePage):
     def __init__(self, driver: WebDriver, logger: Logger | None = None) -> None:
         super().__init__(driver, logger)
         self.wait_for_page_to_load(ChallengingDomPageLocators.PAGE_LOADED_INDICATOR)
+        self._table: TableData | None = None
+        self._table_version: str | None = None
+        self._table_maybe_stale = False
 
     @allure.step("Click {button_color} button")
     def click_colored_button(self, button_color: str) -> None:
@@ -37,49 +57,54 @@ class ChallengingDomPage(BasePage):
             self.logger.warning(f"Unknown button color requested: {button_color}")
             return
         self.click_element(btn)
+        self._table_maybe_stale = True
+
+    def _get_table(self) -> TableData | None:
+        """
+        Return the cached table, re-reading it only if the DOM changed since it was cached.
+
+        The version check runs only after an action on this page, so lookups between actions
+        never leave the process.
+        """
+        if self._table is not None and self._table_maybe_stale:
+            if self.driver.execute_script(TABLE_VERSION_JS) != self._table_version:
+                self.logger.debug("Table changed since it was cached - invalidating.")
+                self._table = None
+            self._table_maybe_stale = False
+
+        if self._table is None:
+            self._table_version = self.driver.execute_script(TRACK_TABLE_JS, ChallengingDomPageLocators.TABLE[1])
+            self._table = self.read_table(ChallengingDomPageLocators.TABLE)
+        return self._table
 
     @allure.step("Get table head text of column '{col}'")
     def get_table_head_text(self, col: str) -> None | str:
         """
         Return header text for the requested column name (exact match) or None.
-        This searches the thead th elements instead of relying purely on dynamic XPATHs.
         """
-        # Locate header elements directly for stability
-        headers = self.get_all_elements(ChallengingDomPageLocators.TABLE_HEADERS_TEXT)
-        if not headers:
+        table = self._get_table()
+        if table is None or col not in table.header_index:
             return None
-        for h in headers:
-            if h.text.strip() == col:
-                return h.text.strip()
-        # fallback to XPath approach
-        xpath = ChallengingDomPageLocators.TABLE_HEAD_TEXT[1].format(column_name=col)
-        return self.get_dynamic_element_text((ChallengingDomPageLocators.TABLE_HEAD_TEXT[0], xpath))
+        return table.headers[table.header_index[col]]
 
     @allure.step("Get table cell text '{cell}' under column '{col}'")
     def get_table_cell_text(self, col: str, cell: str) -> str | None:
-        headers = self.get_all_elements(ChallengingDomPageLocators.TABLE_HEADERS_TEXT)
-        if not headers:
-            # fallback to XPath approach
-            xpath = ChallengingDomPageLocators.TABLE_CELL_TEXT[1].format(column_name=col, cell_value=cell)
-            return self.get_dynamic_element_text((ChallengingDomPageLocators.TABLE_CELL_TEXT[0], xpath))
-
-        # find header index (0-based)
-        try:
-            idx = next(i for i, h in enumerate(headers) if h.text.strip() == col)
-        except StopIteration:
+        table = self._get_table()
+        if table is None or col not in table.header_index:
             self.logger.warning(f"Column '{col}' not found in table headers.")
             return None
 
-        # XPath that selects the td in the found column index with exact text match
-        xpath = f"//div[contains(@class,'example')]//table//tbody//tr/td[{idx + 1}][normalize-space()='{cell}']"
-        return self.get_dynamic_element_text((ChallengingDomPageLocators.TABLE_CELL_TEXT[0], xpath))
+        row = table.find_row(col, cell)
+        return table.cell(col, row) if row is not None else None
 
     @allure.step("Click edit button in row {row}")
     def click_edit_button(self, row: int) -> None:
         xpath = ChallengingDomPageLocators.EDIT_BTN[1].format(row_num=row)
         self.click_element((ChallengingDomPageLocators.EDIT_BTN[0], xpath))
+        self._table_maybe_stale = True
 
     @allure.step("Click delete button in row {row}")
     def click_delete_button(self, row: int) -> None:
         xpath = ChallengingDomPageLocators.DEL_BTN[1].format(row_num=row)
         self.click_element((ChallengingDomPageLocators.DEL_BTN[0], xpath))
+        self._table_maybe_stale = True
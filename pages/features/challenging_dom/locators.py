@@ -14,10 +14,5 @@ class ChallengingDomPageLocators:
     GREEN_BTN: Locator = (By.CSS_SELECTOR, "a[class='button success']")
     EDIT_BTN: Locator = (By.XPATH, "//tbody//tr['{row_num}']//a[(text()='edit')]")
     DEL_BTN: Locator = (By.XPATH, "//tbody//tr['{row_num}']//a[(text()='delete')]")
+    TABLE: Locator = (By.CSS_SELECTOR, "div.example table")
     TABLE_ROWS: Locator = (By.CSS_SELECTOR, "div.row tr")
-    TABLE_HEADERS_TEXT: Locator = (By.CSS_SELECTOR, "div.example table thead th")
-    TABLE_HEAD_TEXT: Locator = (By.XPATH, "//th[text()='{column_name}']")
-    TABLE_CELL_TEXT: Locator = (
-        By.XPATH,
-        "//th[text()='{column_name}']/ancestor::thead/following::tr//td[text()='{cell_value}']",
-    )
@@ -11,9 +11,9 @@ from selenium.common.exceptions import (
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
-from config.env_config import VIDEO_RECORDING
 from pages.base.base_page import BasePage
 from pages.features.context_menu.locators import ContextMenuPageLocators
+from utils.video_recorder import is_polling_driver
 
 if TYPE_CHECKING:
     from logging import Logger
@@ -70,8 +70,9 @@ class ContextMenuPage(BasePage):
 
     @allure.step("Right click on hot spot area and get alert text")
     def right_click_on_hot_spot_and_get_alert_text(self, actions: ActionChains) -> str:
-        if VIDEO_RECORDING:
-            self.logger.info("Video recording active – skipping alert text check")
+        if is_polling_driver(self.driver):
+            # Screenshots taken through the driver would dismiss the alert
+            self.logger.info("Video recording polls the driver – skipping alert text check")
             return "VIDEO_RECORDING_ACTIVE"
         self._perform_right_click_on_hotspot(actions)
         alert_text = self._get_context_menu_alert_text()
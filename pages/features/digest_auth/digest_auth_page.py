@@ -33,5 +33,4 @@ class DigestAuthPage(BasePage):
 
     @allure.step("Get page source for debug")
     def get_page_source_snippet(self) -> str:
-        source = self.driver.page_source
-        return source[:500]
+        return self.get_page_source_slice(0, 500)
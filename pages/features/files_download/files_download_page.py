@@ -1,18 +1,24 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
+from urllib.parse import unquote, urlsplit
 
 import allure
 
 from pages.base.base_page import BasePage
 from pages.features.files_download.locators import FilesDownloadPageLocators
+from utils.bulk_downloader import DEFAULT_CONCURRENCY, BulkDownloadResult, download_all
+from utils.http_client import create_session_from_driver
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
     from logging import Logger
     from pathlib import Path
 
     from selenium.webdriver.remote.webdriver import WebDriver
 
+    from utils.asset_validator import AssetReport
+
 
 class FilesDownloadPage(BasePage):
     """Page object for the Files Download page containing methods to interact with and validate page functionality"""
@@ -25,16 +31,78 @@ class FilesDownloadPage(BasePage):
         super().__init__(driver, logger)
         self.wait_for_page_to_load(FilesDownloadPageLocators.PAGE_LOADED_INDICATOR)
 
+    @staticmethod
+    def _links_to_file(href: str, text: str) -> bool:
+        """
+        Whether a link downloads the file it names. The page puts file names into hrefs unescaped,
+        so a name containing '#', '?' or a '%xx' sequence yields a link to some other (missing) file.
+        """
+        return "download" in href and bool(text) and unquote(urlsplit(href).path).rpartition("/")[2] == text
+
     @allure.step("Get list of downloadable files'")
     def get_list_of_downloadable_files(self) -> list[str]:
-        elements = self.get_all_elements(FilesDownloadPageLocators.FILE_LINK)
-        downloadable_files = []
-        for elem in elements:
-            href = elem.get_attribute("href")
-            text = elem.text
-            if href and "download" in href and text:
-                downloadable_files.append(text)
-        return downloadable_files
+        return [text for _, text in self.get_download_links()]
+
+    @allure.step("Get all download links")
+    def get_download_links(self) -> list[tuple[str, str]]:
+        """
+        Extract every download link's URL and file name in a single script call. Links whose URL
+        doesn't name their file are left out (and logged): they can't download it.
+
+        Returns:
+            list[tuple[str, str]]: (absolute URL, file name) pairs
+        """
+        links = self.driver.execute_script(
+            "return Array.from(document.querySelectorAll(arguments[0]), a => [a.href, a.textContent.trim()]);",
+            FilesDownloadPageLocators.FILE_LINK[1],
+        )
+        links = [(href, text) for href, text in links if href and "download" in href and text]
+        malformed = [text for href, text in links if not self._links_to_file(href, text)]
+        if malformed:
+            self.logger.warning(f"Skipping download links that don't name their file: {malformed}.")
+        return [(href, text) for href, text in links if self._links_to_file(href, text)]
+
+    @allure.step("Download all files over HTTP")
+    def download_all_files_via_http(
+        self, download_directory: Path, concurrency: int = DEFAULT_CONCURRENCY, file_names: Iterable[str] | None = None
+    ) -> list[BulkDownloadResult]:
+        """
+        Download every file on the page (or only the named ones) concurrently, outside the browser.
+
+        The driver's cookies are handed to a pooled HTTP session and each file is streamed
+        to disk in chunks and hashed as it arrives.
+
+        Args:
+            download_directory: Directory to write the files into
+            concurrency: Maximum number of downloads in flight
+            file_names: Only download the links with these file names
+
+        Returns:
+            list[BulkDownloadResult]: One result per downloaded link
+        """
+        links = self.get_download_links()
+        if file_names is not None:
+            wanted = set(file_names)
+            links = [(href, text) for href, text in links if text in wanted]
+        self.logger.info(f"Downloading {len(links)} files over HTTP into '{download_directory}'.")
+        session = create_session_from_driver(self.driver, pool_size=concurrency)
+        try:
+            return download_all(links, download_directory, session, concurrency=concurrency)
+        finally:
+            session.close()
+
+    @allure.step("Validate all download links in one parallel batch")
+    def get_download_links_report(self) -> list[AssetReport]:
+        """
+        Check every download link on the page (see get_download_links) concurrently over HTTP, without clicking.
+
+        Returns:
+            list[AssetReport]: One report per download link
+        """
+        self.logger.info("Validate all download links in one parallel batch.")
+        hrefs = {href for href, _ in self.get_download_links()}
+        reports = self.validate_assets(FilesDownloadPageLocators.FILE_LINK, "href")
+        return [report for report in reports if report.url in hrefs]
 
     @allure.step("Download file '{file_name}'")
     def download_file_by_filename(self, file_name: str, timeout: int = 10) -> None:
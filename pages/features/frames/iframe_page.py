@@ -22,9 +22,13 @@ class IframesPage(BasePage):
         logger: Logger | None = None,
     ) -> None:
         super().__init__(driver, logger)
-        if "read-only" not in self.driver.page_source.lower():
+        if not self.is_read_only():
             self.wait_for_page_to_load(IframesPageLocators.PAGE_LOADED_INDICATOR)
 
+    @allure.step("Check if the editor is in read-only mode")
+    def is_read_only(self) -> bool:
+        return self.get_dom_snapshot().contains("read-only", ignore_case=True)
+
     @allure.step("Switch to iframe'")
     def switch_to_iframe(self) -> None:
         self.switch_to_frame(IframesPageLocators.IFRAME)
@@ -26,7 +26,7 @@ class GeolocationPage(BasePage):
         if wait_for_load:
             self.wait_for_page_to_load(GeolocationPageLocators.PAGE_LOADED_INDICATOR)
 
-        # Inject geolocation mock for Firefox after page loads
+        # Inject geolocation mock for Firefox after page loads (in case the BiDi override isn't supported)
         if driver.capabilities.get("browserName", "").lower() == "firefox":
             self._inject_firefox_geolocation_mock()
 
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import time
+from collections.abc import Generator
 from typing import TYPE_CHECKING
 
 import allure
@@ -12,6 +14,44 @@ if TYPE_CHECKING:
 
     from selenium.webdriver.remote.webdriver import WebDriver
 
+# Installs a MutationObserver that queues the text of newly inserted items and wakes up a pending waiter.
+# jscroll inserts an empty item and fills it by a later .load(), so items are held until they have text.
+INSTALL_OBSERVER_JS = """
+const containerSelector = arguments[0], itemSelector = arguments[1];
+if (window.__scrollFeed) { return; }
+const feed = window.__scrollFeed = {queue: [], waiter: null};
+const loading = new Set();
+const container = document.querySelector(containerSelector) || document.body;
+new MutationObserver(mutations => {
+    for (const mutation of mutations) {
+        for (const node of mutation.addedNodes) {
+            if (node.nodeType === 1 && node.matches(itemSelector)) {
+                loading.add(node);
+            }
+        }
+    }
+    for (const node of loading) {
+        const text = node.textContent.trim();
+        if (text) {
+            loading.delete(node);
+            feed.queue.push(text);
+        }
+    }
+    if (feed.queue.length && feed.waiter) { feed.waiter(); }
+}).observe(container, {childList: true, subtree: true});
+"""
+
+# Scrolls to the bottom and resolves as soon as the observer reports new items (or on timeout)
+SCROLL_AND_DRAIN_JS = """
+const timeoutMs = arguments[0], done = arguments[arguments.length - 1];
+const feed = window.__scrollFeed;
+const drain = () => { const items = feed.queue; feed.queue = []; feed.waiter = null; done(items); };
+window.scrollTo(0, document.body.scrollHeight);
+if (feed.queue.length) { return drain(); }
+const timer = setTimeout(drain, timeoutMs);
+feed.waiter = () => { clearTimeout(timer); feed.waiter = null; setTimeout(drain, 0); };
+"""
+
 
 class InfiniteScrollPage(BasePage):
     """Page object for the Infinite Scroll page containing methods to interact with and validate page functionality"""
@@ -31,3 +71,62 @@ class InfiniteScrollPage(BasePage):
     @allure.step("Scroll to bottom of page")
     def scroll_to_bottom_of_page(self) -> None:
         self.scroll_to_bottom(wait_after=2)
+
+    def iter_new_items(
+        self,
+        max_items: int | None = None,
+        max_seconds: int | float | None = None,
+        max_bytes: int | None = None,
+        stall_timeout: int | float | None = None,
+    ) -> Generator[list[str], None, None]:
+        """
+        Scroll continuously and yield each batch of newly inserted items as soon as they appear.
+
+        A MutationObserver in the page reports inserted items, so every batch costs a single
+        round trip and no fixed sleeps.
+
+        Args:
+            max_items: Stop after this many items were yielded
+            max_seconds: Stop after this many seconds
+            max_bytes: Stop after this much item text was yielded
+            stall_timeout: Stop when no new items appear for this long (defaults to LONG_TIMEOUT)
+
+        Yields:
+            list[str]: Text of the items inserted since the previous batch
+        """
+        stall_timeout = self._get_timeout(stall_timeout, use_long=True)
+        previous_script_timeout = self.driver.timeouts.script
+        self.driver.set_script_timeout(stall_timeout + self.short_wait)
+        try:
+            self.driver.execute_script(
+                INSTALL_OBSERVER_JS,
+                InfiniteScrollPageLocators.SCROLL_CONTAINER[1],
+                InfiniteScrollPageLocators.ADDED_ITEMS[1],
+            )
+
+            started = time.perf_counter()
+            items_count = bytes_count = 0
+            while True:
+                batch = self.driver.execute_async_script(SCROLL_AND_DRAIN_JS, int(stall_timeout * 1000))
+                if not batch:
+                    self.logger.info(f"No new items after {stall_timeout}s - growth stalled.")
+                    return
+
+                if max_items is not None:
+                    batch = batch[: max_items - items_count]
+                items_count += len(batch)
+                bytes_count += sum(len(item.encode()) for item in batch)
+                self.logger.debug(f"Received {len(batch)} new items ({items_count} total).")
+                yield batch
+
+                if max_items is not None and items_count >= max_items:
+                    self.logger.info(f"Reached item limit: {items_count}.")
+                    return
+                if max_bytes is not None and bytes_count >= max_bytes:
+                    self.logger.info(f"Reached size limit: {bytes_count} bytes.")
+                    return
+                if max_seconds is not None and time.perf_counter() - started >= max_seconds:
+                    self.logger.info(f"Reached time limit: {max_seconds}s.")
+                    return
+        finally:
+            self.driver.set_script_timeout(previous_script_timeout)
@@ -9,3 +9,5 @@ from pages.base.base_page import Locator
 
 class InfiniteScrollPageLocators:
     PAGE_LOADED_INDICATOR: Locator = (By.CSS_SELECTOR, ".example h3")
+    SCROLL_CONTAINER: Locator = (By.CSS_SELECTOR, ".jscroll-inner")
+    ADDED_ITEMS: Locator = (By.CSS_SELECTOR, ".jscroll-added")
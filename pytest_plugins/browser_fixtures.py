@@ -22,6 +22,8 @@ from pytest_plugins.browser_helpers import (
     get_chrome_driver_path,
     get_firefox_driver_path,
 )
+from utils.cdp_client import CdpError
+from utils.instrumentation_hub import InstrumentationHub
 
 if TYPE_CHECKING:
     from _pytest.fixtures import FixtureRequest
@@ -36,6 +38,31 @@ def get_config_path(request: FixtureRequest, attr: str, error_msg: str) -> Path:
     return Path(value)
 
 
+def start_instrumentation_hub(driver: WebDriver, debug_port: int | None = None) -> InstrumentationHub | None:
+    """Open the instrumentation channel for a new driver; None if the browser doesn't expose one."""
+    try:
+        return InstrumentationHub(driver, debug_port).start()
+    except Exception as e:
+        root_logger.warning(f"Instrumentation hub unavailable, falling back to WebDriver commands: {str(e)}")
+        return None
+
+
+def set_geolocation_via_driver(driver: webdriver.Chrome) -> None:
+    """Grant geolocation and override the position through the driver's CDP command endpoint."""
+    driver.execute_cdp_cmd(
+        "Browser.grantPermissions",
+        {"origin": "https://the-internet.herokuapp.com", "permissions": ["geolocation"]},
+    )
+    driver.execute_cdp_cmd(
+        "Emulation.setGeolocationOverride",
+        {
+            "latitude": conftest_config.geolocation_lat,
+            "longitude": conftest_config.geolocation_lon,
+            "accuracy": 100,
+        },
+    )
+
+
 @pytest.fixture(scope="session")
 def driver(request: FixtureRequest) -> Generator[WebDriver, None, None]:
     """Initialize driver object at the start of each test."""
@@ -51,8 +78,10 @@ def driver(request: FixtureRequest) -> Generator[WebDriver, None, None]:
     worker_token = os.environ.get("PYTEST_XDIST_WORKER", str(os.getpid()))
     port_suffix = int("".join(ch for ch in worker_token if ch.isdigit()) or "0") % 1000
     debug_port = DEBUG_PORT_BASE + port_suffix
+    request.config.debug_port = debug_port  # type: ignore[attr-defined]
 
     driver: WebDriver | None = None
+    hub: InstrumentationHub | None = None
 
     try:
         if browser == "chrome":
@@ -60,26 +89,30 @@ def driver(request: FixtureRequest) -> Generator[WebDriver, None, None]:
             chrome_service = ChromeService(chrome_driver_path)
             chrome_options = build_chrome_options(user_data_dir, downloads_directory, debug_port)
             driver = webdriver.Chrome(service=chrome_service, options=chrome_options)
+            hub = start_instrumentation_hub(driver, debug_port)
 
             # Set geolocation override after driver initialization
-            driver.execute_cdp_cmd(
-                "Browser.grantPermissions",
-                {"origin": "https://the-internet.herokuapp.com", "permissions": ["geolocation"]},
-            )
-            driver.execute_cdp_cmd(
-                "Emulation.setGeolocationOverride",
-                {
-                    "latitude": conftest_config.geolocation_lat,
-                    "longitude": conftest_config.geolocation_lon,
-                    "accuracy": 100,
-                },
-            )
+            if hub is not None:
+                hub.set_geolocation(
+                    conftest_config.geolocation_lat,
+                    conftest_config.geolocation_lon,
+                    origin="https://the-internet.herokuapp.com",
+                )
+            else:
+                set_geolocation_via_driver(driver)
 
         elif browser == "firefox":
             firefox_driver_path = get_firefox_driver_path()
             firefox_service = FirefoxService(firefox_driver_path)
             firefox_options = build_firefox_options(user_data_dir, downloads_directory)
             driver = webdriver.Firefox(service=firefox_service, options=firefox_options)
+            hub = start_instrumentation_hub(driver)
+
+            if hub is not None:
+                try:
+                    hub.set_geolocation(conftest_config.geolocation_lat, conftest_config.geolocation_lon)
+                except CdpError as e:
+                    root_logger.warning(f"Geolocation override unavailable, the page mocks it instead: {str(e)}")
 
             driver.set_window_size(WINDOW_WIDTH, WINDOW_HEIGHT)
             if env_config.MAXIMIZED:
@@ -94,12 +127,16 @@ def driver(request: FixtureRequest) -> Generator[WebDriver, None, None]:
             except Exception:
                 pass
 
+        request.config.instrumentation_hub = hub  # type: ignore[attr-defined]
         yield driver
 
     except Exception as e:
         root_logger.error(f"Failed to initialize {browser} driver: {str(e)}")
         raise
     finally:
+        request.config.instrumentation_hub = None  # type: ignore[attr-defined]
+        if hub is not None:
+            hub.close()
         if driver is not None:
             root_logger.info(f"Quitting driver for browser: {browser}.")
             try:
@@ -108,6 +145,15 @@ def driver(request: FixtureRequest) -> Generator[WebDriver, None, None]:
                 root_logger.warning(f"Failed to quit driver: {str(e)}")
 
 
+@pytest.fixture(scope="session")
+def instrumentation_hub(request: FixtureRequest, driver: WebDriver) -> InstrumentationHub | None:
+    """
+    Instrumentation channel of the session's browser (CDP on Chrome, BiDi on Firefox), separate from
+    the driver's connection. None when it couldn't be opened.
+    """
+    return getattr(request.config, "instrumentation_hub", None)
+
+
 @pytest.fixture(scope="function")
 def actions(driver: WebDriver) -> ActionChains:
     """
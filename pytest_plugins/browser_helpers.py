@@ -166,6 +166,9 @@ def build_firefox_options(user_data_dir: Path, downloads_directory: Path) -> Fir
     profile.set_preference("signon.autofillForms", False)
     profile.set_preference("signon.management.page.breach-alerts.enabled", False)
 
+    # Expose the session's BiDi endpoint for the instrumentation hub
+    options.enable_bidi = True
+
     if env_config.HEADLESS:
         options.add_argument("--headless=new")
 
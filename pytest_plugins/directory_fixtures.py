@@ -13,9 +13,11 @@ from filelock import FileLock
 
 from conftest import root_logger
 from pytest_plugins.browser_helpers import get_worker_id
+from utils.download_manager import DownloadManager
 
 if TYPE_CHECKING:
     from _pytest.fixtures import FixtureRequest
+    from selenium.webdriver.remote.webdriver import WebDriver
 
 
 def clean_directory(dir_path: Path, lock_suffix: str = "lock") -> None:
@@ -85,3 +87,30 @@ def downloads_directory(request: FixtureRequest) -> Generator[Path, None, None]:
             root_logger.info(f"Cleaned downloads after test: {request.node.name}")
         except Exception as e:
             root_logger.warning(f"Failed to clean downloads: {str(e)}")
+
+
+@pytest.fixture(scope="function")
+def download_manager(request: FixtureRequest, driver: WebDriver) -> Generator[DownloadManager, None, None]:
+    """
+    Provides an event-driven DownloadManager writing into a fresh per-test directory.
+    Chrome downloads are redirected over CDP; Firefox keeps its profile download directory,
+    which is cleaned before the test and watched for completed files.
+    """
+    worker_id = get_worker_id()
+    if getattr(request.config, "browser", "chrome") == "chrome":
+        test_name = request.node.name.replace(":", "_").replace("/", "_")
+        downloads_dir = Path("downloads") / worker_id / test_name
+    else:
+        downloads_dir = Path("downloads") / worker_id
+    clean_directory(downloads_dir, worker_id)
+
+    manager = DownloadManager(driver, downloads_dir, getattr(request.config, "debug_port", None)).start()
+    yield manager
+
+    manager.close()
+    if request.node.get_closest_marker("clean_downloads"):
+        try:
+            clean_directory(downloads_dir, worker_id)
+            root_logger.info(f"Cleaned downloads after test: {request.node.name}")
+        except Exception as e:
+            root_logger.warning(f"Failed to clean downloads: {str(e)}")
@@ -0,0 +1,94 @@
+"""
+Per-test duration history: collected from test reports, written to SQLite at session end.
+Also provides the duration-aware xdist scheduler (--duration-scheduling) fed by that history.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+import config.env_config as env_config
+from conftest import root_logger
+from pytest_plugins.browser_helpers import get_worker_id
+from utils.duration_history import SessionDurations, load_durations
+from utils.duration_scheduler import DurationScheduling
+from utils.jsonl import append_jsonl
+
+if TYPE_CHECKING:
+    from _pytest.terminal import TerminalReporter
+    from xdist.remote import Producer
+
+SCHEDULE_METRICS_FILE = Path("reports") / "metrics" / "duration_scheduling.jsonl"
+
+# Only the controller collects: under xdist it receives every worker's reports
+_session_durations: SessionDurations | None = None
+
+
+def _report_worker(report: pytest.TestReport) -> str:
+    # The xdist controller attaches the sending worker node to relayed reports
+    gateway = getattr(getattr(report, "node", None), "gateway", None)
+    return getattr(gateway, "id", None) or get_worker_id()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--duration-scheduling",
+        action="store_true",
+        default=False,
+        help="With -n: schedule tests longest-first from the duration history, with work stealing",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    global _session_durations
+    is_worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if env_config.DURATION_HISTORY and not is_worker and not config.option.collectonly:
+        _session_durations = SessionDurations(browser=getattr(config, "browser", env_config.BROWSER.lower()))
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    # Passes reported from the result cache took no time
+    if _session_durations is not None and not hasattr(report, "result_cache"):
+        _session_durations.record(report.nodeid, report.when, report.duration, report.outcome, _report_worker(report))
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Append the session's durations to the history database."""
+    global _session_durations
+    if _session_durations is None or not _session_durations.tests:
+        return
+    db_path = Path(env_config.DURATION_HISTORY_DB)
+    try:
+        run_id = _session_durations.write(db_path, int(exitstatus))
+        root_logger.info(f"Recorded {len(_session_durations.tests)} test durations to {db_path} (run {run_id}).")
+    except Exception as e:
+        root_logger.warning(f"Failed to record test durations to {db_path}: {str(e)}")
+    _session_durations = None
+
+
+def pytest_xdist_make_scheduler(config: pytest.Config, log: Producer) -> DurationScheduling | None:
+    if not config.getoption("--duration-scheduling"):
+        return None
+    durations = load_durations(Path(env_config.DURATION_HISTORY_DB), getattr(config, "browser", None))
+    root_logger.info(f"Duration-aware scheduling with history for {len(durations)} tests.")
+    scheduler = DurationScheduling(config, log, durations)
+    config.duration_scheduler = scheduler  # type: ignore[attr-defined]
+    return scheduler
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter, config: pytest.Config) -> None:
+    """Report projected vs actual makespan of the duration-aware scheduler."""
+    scheduler: DurationScheduling | None = getattr(config, "duration_scheduler", None)
+    if scheduler is None or scheduler.collection is None:
+        return
+    summary = scheduler.summary()
+    terminalreporter.write_sep("-", "duration scheduling")
+    terminalreporter.write_line(
+        f"Projected makespan {summary['projected_makespan_seconds']}s, actual {summary['actual_makespan_seconds']}s "
+        f"({summary['tests_with_history']}/{summary['tests']} tests with history, {summary['steals']} steals)."
+    )
+    append_jsonl(SCHEDULE_METRICS_FILE, summary)
@@ -13,50 +13,75 @@ import allure
 import pytest
 from _pytest.main import Session
 from _pytest.nodes import Item
-from filelock import FileLock
 
 import config.conftest_config as conftest_config
 import config.env_config as env_config
 from conftest import WINDOW_HEIGHT, WINDOW_WIDTH, root_logger
 from pytest_plugins.browser_helpers import get_worker_id
+from utils import perf_mode
+from utils.allure_attachments import attach_by_reference
+from utils.artifact_store import get_artifact_store
+from utils.artifact_writer import get_artifact_writer, peek_artifact_writer
+from utils.log_index import get_indexed_handler, remove_stale_logs
 from utils.logging_helper import set_current_test
 
 if TYPE_CHECKING:
     from selenium.webdriver.remote.webdriver import WebDriver
 
+    from utils.instrumentation_hub import InstrumentationHub
 
-def save_screenshot_on_failure(driver: WebDriver, test_name: str) -> None:
-    """Capture and save screenshot on test failure."""
+
+def save_screenshot_on_failure(driver: WebDriver, test_name: str, config: pytest.Config) -> None:
+    """
+    Capture a screenshot on test failure and hand it to the background artifact writer.
+    Only the capture itself runs here; re-encoding, writing and filling the Allure attachment don't block the hook.
+    """
+    if not perf_mode.sample_screenshot(env_config.PERF_MODE_SCREENSHOT_EVERY):
+        return
     root_logger.info(f"Test {test_name} failed, capturing screenshot.")
     # Use worker ID to create unique screenshot directory for each parallel worker
-    worker_id = get_worker_id()
-    screenshot_dir = Path("tests_screenshots") / worker_id
+    screenshot_dir = Path("tests_screenshots") / get_worker_id()
     screenshot_filename = (
         f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{test_name.replace(':', '_').replace('/', '_')}.png"
     )
-    screenshot_path = Path(screenshot_dir) / screenshot_filename
-    lock_file = Path(screenshot_dir) / f"{worker_id}.lock"
+    screenshot_path = screenshot_dir / screenshot_filename
+
+    hub: InstrumentationHub | None = getattr(config, "instrumentation_hub", None)
+    try:
+        if hub is not None and hub.available:
+            screenshot = hub.screenshot_base64()
+        else:
+            screenshot = driver.get_screenshot_as_base64()
+    except Exception as e:
+        root_logger.error(f"Failed to capture screenshot for {test_name}: {str(e)}.")
+        return
+
+    writer = get_artifact_writer(
+        env_config.SCREENSHOT_FORMAT,
+        env_config.SCREENSHOT_QUALITY,
+        env_config.SCREENSHOT_SCALE,
+        get_artifact_store(env_config.ARTIFACT_STORE_DIR, env_config.ARTIFACT_STORE_MAX_MB),
+    )
+    attachment = None
+    try:
+        attachment = attach_by_reference(config, f"Failed_Screenshot_{test_name}", writer.mime_type, writer.extension)
+    except Exception as e:
+        root_logger.warning(f"Failed to attach screenshot to Allure report: {str(e)}.")
+    writer.submit(screenshot, screenshot_path, attachment)
+    root_logger.debug(f"Screenshot for {test_name} queued for {screenshot_path.with_suffix('.' + writer.extension)}.")
+
 
+def attach_test_log(item: Item) -> None:
+    """Attach the test's own slice of this process's log (from the per-test index) to the Allure report."""
+    handler = get_indexed_handler(root_logger)
+    if handler is None:
+        return
     try:
-        # Ensure directory exists before creating/using the lock
-        screenshot_dir.mkdir(parents=True, exist_ok=True)
-        # Acquire a lock inside the existing directory while writing the screenshot
-        with FileLock(lock_file):
-            root_logger.debug(f"Attempting to save screenshot to: {screenshot_path}.")
-            driver.save_screenshot(screenshot_path)
-        root_logger.info(f"Screenshot saved successfully to: {screenshot_path}.")
-        if allure is not None:
-            try:
-                allure.attach.file(
-                    screenshot_path,
-                    name=f"Failed_Screenshot_{test_name}",
-                    attachment_type=allure.attachment_type.PNG,
-                )
-                root_logger.info(f"Screenshot attached to Allure report for {test_name}.")
-            except Exception as e:
-                root_logger.warning(f"Failed to attach screenshot to Allure report: {str(e)}.")
+        log = handler.read_test(item.nodeid)
+        if log:
+            allure.attach(log, name=f"Log_{item.name}", attachment_type=allure.attachment_type.TEXT)
     except Exception as e:
-        root_logger.error(f"Failed to save screenshot to {screenshot_path}: {str(e)}.")
+        root_logger.warning(f"Failed to attach the log of {item.name}: {str(e)}")
 
 
 def pytest_addoption(parser: pytest.Parser) -> None:
@@ -68,6 +93,12 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         help="Browser to run tests: chrome or firefox",
         choices=["chrome", "firefox"],
     )
+    parser.addoption(
+        "--perf-mode",
+        action="store_true",
+        default=False,
+        help="Strip reporting overhead: no Allure steps, WARNING logging, no video, sampled screenshots",
+    )
 
 
 @pytest.hookimpl(tryfirst=True)
@@ -87,6 +118,9 @@ def pytest_configure(config: pytest.Config) -> None:
     # Store for use in fixtures
     config.browser = browser  # type: ignore[attr-defined]
 
+    if config.getoption("--perf-mode", default=False) or env_config.PERF_MODE:
+        perf_mode.apply(True)
+
     # Get the allure results directory from pytest options
     allure_results_dir = getattr(config.option, "allure_report_dir", None)
 
@@ -116,6 +150,12 @@ def pytest_configure(config: pytest.Config) -> None:
         if is_ci_environment:
             root_logger.info(f"Running in CI environment - preserving existing results in: {allure_results_path}")
 
+    # Per-process logs of earlier runs (and of exited --work-queue consumers) would pile up in the log directory
+    if not is_xdist_worker:
+        stale_logs = remove_stale_logs(Path(env_config.LOG_DIR))
+        if stale_logs:
+            root_logger.info(f"Removed {len(stale_logs)} logs of earlier runs from {env_config.LOG_DIR}.")
+
     env_properties_path = allure_results_path / "environment.properties"
     with open(env_properties_path, "w") as f:
         f.write(f"Browser={browser.capitalize()}\n")
@@ -123,6 +163,7 @@ def pytest_configure(config: pytest.Config) -> None:
         f.write(f"Maximized={env_config.MAXIMIZED}\n")
         f.write(f"Base.URL={env_config.BASE_URL}\n")
         f.write(f"Window.Size={WINDOW_WIDTH}x{WINDOW_HEIGHT}\n")
+        f.write(f"Perf.Mode={perf_mode.is_enabled()}\n")
         if os.environ.get("GITHUB_ACTIONS"):
             f.write(f"Run.ID={os.environ.get('GITHUB_RUN_ID', 'N/A')}\n")
             f.write(f"Workflow={os.environ.get('GITHUB_WORKFLOW', 'N/A')}\n")
@@ -137,10 +178,15 @@ def pytest_runtest_makereport(item: Item) -> Generator[None, None, None]:
     Pytest hook to handle:
         - Test duration logging.
         - Screenshot taking on test failure (Locally and to Allure Report).
+        - Attaching the failed test's log slice to the Allure Report.
     """
     outcome = yield
     report = outcome.get_result()  # type: ignore[attr-defined]
 
+    # Consumed by fixture teardowns, e.g. the on-failure video recorder (reset on every rerun's setup)
+    if report.when == "setup" or (report.when == "call" and report.failed):
+        item.test_failed = report.failed  # type: ignore[attr-defined]
+
     if report.when == "call":
         test_name = item.name
         duration = report.duration if hasattr(report, "duration") else 0
@@ -154,12 +200,11 @@ def pytest_runtest_makereport(item: Item) -> Generator[None, None, None]:
             driver = item.funcargs.get("driver") if hasattr(item, "funcargs") else None
             if driver:
                 try:
-                    save_screenshot_on_failure(driver, test_name)
+                    save_screenshot_on_failure(driver, test_name, item.config)
                 except Exception as e:
                     root_logger.error(f"Failed to save screenshot for {test_name}: {str(e)}")
 
     elif report.when == "teardown":
-        set_current_test(None)
         # Log teardown failures explicitly
         if report.failed:
             root_logger.error(f"Test teardown failed for: {item.name}")
@@ -167,19 +212,37 @@ def pytest_runtest_makereport(item: Item) -> Generator[None, None, None]:
             driver = item.funcargs.get("driver") if hasattr(item, "funcargs") else None
             if driver:
                 try:
-                    save_screenshot_on_failure(driver, item.name)
+                    save_screenshot_on_failure(driver, item.name, item.config)
                 except Exception as e:
                     root_logger.error(f"Failed to save screenshot for {item.name}: {str(e)}")
+        # The whole test, teardown included, is logged by now
+        if report.failed or getattr(item, "test_failed", False):
+            attach_test_log(item)
+        set_current_test(None)
 
 
 @pytest.hookimpl(tryfirst=True)
 def pytest_sessionfinish(session: Session, exitstatus: int) -> None:
     """
-    Log final test session results.
+    Flush pending failure screenshots, keep the artifact store within its size budget and log final
+    test session results.
     """
+    artifact_writer = peek_artifact_writer()
+    if artifact_writer is not None:
+        artifact_writer.drain()
+    # Workers have finished before the controller gets here; blobs used recently are never evicted
+    if not os.environ.get("PYTEST_XDIST_WORKER") and Path(env_config.ARTIFACT_STORE_DIR).exists():
+        get_artifact_store(env_config.ARTIFACT_STORE_DIR, env_config.ARTIFACT_STORE_MAX_MB).evict()
+
     passed = session.testscollected - session.testsfailed
     root_logger.info(
         f"Test session finished. Total: {session.testscollected}, "
         f"Passed: {passed}, Failed: {session.testsfailed}, "
         f"Exit status: {exitstatus}"
     )
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    """Flush the buffered log file; xdist workers may exit without running logging's atexit shutdown."""
+    for handler in root_logger.handlers:
+        handler.flush()
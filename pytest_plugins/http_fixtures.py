@@ -0,0 +1,54 @@
+"""HTTP session and client fixtures for browserless tests."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Generator
+from typing import TYPE_CHECKING
+
+import pytest
+
+from conftest import root_logger
+from pages.base.client_manager import ClientManager
+from utils.http_client import create_http_session
+
+if TYPE_CHECKING:
+    import requests
+    from _pytest.nodes import Item
+
+BROWSER_FIXTURES = ("driver", "actions", "page_manager")
+
+
+def is_browserless(item: Item) -> bool:
+    """Check whether a test is marked browserless or doesn't request any browser fixture."""
+    if item.get_closest_marker("browserless"):
+        return True
+    fixture_names = getattr(item, "fixturenames", ())
+    return not any(name in fixture_names for name in BROWSER_FIXTURES)
+
+
+def pytest_collection_modifyitems(items: list[Item]) -> None:
+    """Mark tests that never touch a WebDriver so setup fixtures skip the browser for them."""
+    for item in items:
+        if not item.get_closest_marker("browserless") and is_browserless(item):
+            item.add_marker(pytest.mark.browserless)
+
+
+@pytest.fixture(scope="session")
+def http_session() -> Generator[requests.Session, None, None]:
+    """
+    Pooled keep-alive HTTP session shared by all browserless tests in a worker.
+    """
+    session = create_http_session()
+    root_logger.debug("Opened pooled HTTP session.")
+    yield session
+    session.close()
+    root_logger.debug("Closed pooled HTTP session.")
+
+
+@pytest.fixture(scope="function")
+def client_manager(http_session: requests.Session, logger: logging.Logger) -> ClientManager:
+    """
+    Initialize ClientManager object with the pooled HTTP session and logger.
+    """
+    return ClientManager(http_session, logger)
@@ -0,0 +1,85 @@
+"""Run only the tests affected by changes since a git base (--changed-since), see utils.impact_selection."""
+
+from __future__ import annotations
+
+import statistics
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+import config.env_config as env_config
+from conftest import root_logger
+from utils.duration_history import load_durations
+from utils.duration_scheduler import DEFAULT_ESTIMATE
+from utils.impact_selection import changed_files, estimate_seconds, select_tests
+
+if TYPE_CHECKING:
+    from _pytest.terminal import TerminalReporter
+    from xdist.workermanage import WorkerController
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--changed-since",
+        action="store",
+        default=None,
+        metavar="GIT_REF",
+        help="Run only tests affected by files changed since GIT_REF (plus uncommitted changes), e.g. origin/main",
+    )
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Deselect unaffected tests; after marker deselection, before sharding (registered later, so called first)."""
+    base = config.getoption("--changed-since")
+    if base is None:
+        return
+    root = Path(config.rootpath)
+    try:
+        changed = changed_files(base, root)
+    except ValueError as e:
+        raise pytest.UsageError(f"--changed-since {base}: {e}") from e
+    selection = select_tests(changed, root)
+    test_files = set(selection.test_files)
+    deselected = [item for item in items if item.nodeid.split("::", 1)[0] not in test_files]
+    if deselected:
+        items[:] = [item for item in items if item.nodeid.split("::", 1)[0] in test_files]
+        config.hook.pytest_deselected(items=deselected)
+
+    durations = load_durations(Path(env_config.DURATION_HISTORY_DB), getattr(config, "browser", None))
+    default = statistics.median(durations.values()) if durations else DEFAULT_ESTIMATE
+    summary = {
+        "base": base,
+        "changed": len(selection.changed),
+        "run_all": selection.reason if selection.run_all else "",
+        "selected_tests": len(items),
+        "deselected_tests": len(deselected),
+        "selected_seconds": round(estimate_seconds([item.nodeid for item in items], durations, default), 1),
+        "saved_seconds": round(estimate_seconds([item.nodeid for item in deselected], durations, default), 1),
+    }
+    config.impact_summary = summary  # type: ignore[attr-defined]
+    if hasattr(config, "workeroutput"):
+        config.workeroutput["impact_summary"] = summary
+    root_logger.info(f"Impact selection: {summary}")
+
+
+def pytest_testnodedown(node: WorkerController, error: Any) -> None:
+    # Under xdist only workers collect; they all select the same tests
+    summary = getattr(node, "workeroutput", {}).get("impact_summary")
+    if summary is not None and not hasattr(node.config, "impact_summary"):
+        node.config.impact_summary = summary
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter, config: pytest.Config) -> None:
+    summary: dict[str, Any] | None = getattr(config, "impact_summary", None)
+    if summary is None:
+        return
+    terminalreporter.write_sep("-", "impact selection")
+    if summary["run_all"]:
+        terminalreporter.write_line(f"Ran everything: {summary['run_all']}.")
+    terminalreporter.write_line(
+        f"{summary['changed']} files changed since {summary['base']}: {summary['selected_tests']} tests selected "
+        f"(~{summary['selected_seconds']}s), {summary['deselected_tests']} skipped, "
+        f"estimated {summary['saved_seconds']}s saved."
+    )
@@ -0,0 +1,54 @@
+"""Benchmark fixtures recording result rows (framework overhead, upload throughput)."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import allure
+import pytest
+
+from conftest import root_logger
+from pytest_plugins.browser_helpers import get_worker_id
+from utils.jsonl import append_jsonl
+
+if TYPE_CHECKING:
+    from _pytest.fixtures import FixtureRequest
+
+OVERHEAD_RESULTS_FILE = Path("reports") / "benchmarks" / "framework_overhead.jsonl"
+UPLOAD_RESULTS_FILE = Path("reports") / "benchmarks" / "upload_throughput.jsonl"
+
+
+def _benchmark_recorder(request: FixtureRequest, results_file: Path, name: str, **context: Any) -> Callable[..., None]:
+    """
+    Returns a function recording benchmark rows, with the test, `context` and worker added,
+    to a JSONL results file and the Allure report.
+    """
+
+    def record(**row: Any) -> None:
+        row.update({"test": request.node.nodeid, **context, "worker": get_worker_id()})
+        append_jsonl(results_file, row)
+        allure.attach(json.dumps(row, indent=2), name=name, attachment_type=allure.attachment_type.JSON)
+        root_logger.info(f"{name}: {row}")
+
+    return record
+
+
+@pytest.fixture(scope="function")
+def overhead_benchmark(request: FixtureRequest) -> Callable[..., None]:
+    """
+    Records framework overhead benchmark rows to reports/benchmarks/framework_overhead.jsonl and the Allure report.
+    """
+    return _benchmark_recorder(request, OVERHEAD_RESULTS_FILE, "Framework Overhead")
+
+
+@pytest.fixture(scope="function")
+def upload_benchmark(request: FixtureRequest) -> Callable[..., None]:
+    """
+    Records upload benchmark rows to reports/benchmarks/upload_throughput.jsonl and the Allure report.
+    """
+    return _benchmark_recorder(
+        request, UPLOAD_RESULTS_FILE, "Upload Benchmark", browser=getattr(request.config, "browser", "")
+    )
@@ -2,40 +2,76 @@
 
 from __future__ import annotations
 
+import json
 import time
 from collections.abc import Generator
+from concurrent.futures import Future
+from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import allure
 import pytest
-from filelock import FileLock
 
 import config.env_config as env_config
 from conftest import root_logger
 from pytest_plugins.browser_helpers import get_worker_id
+from utils import perf_mode
+from utils.allure_attachments import attach_by_reference
+from utils.artifact_store import ArtifactStore, get_artifact_store
+from utils.encode_queue import get_encode_queue, peek_encode_queue
+from utils.jsonl import append_jsonl
 from utils.video_recorder import start_video_recording
 
 if TYPE_CHECKING:
     from _pytest.fixtures import FixtureRequest
     from selenium.webdriver.remote.webdriver import WebDriver
 
+    from utils.video_recorder import RecordingStats
+
+ENCODE_METRICS_FILE = Path("reports") / "metrics" / "video_encode_queue.jsonl"
+
 
 @pytest.fixture(scope="function", autouse=True)
-def video_recorder(request: FixtureRequest, driver: WebDriver) -> Generator[None, None, None]:
+def video_recorder(request: FixtureRequest) -> Generator[None, None, None]:
     """
-    Automatically records video of the test session using Chrome DevTools Protocol.
-    Recording is enabled only if VIDEO_RECORDING is True in config and driver is Chrome.
-    Skips recording for non-Chrome drivers or when disabled.
+    Automatically records video of the test session.
+    Chrome frames are pushed via a CDP screencast on the worker's debug port, other browsers are polled.
+    Both go over the instrumentation hub's connection when it is available.
+    Recording is enabled only if VIDEO_RECORDING is True in config; skipped for browserless tests and in perf mode.
     """
-    if not getattr(env_config, "VIDEO_RECORDING", False):
+    if (
+        not getattr(env_config, "VIDEO_RECORDING", False)
+        or perf_mode.is_enabled()
+        or request.node.get_closest_marker("browserless")
+    ):
         yield
         return
 
+    driver: WebDriver = request.getfixturevalue("driver")
+
     worker_id = get_worker_id()
     test_name = request.node.name.replace(":", "_").replace("/", "_")
 
-    stop_func, video_path = start_video_recording(driver, test_name, worker_id)
+    store = get_artifact_store(env_config.ARTIFACT_STORE_DIR, env_config.ARTIFACT_STORE_MAX_MB)
+    try:
+        stop_func, video_path = start_video_recording(
+            driver,
+            test_name,
+            worker_id,
+            mode=env_config.VIDEO_RECORDER_MODE,
+            debug_port=getattr(request.config, "debug_port", None),
+            quality=env_config.VIDEO_JPEG_QUALITY,
+            max_width=env_config.VIDEO_MAX_WIDTH,
+            max_height=env_config.VIDEO_MAX_HEIGHT,
+            ring_seconds=env_config.VIDEO_RING_SECONDS,
+            hub=getattr(request.config, "instrumentation_hub", None),
+            store=store,
+        )
+    except (OSError, ValueError) as e:
+        root_logger.error(f"Failed to start video recording: {str(e)}")
+        yield
+        return
     root_logger.info(f"Started recording: {video_path}")
 
     try:
@@ -43,26 +79,71 @@ def video_recorder(request: FixtureRequest, driver: WebDriver) -> Generator[None
     finally:
         try:
             root_logger.info("Stopping video recording...")
-            stop_func()
-
-            # Wait briefly to ensure video is fully written
-            time.sleep(1.0)
-
-            # Attach video to test body
-            video_path_obj = Path(video_path)
-            if video_path_obj.exists() and video_path_obj.stat().st_size > 0:
-                try:
-                    lock_file = video_path_obj.parent / f"{worker_id}.lock"
-                    with FileLock(lock_file):
-                        allure.attach.file(
-                            str(video_path_obj),
-                            name="Test Recording",
-                            attachment_type=allure.attachment_type.MP4,
-                        )
-                        root_logger.info(f"Video attached to test body: {video_path_obj}")
-                except Exception as e:
-                    root_logger.error(f"Failed to attach video: {str(e)}")
+            # In on_failure mode only failed (or to-be-rerun) tests pay for encoding and attaching
+            keep = env_config.VIDEO_RECORDER_MODE != "on_failure" or getattr(request.node, "test_failed", False)
+            started = time.perf_counter()
+            stats, future = stop_func(keep, get_encode_queue(env_config.VIDEO_ENCODE_SLOTS or None))
+            request.node.user_properties.append(("video_effective_fps", stats.effective_fps))
+            request.node.user_properties.append(("video_dropped_frames", stats.dropped_frames))
+
+            if not keep:
+                root_logger.info("Test passed - recording discarded.")
             else:
-                root_logger.warning(f"Video file not found or empty: {video_path_obj}")
+                # Reserve the attachment now, the encoded file is linked in when the background job completes
+                destination = attach_by_reference(request.config, "Test Recording", allure.attachment_type.MP4)
+                allure.attach(
+                    json.dumps(_capture_stats(stats), indent=2),
+                    name="Recording Stats",
+                    attachment_type=allure.attachment_type.JSON,
+                )
+                future.add_done_callback(partial(_finalize_video_attachment, Path(video_path), destination, store))
+            request.node.user_properties.append(("video_teardown_seconds", round(time.perf_counter() - started, 3)))
         except Exception as e:
             root_logger.error(f"Failed to stop video recording: {str(e)}")
+
+
+def _capture_stats(stats: RecordingStats) -> dict[str, object]:
+    """Capture figures known when recording stops (encode figures arrive later)."""
+    return {
+        "source": stats.source,
+        "captured_frames": stats.captured_frames,
+        "dropped_frames": stats.dropped_frames,
+        "duplicate_frames": stats.duplicate_frames,
+        "unique_frames": stats.frames,
+        "effective_fps": stats.effective_fps,
+        "lowest_fps": stats.lowest_fps,
+        "lowest_scale": stats.lowest_scale,
+    }
+
+
+def _finalize_video_attachment(
+    video_path: Path, destination: Path | None, store: ArtifactStore, future: Future[RecordingStats]
+) -> None:
+    """Move the encoded video into the artifact store and link the reserved Allure attachment to it."""
+    if future.exception() is not None:
+        root_logger.error(f"Video encoding failed for {video_path.name}: {future.exception()}")
+    elif not video_path.exists() or video_path.stat().st_size == 0:
+        root_logger.warning(f"Video file not found or empty: {video_path}")
+    else:
+        try:
+            blob = store.put_file(video_path)
+            if destination is not None:
+                store.link(blob.path, destination)
+                root_logger.info(f"Video attached to test body: {video_path}")
+            return
+        except Exception as e:
+            root_logger.error(f"Failed to attach video: {str(e)}")
+    if destination is not None:
+        destination.unlink(missing_ok=True)
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Drain pending video encodes before the worker exits and record queue metrics."""
+    encode_queue = peek_encode_queue()
+    if encode_queue is None:
+        return
+    encode_queue.drain()
+    summary = {"worker": get_worker_id(), **encode_queue.summary()}
+    root_logger.info(f"Video encode queue: {summary}")
+    append_jsonl(ENCODE_METRICS_FILE, summary)
+    encode_queue.shutdown()
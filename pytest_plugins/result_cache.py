@@ -0,0 +1,173 @@
+"""
+Opt-in cache of passed results (--result-cache): a test whose code, browser and application under
+test are unchanged since it last passed is reported as passed from cache instead of running.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+import allure
+import pytest
+
+import config.env_config as env_config
+from conftest import root_logger
+from utils.result_cache import ResultCache, aut_fingerprint, browser_version, cache_key, code_fingerprints
+
+if TYPE_CHECKING:
+    from _pytest.terminal import TerminalReporter
+
+
+class _CacheSession:
+    """Cache keys of this process's tests and the outcomes of the ones it runs."""
+
+    def __init__(self, cache: ResultCache) -> None:
+        self.cache = cache
+        self.keys: dict[str, str] = {}
+        self.passed: dict[str, float] = {}
+        self.failed: set[str] = set()
+
+
+_cache_session: _CacheSession | None = None
+# Reported by the process showing the terminal summary (the xdist controller receives all reports)
+_hits = 0
+_saved_seconds = 0.0
+
+
+def _age(seconds: float) -> str:
+    return f"{seconds / 3600:.1f}h" if seconds >= 3600 else f"{seconds / 60:.0f}m"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--result-cache",
+        action="store_true",
+        default=env_config.RESULT_CACHE,
+        help="Report tests whose code, browser and AUT are unchanged since their last pass as passed from cache",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    global _cache_session
+    if config.getoption("--result-cache") and not config.option.collectonly:
+        cache = ResultCache(Path(env_config.RESULT_CACHE_DB), env_config.RESULT_CACHE_MAX_AGE_HOURS * 3600)
+        _cache_session = _CacheSession(cache)
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Compute the cache key of every cacheable test; benchmarks always run."""
+    global _cache_session
+    if _cache_session is None:
+        return
+    browser = getattr(config, "browser", env_config.BROWSER.lower())
+    try:
+        aut = aut_fingerprint(env_config.BASE_URL, env_config.AUT_VERSION_HEADER)
+    except Exception as e:
+        root_logger.warning(f"Result cache disabled, the AUT fingerprint failed: {str(e)}")
+        _cache_session = None
+        return
+    code = code_fingerprints(Path(config.rootpath))
+    version = browser_version(browser)
+    for item in items:
+        test_file = item.nodeid.split("::", 1)[0]
+        if test_file in code and item.get_closest_marker("benchmark") is None:
+            _cache_session.keys[item.nodeid] = cache_key(item.nodeid, code[test_file], browser, version, aut)
+    root_logger.info(f"Result cache keys for {len(_cache_session.keys)} tests ({browser} {version}, AUT {aut[:12]}).")
+
+
+def _without_fixtures(config: pytest.Config, name: str) -> Any:
+    """A runtest hook without pytest's runner implementation, i.e. without setting up or tearing down fixtures."""
+    pluginmanager = config.pluginmanager
+    return pluginmanager.subset_hook_caller(name, remove_plugins=[pluginmanager.get_plugin("runner")])
+
+
+def _report_cached_phase(
+    item: pytest.Item, when: Literal["setup", "call", "teardown"], func: Callable[[], object], note: str, seconds: float
+) -> pytest.TestReport:
+    call = pytest.CallInfo.from_call(func, when=when)
+    report: pytest.TestReport = item.ihook.pytest_runtest_makereport(item=item, call=call)
+    report.result_cache = note  # type: ignore[attr-defined]
+    report.result_cache_seconds = seconds  # type: ignore[attr-defined]
+    report.user_properties.append(("result_cache", note))
+    item.ihook.pytest_runtest_logreport(report=report)
+    return report
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item: pytest.Item, nextitem: pytest.Item | None) -> bool | None:
+    """
+    Report a cached pass through the regular report hooks, without setting up or running the test.
+    The other plugins' setup and teardown hooks still run, so e.g. allure-pytest fills in the test's
+    name, labels and history id, and skip markers are still evaluated.
+    """
+    if _cache_session is None or item.nodeid not in _cache_session.keys:
+        return None
+    cached = _cache_session.cache.get(_cache_session.keys[item.nodeid])
+    if cached is None:
+        return None
+    age, seconds = cached
+    expires = _cache_session.cache.max_age_seconds - age
+    note = f"cached {_age(age)} ago, expires in {_age(expires)}"
+    setup_hook = _without_fixtures(item.config, "pytest_runtest_setup")
+    teardown_hook = _without_fixtures(item.config, "pytest_runtest_teardown")
+
+    def teardown() -> None:
+        teardown_hook(item=item, nextitem=nextitem)
+        # Tear down what the next test doesn't share, as the regular teardown would
+        item.session._setupstate.teardown_exact(nextitem)
+
+    item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+    if _report_cached_phase(item, "setup", lambda: setup_hook(item=item), note, seconds).passed:
+        attach_note = partial(allure.attach, note, name="Result cache", attachment_type=allure.attachment_type.TEXT)
+        _report_cached_phase(item, "call", attach_note, note, seconds)
+    _report_cached_phase(item, "teardown", teardown, note, seconds)
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+    return True
+
+
+def pytest_report_teststatus(report: pytest.TestReport) -> tuple[str, str, tuple[str, dict[str, bool]]] | None:
+    if report.when == "call" and getattr(report, "result_cache", None):
+        return "passed", "c", (f"PASSED ({report.result_cache})", {"green": True})
+    return None
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    global _hits, _saved_seconds
+    if getattr(report, "result_cache", None):
+        if report.when == "call":
+            _hits += 1
+            _saved_seconds += getattr(report, "result_cache_seconds", 0.0)
+        return
+    if _cache_session is None or report.nodeid not in _cache_session.keys:
+        return
+    if report.passed and report.outcome == "passed":
+        _cache_session.passed[report.nodeid] = _cache_session.passed.get(report.nodeid, 0.0) + report.duration
+    else:
+        # Failed, skipped or rerun phases never make a cacheable pass
+        _cache_session.failed.add(report.nodeid)
+
+
+def pytest_runtest_logfinish(nodeid: str) -> None:
+    if _cache_session is None:
+        return
+    seconds = _cache_session.passed.pop(nodeid, None)
+    if nodeid in _cache_session.failed:
+        _cache_session.failed.discard(nodeid)
+    elif seconds is not None:
+        _cache_session.cache.put(_cache_session.keys[nodeid], nodeid, seconds)
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    if _cache_session is not None and not os.environ.get("PYTEST_XDIST_WORKER"):
+        _cache_session.cache.prune()
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter, config: pytest.Config) -> None:
+    if not config.getoption("--result-cache"):
+        return
+    terminalreporter.write_sep("-", "result cache")
+    terminalreporter.write_line(f"{_hits} tests passed from cache, ~{_saved_seconds:.1f}s saved.")
@@ -0,0 +1,87 @@
+"""Duration-balanced test sharding across CI nodes (--shard-index/--shard-count)."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+import config.env_config as env_config
+from conftest import root_logger
+from utils.duration_history import load_durations
+from utils.sharding import plan_shards
+
+if TYPE_CHECKING:
+    from _pytest.terminal import TerminalReporter
+    from xdist.workermanage import WorkerController
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--shard-index",
+        action="store",
+        type=int,
+        default=None,
+        help="Run only this shard (0-based) of the selected tests, see --shard-count",
+    )
+    parser.addoption(
+        "--shard-count",
+        action="store",
+        type=int,
+        default=None,
+        help="Split the selected tests into this many duration-balanced shards",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    index, count = config.getoption("--shard-index"), config.getoption("--shard-count")
+    if index is None and count is None:
+        return
+    if index is None or count is None or count < 1 or not 0 <= index < count:
+        raise pytest.UsageError("--shard-index and --shard-count must be given together, with 0 <= index < count.")
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Deselect tests of other shards; runs after marker/keyword deselection so shards balance the real selection."""
+    count = config.getoption("--shard-count")
+    if count is None:
+        return
+    index = config.getoption("--shard-index")
+    durations = load_durations(Path(env_config.DURATION_HISTORY_DB), getattr(config, "browser", None))
+    plan = plan_shards([item.nodeid for item in items], durations, count)
+
+    selected = set(plan.shards[index])
+    deselected = [item for item in items if item.nodeid not in selected]
+    items[:] = [item for item in items if item.nodeid in selected]
+    config.hook.pytest_deselected(items=deselected)
+
+    summary = plan.summary(index)
+    config.shard_summary = summary  # type: ignore[attr-defined]
+    if hasattr(config, "workeroutput"):
+        config.workeroutput["shard_summary"] = summary
+    if not os.environ.get("PYTEST_XDIST_WORKER"):
+        root_logger.info(f"Shard plan: {summary}")
+
+
+def pytest_testnodedown(node: WorkerController, error: Any) -> None:
+    # Under xdist only workers collect; the controller takes the plan from the first worker's output
+    summary = getattr(node, "workeroutput", {}).get("shard_summary")
+    if summary is not None and not hasattr(node.config, "shard_summary"):
+        node.config.shard_summary = summary
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter, config: pytest.Config) -> None:
+    summary: dict[str, Any] | None = getattr(config, "shard_summary", None)
+    if summary is None:
+        return
+    terminalreporter.write_sep("-", "sharding")
+    terminalreporter.write_line(
+        f"Shard {summary['shard_index']}/{summary['shard_count']}: {summary['tests']} tests, "
+        f"predicted {summary['predicted_seconds']}s ({summary['tests_with_history']} tests with history, "
+        f"plan {summary['fingerprint']})."
+    )
+    terminalreporter.write_line(f"Predicted seconds per shard: {summary['predicted_seconds_per_shard']}")
+    terminalreporter.write_line(f"Tests per shard: {summary['tests_per_shard']}")
@@ -36,12 +36,19 @@ def page_manager(driver: WebDriver, logger: logging.Logger) -> PageManager:
 
 
 @pytest.fixture(scope="function", autouse=True)
-def test_setup(page_manager: PageManager, request: FixtureRequest) -> Generator[None, None, None]:
+def test_setup(request: FixtureRequest) -> Generator[None, None, None]:
     """Set test context and navigate to base URL for UI tests."""
     test_name = request.node.name
-    set_current_test(test_name)
+    set_current_test(test_name, request.node.nodeid)
     root_logger.info(f"Starting test: {test_name}")
 
+    # Browserless tests never launch a WebDriver
+    if request.node.get_closest_marker("browserless"):
+        yield
+        return
+
+    page_manager: PageManager = request.getfixturevalue("page_manager")
+
     # Navigate to base URL for UI tests
     if request.node.get_closest_marker("ui") or request.node.get_closest_marker("current"):
         with allure.step(f"Navigate to base URL: {env_config.BASE_URL}"):
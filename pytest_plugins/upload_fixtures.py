@@ -0,0 +1,36 @@
+"""Synthetic upload payload and local upload endpoint fixtures."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Generator
+from pathlib import Path
+
+import pytest
+
+from conftest import root_logger
+from utils.payload_generator import create_payload
+from utils.upload_server import UploadServer
+
+
+@pytest.fixture(scope="session")
+def upload_payload(tmp_path_factory: pytest.TempPathFactory) -> Callable[..., Path]:
+    """
+    Factory generating sparse upload payloads of a configurable size (1KB to 2GB).
+    Files live in the session temp directory and are reused for repeated sizes.
+    """
+    payload_dir = tmp_path_factory.mktemp("upload_payloads")
+
+    def factory(size: str | int, suffix: str = ".bin") -> Path:
+        path = create_payload(payload_dir, size, suffix)
+        root_logger.debug(f"Generated upload payload: {path} ({path.stat().st_size} bytes).")
+        return path
+
+    return factory
+
+
+@pytest.fixture(scope="session")
+def upload_server() -> Generator[UploadServer, None, None]:
+    """Local upload endpoint with the same markup as the application's upload page."""
+    server = UploadServer().start()
+    yield server
+    server.stop()
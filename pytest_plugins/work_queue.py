@@ -0,0 +1,186 @@
+"""
+Dynamic distribution of one run over pytest processes on several hosts (--work-queue).
+Each process runs the tests it claims from the shared queue instead of its whole collection;
+failed tests are requeued centrally and rerun by whichever process claims them next.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import time
+from collections.abc import Generator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+import config.env_config as env_config
+from conftest import root_logger
+from utils.duration_history import load_durations
+from utils.work_queue import collection_fingerprint, open_queue
+
+if TYPE_CHECKING:
+    from _pytest.terminal import TerminalReporter
+
+POLL_SECONDS = 2.0
+
+# Outcome of an attempt from its phase reports, most significant first
+_OUTCOME_ORDER = ("rerun", "failed", "skipped", "passed")
+
+
+class _Consumer:
+    """This process's side of the queue: claims tests and reports each attempt's outcome."""
+
+    def __init__(self, address: str, run_id: str, reruns: int, lease_seconds: int) -> None:
+        self.queue = open_queue(address)
+        self.run_id = run_id
+        self.reruns = reruns
+        self.lease_seconds = lease_seconds
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self.outcomes: dict[str, str] = {}
+        self.seconds: dict[str, float] = {}
+        self.attempts = 0
+        self.requeued = 0
+
+    def claim(self, items: dict[str, pytest.Item]) -> pytest.Item | None:
+        nodeid = self.queue.claim(self.run_id, self.name, self.lease_seconds)
+        return items[nodeid] if nodeid is not None else None
+
+    def wait_for_work(self, items: dict[str, pytest.Item]) -> pytest.Item | None:
+        """Claim the next test; while other processes are still running tests, wait for one to be requeued."""
+        while True:
+            item = self.claim(items)
+            if item is not None:
+                return item
+            if not self.queue.progress(self.run_id)["running"]:
+                return None
+            time.sleep(POLL_SECONDS)
+
+    def record(self, report: pytest.TestReport) -> None:
+        current = self.outcomes.get(report.nodeid, "passed")
+        self.outcomes[report.nodeid] = min(current, report.outcome, key=_OUTCOME_ORDER.index)
+        self.seconds[report.nodeid] = self.seconds.get(report.nodeid, 0.0) + report.duration
+
+    def renew(self, item: pytest.Item) -> bool:
+        return self.queue.renew(self.run_id, item.nodeid, self.name)
+
+    def finish(self, nodeid: str) -> None:
+        outcome = self.outcomes.pop(nodeid, "passed")
+        self.attempts += 1
+        requeued = self.queue.complete(self.run_id, nodeid, self.name, outcome, self.seconds.pop(nodeid, 0.0))
+        if requeued is None:
+            root_logger.warning(f"Lease on {nodeid} expired while it ran; its result is the next claimant's.")
+        elif requeued:
+            self.requeued += 1
+            root_logger.info(f"Requeued {nodeid} for a rerun.")
+
+
+_consumer: _Consumer | None = None
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--work-queue",
+        action="store",
+        default=env_config.WORK_QUEUE or None,
+        help="Run the tests claimed from a queue shared by several hosts: database path or http://host:port",
+    )
+    parser.addoption(
+        "--work-queue-run",
+        action="store",
+        default=env_config.WORK_QUEUE_RUN_ID or None,
+        help="Run id shared by all processes consuming the queue, e.g. the CI build id",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    global _consumer
+    address = config.getoption("--work-queue")
+    if not address:
+        return
+    if not config.getoption("--work-queue-run"):
+        raise pytest.UsageError("--work-queue needs --work-queue-run (or WORK_QUEUE_RUN_ID).")
+    if config.getoption("numprocesses", default=None):
+        raise pytest.UsageError("--work-queue consumes tests one at a time: pass -n 0 and start one process per slot.")
+    if not config.option.collectonly:
+        _consumer = _Consumer(
+            address,
+            config.getoption("--work-queue-run"),
+            env_config.WORK_QUEUE_RERUNS,
+            env_config.WORK_QUEUE_LEASE_SECONDS,
+        )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtestloop(session: pytest.Session) -> bool | None:
+    """Replaces the default loop: run claimed tests, each with the next claimed one as nextitem."""
+    if _consumer is None:
+        return None
+    if session.testsfailed and not session.config.option.continue_on_collection_errors:
+        raise session.Interrupted(
+            f"{session.testsfailed} error{'s' if session.testsfailed != 1 else ''} during collection"
+        )
+
+    items = {item.nodeid: item for item in session.items}
+    durations = load_durations(Path(env_config.DURATION_HISTORY_DB), getattr(session.config, "browser", None))
+    # Longest first, so the run doesn't end waiting for a slow test claimed last
+    seeded = _consumer.queue.seed(
+        _consumer.run_id,
+        collection_fingerprint(list(items)),
+        [[nodeid, durations.get(nodeid, 0.0)] for nodeid in items],
+    )
+    if not seeded:
+        pytest.exit(
+            f"Run {_consumer.run_id} was queued with a different collection.", returncode=pytest.ExitCode.USAGE_ERROR
+        )
+    root_logger.info(f"Consuming run {_consumer.run_id} from the work queue as {_consumer.name}.")
+
+    item = _consumer.wait_for_work(items)
+    while item is not None:
+        # Claim without waiting: this process's own running test would keep the wait going
+        nextitem = _consumer.claim(items)
+        item.config.hook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+        if session.shouldfail:
+            raise session.Failed(session.shouldfail)
+        if session.shouldstop:
+            raise session.Interrupted(session.shouldstop)
+        # The look-ahead claim aged while the test ran; if it expired and was claimed elsewhere, drop it
+        # and tear down what was kept for it, since the next test is a different one
+        if nextitem is not None and not _consumer.renew(nextitem):
+            root_logger.warning(f"Lease on {nextitem.nodeid} expired before it started; claiming another test.")
+            session._setupstate.teardown_exact(None)
+            nextitem = None
+        item = nextitem if nextitem is not None else _consumer.wait_for_work(items)
+    return True
+
+
+@pytest.hookimpl(tryfirst=True, hookwrapper=True)
+def pytest_runtest_makereport(item: pytest.Item) -> Generator[None, Any, None]:
+    """A failure with reruns left is reported as a rerun; the test goes back to the queue."""
+    outcome = yield
+    report = outcome.get_result()
+    if _consumer is None or not report.failed or report.when == "teardown":
+        return
+    if _consumer.queue.attempts(_consumer.run_id, item.nodeid) < _consumer.reruns:
+        report.outcome = "rerun"
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    if _consumer is not None:
+        _consumer.record(report)
+
+
+def pytest_runtest_logfinish(nodeid: str) -> None:
+    if _consumer is not None:
+        _consumer.finish(nodeid)
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter) -> None:
+    if _consumer is None:
+        return
+    terminalreporter.write_sep("-", "work queue")
+    terminalreporter.write_line(
+        f"{_consumer.name}: {_consumer.attempts} attempts, {_consumer.requeued} requeued for rerun. "
+        f"Run {_consumer.run_id}: {_consumer.queue.progress(_consumer.run_id)}"
+    )
@@ -8,12 +8,12 @@ import pytest
 if TYPE_CHECKING:
     from logging import Logger
 
-    from pages.base.page_manager import PageManager
+    from pages.base.client_manager import ClientManager
 
 
 @allure.feature("Basic Auth")
 @allure.story("Tests Basic Autorization login scenatios")
-@pytest.mark.usefixtures("page_manager")
+@pytest.mark.browserless
 class TestBasicAuth:
     """Tests basic autorization login scenatios"""
 
@@ -26,11 +26,10 @@ class TestBasicAuth:
         ],
     )
     @pytest.mark.full
-    @pytest.mark.ui
     @allure.severity(allure.severity_level.NORMAL)
     def test_basic_auth(
         self,
-        page_manager: PageManager,
+        client_manager: ClientManager,
         logger: Logger,
         username: str,
         password: str,
@@ -38,13 +37,13 @@ class TestBasicAuth:
         expected_message: str,
     ) -> None:
         logger.info("Tests basic autorization login scenatios.")
-        page = page_manager.get_basic_auth_page()
+        client = client_manager.get_basic_auth_client()
 
         logger.info("Initialize URL based on username and password.")
-        url = page.init_url(username, password)
+        url = client.init_url(username, password)
 
         logger.info("Get status code and authorization message.")
-        status_code, message = page.get_status_code_and_auth_message(url)
+        status_code, message = client.get_status_code_and_auth_message(url)
 
         logger.info("Validate status code and authorization message.")
         assert expected_status_code == status_code
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
-import os
 from typing import TYPE_CHECKING
 
 import allure
 import pytest
 
+from config.env_config import LONG_TIMEOUT
+
 if TYPE_CHECKING:
     from logging import Logger
     from pathlib import Path
 
     from pages.base.page_manager import PageManager
+    from utils.download_manager import DownloadManager
 
 
 @allure.feature("Files Download")
@@ -19,27 +21,69 @@ if TYPE_CHECKING:
 class TestFilesDownload:
     """Tests Files Download functionality"""
 
-    @pytest.mark.xfail(reason="One file link is broken")
+    # Files downloaded by browser clicks for UI coverage; the rest are covered by the HTTP bulk download
+    BROWSER_SAMPLE_SIZE = 2
+
     @pytest.mark.full
     @pytest.mark.ui
     @pytest.mark.clean_downloads
     @allure.severity(allure.severity_level.NORMAL)
-    @pytest.mark.skipif(
-        os.getenv("BROWSER") == "firefox",
-        reason="Skipping file download test for Firefox due to slow downloading process",
-    )
     def test_files_download_functionality(
-        self, page_manager: PageManager, logger: Logger, downloads_directory: Path
+        self, page_manager: PageManager, logger: Logger, download_manager: DownloadManager
     ) -> None:
         logger.info("Tests Files Download.")
         page = page_manager.get_file_download_page()
 
-        logger.info("Getting list of downloadable files.")
-        file_names = page.get_list_of_downloadable_files()
+        logger.info("Getting sample of downloadable files.")
+        file_names = page.get_list_of_downloadable_files()[: self.BROWSER_SAMPLE_SIZE]
+        downloads = [download_manager.expect(file_name) for file_name in file_names]
 
-        logger.info("Downloading all files in page.")
+        logger.info("Downloading sample files by clicking their links.")
         for file_name in file_names:
             page.download_file_by_filename(file_name)
 
-        logger.info("Verifying downloaded files count equals to files in page.")
-        assert len(file_names) == len(page.get_number_of_downloaded_files(downloads_directory))
+        logger.info("Waiting for all downloads to complete.")
+        completed = download_manager.wait_all(downloads, timeout=LONG_TIMEOUT * 3)
+
+        logger.info("Verifying downloaded files count equals to clicked files.")
+        assert len(file_names) == len(completed)
+        assert len(file_names) == len(page.get_number_of_downloaded_files(download_manager.download_dir))
+
+        logger.info("Verifying browser downloads match the same files served over HTTP.")
+        http_results = page.download_all_files_via_http(download_manager.download_dir / "http", file_names=file_names)
+        http_hashes = {result.name: result.sha256 for result in http_results}
+        for download in completed:
+            assert download.sha256 == http_hashes.get(download.name), f"Content mismatch for '{download.name}'"
+
+    @pytest.mark.full
+    @pytest.mark.ui
+    @pytest.mark.clean_downloads
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_bulk_files_download(self, page_manager: PageManager, logger: Logger, downloads_directory: Path) -> None:
+        logger.info("Tests bulk Files Download over HTTP.")
+        page = page_manager.get_file_download_page()
+
+        logger.info("Getting list of downloadable files.")
+        file_names = page.get_list_of_downloadable_files()
+
+        logger.info("Downloading all files in page concurrently.")
+        results = page.download_all_files_via_http(downloads_directory / "http")
+
+        logger.info("Verifying every file downloaded completely.")
+        assert len(file_names) == len(results)
+        failed = [f"{result.name}: {result.error}" for result in results if not result.ok]
+        assert not failed, f"Failed downloads: {failed}"
+
+    @pytest.mark.full
+    @pytest.mark.ui
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_download_links_reachable(self, page_manager: PageManager, logger: Logger) -> None:
+        logger.info("Tests all download links are reachable.")
+        page = page_manager.get_file_download_page()
+
+        logger.info("Validating all download links in one parallel batch.")
+        reports = page.get_download_links_report()
+        assert reports, "No download links found in page"
+
+        unreachable = [f"{report.url} ({report.status or report.error})" for report in reports if not report.ok]
+        assert not unreachable, f"Unreachable download links: {unreachable}"
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import allure
+import pytest
+
+from config.env_config import UPLOAD_BENCHMARK_SIZES
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+    from pages.base.page_manager import PageManager
+    from utils.upload_server import UploadServer
+
+
+@allure.feature("Files Upload")
+@allure.story("Benchmark Files Upload throughput")
+@pytest.mark.usefixtures("page_manager")
+class TestUploadThroughput:
+    """Benchmarks upload wall time and throughput per payload size against a local upload endpoint"""
+
+    SIZES = [size.strip() for size in UPLOAD_BENCHMARK_SIZES.split(",") if size.strip()]
+
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize("size", SIZES)
+    @allure.severity(allure.severity_level.MINOR)
+    def test_upload_throughput(
+        self,
+        page_manager: PageManager,
+        logger: Logger,
+        upload_server: UploadServer,
+        upload_payload: Callable[..., Path],
+        upload_benchmark: Callable[..., None],
+        size: str,
+    ) -> None:
+        logger.info(f"Benchmark upload of a {size} payload.")
+        payload = upload_payload(size)
+        page = page_manager.get_file_upload_page(upload_server.upload_url)
+
+        logger.info("Upload file using the Upload button.")
+        page.select_file_to_upload(str(payload))
+        started = time.perf_counter()
+        file_uploaded_page = page.click_upload_file()
+        uploaded_name = file_uploaded_page.get_uploaded_file_name()
+        wall_time = time.perf_counter() - started
+
+        logger.info("Verifying file uploaded sucessfully.")
+        assert uploaded_name == payload.name
+        server_record = upload_server.records[-1]
+        assert server_record.bytes_received >= payload.stat().st_size
+
+        size_bytes = payload.stat().st_size
+        upload_benchmark(
+            size=size,
+            size_bytes=size_bytes,
+            wall_time_s=round(wall_time, 4),
+            throughput_mb_s=round(size_bytes / wall_time / 1024**2, 2),
+            server_time_s=round(server_record.duration, 4),
+            server_throughput_mb_s=round(server_record.throughput / 1024**2, 2),
+        )
@@ -29,7 +29,7 @@ class TestIframe:
         logger.info("Clicking iframe link.")
         iframe_page = page.click_iframe_link()
 
-        if "read-only" in iframe_page.get_page_source(lowercase=True):
+        if iframe_page.is_read_only():
             pytest.skip("herokuapp blocked – TinyMCE read-only mode")
 
         logger.info("Switching to iframe.")
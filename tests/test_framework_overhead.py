@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+import allure
+import pytest
+
+from pages.features.checkboxes.checkboxes_page import CheckboxesPage
+from utils import perf_mode
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+
+class _StubElement:
+    """WebElement stand-in answering instantly, so only framework code is timed."""
+
+    def __init__(self) -> None:
+        self.selected = False
+
+    def is_displayed(self) -> bool:
+        return True
+
+    def is_enabled(self) -> bool:
+        return True
+
+    def is_selected(self) -> bool:
+        return self.selected
+
+    def click(self) -> None:
+        self.selected = not self.selected
+
+
+class _StubDriver:
+    """WebDriver stand-in returning the same element for every locator."""
+
+    def __init__(self) -> None:
+        self.element = _StubElement()
+
+    def find_element(self, by: str, value: str) -> _StubElement:
+        return self.element
+
+    def find_elements(self, by: str, value: str) -> list[_StubElement]:
+        return [self.element]
+
+    def execute_script(self, script: str, *args: Any) -> Any:
+        return None
+
+
+@allure.feature("Framework")
+@allure.story("Benchmark page-object call overhead")
+@pytest.mark.browserless
+class TestFrameworkOverhead:
+    """Measures page-object call overhead (Allure steps, logging, waits) against a stub driver with perf mode off/on"""
+
+    CALLS = 2000
+
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize("perf_mode_on", [False, True], ids=["reporting", "perf_mode"])
+    @allure.severity(allure.severity_level.MINOR)
+    def test_page_object_call_overhead(
+        self, logger: Logger, overhead_benchmark: Callable[..., None], perf_mode_on: bool
+    ) -> None:
+        logger.info(f"Benchmark {self.CALLS} page-object calls with perf mode {'on' if perf_mode_on else 'off'}.")
+        driver = _StubDriver()
+
+        # Baseline: the raw driver calls behind set_checkbox, without the page-object layer
+        started = time.perf_counter()
+        for call in range(self.CALLS):
+            element = driver.find_element("css selector", "input")
+            if element.is_selected() != bool(call % 2):
+                element.click()
+        raw_seconds = time.perf_counter() - started
+
+        with perf_mode.override(perf_mode_on):
+            page = CheckboxesPage(driver)  # type: ignore[arg-type]
+            started = time.perf_counter()
+            for call in range(self.CALLS):
+                page.set_checkbox(0, bool(call % 2))
+            page_seconds = time.perf_counter() - started
+
+        logger.info("Verifying the page object drove the stub driver.")
+        assert driver.element.selected == bool((self.CALLS - 1) % 2)
+
+        overhead_benchmark(
+            perf_mode=perf_mode_on,
+            calls=self.CALLS,
+            page_object_us_per_call=round(page_seconds / self.CALLS * 1e6, 2),
+            raw_driver_us_per_call=round(raw_seconds / self.CALLS * 1e6, 2),
+            overhead_us_per_call=round((page_seconds - raw_seconds) / self.CALLS * 1e6, 2),
+        )
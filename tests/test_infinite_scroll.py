@@ -17,6 +17,8 @@ if TYPE_CHECKING:
 class TestInfiniteScroll:
     """Tests Infinite Scroll functionality"""
 
+    STREAMED_ITEMS = 20
+
     @pytest.mark.full
     @pytest.mark.ui
     @allure.severity(allure.severity_level.NORMAL)
@@ -24,17 +26,38 @@ class TestInfiniteScroll:
         logger.info("Tests Infinite Scroll.")
         page = page_manager.get_infinite_scroll_page()
 
-        for _ in range(5):
-            logger.info("Getting old page height.")
-            old_height = page.get_page_height()
-
-            logger.info("Scrolling to bottom of page.")
-            page.scroll_to_bottom_of_page()
+        logger.info("Getting old page height.")
+        old_height = page.get_page_height()
 
+        logger.info("Scrolling until new content loads.")
+        for loads, batch in enumerate(page.iter_new_items(max_seconds=60), start=1):
             logger.info("Getting new page height.")
             new_height = page.get_page_height()
 
             logger.info("Verifying new page height is bigger than old page height.")
+            assert batch, "Expected new content after scrolling"
             assert old_height < new_height, (
                 f"Expected 'old height < new height', but got 'old height: {old_height} < height: {new_height}'"
             )
+            old_height = new_height
+            if loads == 5:
+                break
+        else:
+            pytest.fail("Infinite scroll stopped loading new content")
+
+    @pytest.mark.full
+    @pytest.mark.ui
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_infinite_scroll_streams_new_items(self, page_manager: PageManager, logger: Logger) -> None:
+        logger.info("Tests Infinite Scroll items streaming.")
+        page = page_manager.get_infinite_scroll_page()
+        old_height = page.get_page_height()
+
+        logger.info(f"Streaming {self.STREAMED_ITEMS} newly loaded items.")
+        batches = list(page.iter_new_items(max_items=self.STREAMED_ITEMS, max_seconds=60))
+        items = [item for batch in batches for item in batch]
+
+        logger.info("Verifying all requested items were loaded and contain text.")
+        assert len(items) == self.STREAMED_ITEMS, f"Expected {self.STREAMED_ITEMS} items, got {len(items)}"
+        assert all(items), "Loaded items should not be empty"
+        assert old_height < page.get_page_height(), "Expected page height to grow while streaming items"
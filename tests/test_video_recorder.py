@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import io
+import re
+import shutil
+import struct
+import subprocess
+from typing import TYPE_CHECKING, Any
+
+import allure
+import pytest
+from PIL import Image
+
+from utils import video_recorder
+from utils.video_recorder import FfmpegPipeSink
+
+if TYPE_CHECKING:
+    from logging import Logger
+    from pathlib import Path
+
+# Matroska master elements, walked into rather than over
+_MASTER_IDS = {0x1A45DFA3, 0x18538067, 0x1549A966, 0x1654AE6B, 0xAE, 0x1F43B675}
+_EBML_DOC_TYPE, _CODEC_ID, _CLUSTER_TIMESTAMP, _SIMPLE_BLOCK = 0x4282, 0x86, 0xE7, 0xA3
+
+
+class _FakeFfmpeg:
+    """ffmpeg stand-in keeping everything written to its stdin."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.stdin = io.BytesIO()
+        self.returncode = 0
+
+    def communicate(self, timeout: float | None = None) -> tuple[bytes, bytes]:
+        return b"", b""
+
+    def kill(self) -> None:
+        pass
+
+
+def _vint(data: bytes, pos: int, keep_marker: bool) -> tuple[int | None, int]:
+    """EBML variable-length integer at pos: (value, or None for an unknown size; its length)."""
+    length = 9 - data[pos].bit_length()
+    value = int.from_bytes(data[pos : pos + length], "big")
+    if keep_marker:
+        return value, length
+    value &= (1 << (7 * length)) - 1
+    return (None if value == (1 << (7 * length)) - 1 else value), length
+
+
+def _flatten(data: bytes) -> list[tuple[int, bytes]]:
+    """(element id, payload) of every non-master element, in stream order."""
+    elements, pos = [], 0
+    while pos < len(data):
+        element_id, id_length = _vint(data, pos, keep_marker=True)
+        size, size_length = _vint(data, pos + id_length, keep_marker=False)
+        assert element_id is not None
+        pos += id_length + size_length
+        if element_id in _MASTER_IDS:
+            continue
+        assert size is not None, f"Unknown size on non-master element {element_id:#x}"
+        elements.append((element_id, data[pos : pos + size]))
+        pos += size
+    assert pos == len(data), "Stream ends inside an element"
+    return elements
+
+
+def _blocks(elements: list[tuple[int, bytes]]) -> list[tuple[int, bytes]]:
+    """(absolute timestamp in ms, frame) of every SimpleBlock."""
+    blocks, cluster_ms = [], 0
+    for element_id, payload in elements:
+        if element_id == _CLUSTER_TIMESTAMP:
+            cluster_ms = int.from_bytes(payload, "big")
+        elif element_id == _SIMPLE_BLOCK:
+            track, relative_ms, flags = struct.unpack(">BhB", payload[:4])
+            assert (track, flags) == (0x81, 0x80), "Expected a keyframe of track 1"
+            blocks.append((cluster_ms + relative_ms, payload[4:]))
+    return blocks
+
+
+def _frame(color: str, image_format: str) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 48), color).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+@allure.feature("Framework")
+@allure.story("Stream recorded frames into ffmpeg as timestamped Matroska")
+@pytest.mark.browserless
+class TestFfmpegPipeSink:
+    """Validates the Matroska stream pipe-mode recording writes to ffmpeg, and that ffmpeg encodes it"""
+
+    # Seconds since the first frame; the last one starts a second cluster
+    FRAME_OFFSETS = (0.0, 0.1, 0.25, video_recorder.MATROSKA_CLUSTER_MS / 1000 + 0.5)
+    END_OFFSET = FRAME_OFFSETS[-1] + 1.0
+
+    @pytest.mark.full
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_stream_structure(self, logger: Logger, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        logger.info("Writing frames into a pipe sink with a fake ffmpeg.")
+        ffmpeg = _FakeFfmpeg()
+        monkeypatch.setattr(video_recorder.subprocess, "Popen", lambda *args, **kwargs: ffmpeg)
+        sink = FfmpegPipeSink(tmp_path / "video.mp4", mime_type="image/png")
+        frames = [_frame(color, "PNG") for color in ("red", "green", "blue", "white")]
+        for offset, frame in zip(self.FRAME_OFFSETS, frames):
+            sink.write(frame, 1000.0 + offset)
+        sink.close(1000.0 + self.END_OFFSET)
+
+        logger.info("Verifying the EBML header, track and block timestamps.")
+        elements = _flatten(ffmpeg.stdin.getvalue())
+        assert dict(elements)[_EBML_DOC_TYPE] == b"matroska"
+        assert dict(elements)[_CODEC_ID] == video_recorder.MATROSKA_CODECS["image/png"][0]
+        assert sum(element_id == _CLUSTER_TIMESTAMP for element_id, _ in elements) == 2
+        # The last frame is repeated at the end, so it stays on screen until the recording ended
+        expected = [*zip(self.FRAME_OFFSETS, frames), (self.END_OFFSET, frames[-1])]
+        assert _blocks(elements) == [(round(offset * 1000), frame) for offset, frame in expected]
+
+    @pytest.mark.full
+    @pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.parametrize("mime_type, image_format", [("image/jpeg", "JPEG"), ("image/png", "PNG")])
+    def test_ffmpeg_decodes_stream(self, logger: Logger, tmp_path: Path, mime_type: str, image_format: str) -> None:
+        logger.info(f"Encoding {mime_type} frames through ffmpeg.")
+        video_path = tmp_path / "video.mp4"
+        sink = FfmpegPipeSink(video_path, mime_type=mime_type)
+        for offset, color in zip(self.FRAME_OFFSETS, ("red", "green", "blue", "white")):
+            sink.write(_frame(color, image_format), 1000.0 + offset)
+        assert sink.close(1000.0 + self.END_OFFSET) > 0, "No video written"
+
+        logger.info("Verifying the decoded frame timestamps.")
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-i", str(video_path), "-vf", "showinfo", "-f", "null", "-"],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0, result.stderr
+        pts_times = [float(pts) for pts in re.findall(r"pts_time:\s*([\d.]+)", result.stderr)]
+        assert pts_times == pytest.approx([*self.FRAME_OFFSETS, self.END_OFFSET], abs=0.002)
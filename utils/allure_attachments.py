@@ -0,0 +1,84 @@
+"""
+Allure attachments by reference.
+The attachment entry is registered on the running test right away, while the file itself
+is written into the results directory later (e.g. once a background encode finishes).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+from pathlib import Path
+
+import allure
+import pytest
+from allure_commons import hookimpl, plugin_manager
+from allure_commons.logger import AllureFileLogger
+
+logger = logging.getLogger(__name__)
+
+
+class _AttachmentNameCapture:
+    def __init__(self) -> None:
+        self.file_name: str | None = None
+
+    @hookimpl
+    def report_attached_data(self, body: bytes, file_name: str) -> None:
+        self.file_name = file_name
+
+
+def _results_dir(config: pytest.Config) -> Path | None:
+    """The --alluredir results directory, None when allure-pytest isn't writing results."""
+    report_dir = getattr(config.option, "allure_report_dir", None)
+    if not report_dir or not any(isinstance(plugin, AllureFileLogger) for plugin in plugin_manager.get_plugins()):
+        return None
+    return Path(report_dir)
+
+
+def attach_by_reference(
+    config: pytest.Config, name: str, attachment_type: allure.attachment_type | str, extension: str | None = None
+) -> Path | None:
+    """
+    Register an attachment on the current test whose content is written later.
+
+    Args:
+        config: pytest config of the run
+        name: Attachment name shown in the report
+        attachment_type: Allure attachment type (mime type and extension), or a mime type string
+        extension: File extension, required when attachment_type is a mime type string
+
+    Returns:
+        Path | None: Destination to fill with fill_reference(), or None if no Allure results are written
+    """
+    results_dir = _results_dir(config)
+    if results_dir is None:
+        return None
+    capture = _AttachmentNameCapture()
+    plugin_manager.register(capture)
+    try:
+        # Writes an empty placeholder under the generated attachment file name
+        allure.attach(b"", name=name, attachment_type=attachment_type, extension=extension)
+    finally:
+        plugin_manager.unregister(capture)
+    return results_dir / capture.file_name if capture.file_name else None
+
+
+def fill_reference(destination: Path, source: Path) -> None:
+    """Atomically replace a reserved attachment placeholder with the content of `source`."""
+    tmp_path = destination.with_name(f".{destination.name}.tmp")
+    shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, destination)
+    logger.debug(f"Attachment {destination.name} filled from {source}.")
+
+
+def link_reference(destination: Path, source: Path) -> None:
+    """Atomically replace a reserved attachment placeholder with a hard link to `source` (a copy across devices)."""
+    tmp_path = destination.with_name(f".{destination.name}.tmp")
+    tmp_path.unlink(missing_ok=True)
+    try:
+        os.link(source, tmp_path)
+    except OSError:
+        shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, destination)
+    logger.debug(f"Attachment {destination.name} linked to {source}.")
@@ -0,0 +1,165 @@
+"""
+Content-addressed store for test artifacts (screenshots, video frames, videos).
+Blobs are keyed by sha256 and shared by all workers on the machine, so identical content is
+stored once; per-test files and Allure attachments are hard links to the blobs. The store is
+kept under a size budget by evicting the least recently used blobs no report links to: a linked
+blob's bytes stay on disk until the reports holding it are deleted, so the budget bounds the
+store's own disk use, not that of the report directories.
+Requires: filelock.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+from filelock import FileLock
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+# Blobs used this recently are never evicted, they may still be referenced by running encodes
+EVICTION_GRACE_SECONDS = 600
+
+
+@dataclass
+class Blob:
+    path: Path
+    size: int
+    new: bool
+
+
+class ArtifactStore:
+    """
+    sha256-keyed blob store with hard-link references and LRU size-budget eviction.
+
+    Writes go through a temporary file and os.replace, so concurrent workers storing the same
+    content never see partial blobs. The blob mtime is refreshed on every hit and serves as
+    the LRU clock.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.objects_dir = root / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _blob_path(self, digest: str, extension: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest[2:]}.{extension.lstrip('.')}"
+
+    def _record(self, path: Path, size: int) -> Blob:
+        if path.exists():
+            os.utime(path)
+            with self._lock:
+                self.hits += 1
+            return Blob(path, size, new=False)
+        with self._lock:
+            self.misses += 1
+        return Blob(path, size, new=True)
+
+    def _tmp_path(self) -> Path:
+        return self.objects_dir / f".tmp-{uuid.uuid4().hex}"
+
+    def put_bytes(self, data: bytes, extension: str) -> Blob:
+        """Store `data` unless an identical blob exists."""
+        blob = self._record(self._blob_path(hashlib.sha256(data).hexdigest(), extension), len(data))
+        if blob.new:
+            blob.path.parent.mkdir(exist_ok=True)
+            tmp_path = self._tmp_path()
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, blob.path)
+        return blob
+
+    def put_file(self, source: Path, extension: str | None = None) -> Blob:
+        """Move `source` into the store (or drop it if an identical blob exists) and link it back in place."""
+        digest = hashlib.sha256()
+        with open(source, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                digest.update(chunk)
+        blob = self._record(self._blob_path(digest.hexdigest(), extension or source.suffix), source.stat().st_size)
+        if blob.new:
+            blob.path.parent.mkdir(exist_ok=True)
+            tmp_path = self._tmp_path()
+            shutil.move(source, tmp_path)
+            os.replace(tmp_path, blob.path)
+        self.link(blob.path, source)
+        return blob
+
+    def link(self, blob_path: Path, destination: Path) -> None:
+        """Atomically point `destination` at a blob; falls back to a copy across file systems."""
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = destination.with_name(f".{destination.name}.tmp")
+        tmp_path.unlink(missing_ok=True)
+        try:
+            os.link(blob_path, tmp_path)
+        except OSError:
+            shutil.copyfile(blob_path, tmp_path)
+        os.replace(tmp_path, destination)
+
+    def usage(self) -> tuple[int, int]:
+        """Return the number of blobs and their total size in bytes."""
+        sizes = [path.stat().st_size for path in self.objects_dir.glob("*/*")]
+        return len(sizes), sum(sizes)
+
+    def evict(self, max_bytes: int | None = None, grace_seconds: float = EVICTION_GRACE_SECONDS) -> tuple[int, int]:
+        """
+        Delete least recently used blobs until the store fits the size budget.
+        Blobs still hard-linked elsewhere (e.g. Allure attachments) are kept: deleting them frees
+        no disk space, only the deduplication. Their bytes count towards the budget, so a store
+        held by large reports may stay over it until the reports are removed.
+
+        Returns:
+            tuple: (blobs removed, bytes freed)
+        """
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        with FileLock(self.root / "evict.lock"):
+            blobs = []
+            for path in self.objects_dir.glob("*/*"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                blobs.append((stat.st_mtime, stat.st_size, stat.st_nlink, path))
+            total = sum(size for _, size, _, _ in blobs)
+            cutoff = time.time() - grace_seconds
+            removed = freed = 0
+            for mtime, size, links, path in sorted(blobs):
+                if total - freed <= budget or mtime > cutoff:
+                    break
+                if links > 1:
+                    continue
+                path.unlink(missing_ok=True)
+                removed += 1
+                freed += size
+        if removed:
+            logger.info(f"Evicted {removed} blobs ({freed} bytes) from {self.root}, {total - freed} bytes kept.")
+        if total - freed > budget:
+            linked = sum(size for _, size, links, _ in blobs if links > 1)
+            logger.warning(
+                f"{self.root} holds {total - freed} bytes, over its {budget} byte budget; "
+                f"{linked} bytes are blobs still linked from reports."
+            )
+        return removed, freed
+
+
+_artifact_store: ArtifactStore | None = None
+_artifact_store_lock = threading.Lock()
+
+
+def get_artifact_store(root: Path | str = "artifact_store", max_mb: int = 2048) -> ArtifactStore:
+    """Return the process-wide artifact store, creating it on first use."""
+    global _artifact_store
+    with _artifact_store_lock:
+        if _artifact_store is None:
+            _artifact_store = ArtifactStore(Path(root), max_mb * 1024 * 1024)
+        return _artifact_store
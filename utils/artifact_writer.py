@@ -0,0 +1,169 @@
+"""
+Background writer for failure artifacts (screenshots).
+The report hook only grabs the raw screenshot and reserves the Allure attachment; decoding,
+re-encoding to WebP/JPEG at the configured quality and scale, and writing happen on a
+worker thread. With an artifact store, the encoded image is stored once and linked in place.
+Requires: Pillow.
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from PIL import Image
+
+from utils.allure_attachments import link_reference
+from utils.artifact_store import ArtifactStore
+
+logger = logging.getLogger(__name__)
+
+# format: (Pillow format, mime type, extension)
+IMAGE_FORMATS = {
+    "webp": ("WEBP", "image/webp", "webp"),
+    "jpeg": ("JPEG", "image/jpeg", "jpg"),
+    "png": ("PNG", "image/png", "png"),
+}
+DRAIN_TIMEOUT = 60
+
+
+@dataclass
+class _ArtifactJob:
+    screenshot: bytes | str
+    path: Path
+    attachment: Path | None
+    submitted: float
+
+
+def encode_image(png: bytes, image_format: str = "webp", quality: int = 80, scale: float = 1.0) -> bytes:
+    """
+    Re-encode a PNG screenshot.
+
+    Args:
+        png: PNG image bytes
+        image_format: "webp", "jpeg" or "png"
+        quality: Lossy quality (1-100), ignored for PNG
+        scale: Resize factor applied to both dimensions
+
+    Returns:
+        bytes: Encoded image
+    """
+    pil_format = IMAGE_FORMATS[image_format][0]
+    with Image.open(io.BytesIO(png)) as source:
+        image: Image.Image = source
+        if scale != 1.0:
+            size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+            image = image.resize(size, Image.Resampling.LANCZOS)
+        if pil_format == "JPEG":
+            image = image.convert("RGB")
+        output = io.BytesIO()
+        image.save(output, pil_format, **({} if pil_format == "PNG" else {"quality": quality}))
+    return output.getvalue()
+
+
+class ArtifactWriter:
+    """Single daemon thread encoding and writing queued screenshots in submission order."""
+
+    def __init__(
+        self, image_format: str = "webp", quality: int = 80, scale: float = 1.0, store: ArtifactStore | None = None
+    ) -> None:
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unknown screenshot format '{image_format}'. Options: {', '.join(IMAGE_FORMATS)}")
+        self.image_format = image_format
+        self.quality = quality
+        self.scale = scale
+        self.store = store
+        self._queue: queue.Queue[_ArtifactJob] = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def mime_type(self) -> str:
+        return IMAGE_FORMATS[self.image_format][1]
+
+    @property
+    def extension(self) -> str:
+        return IMAGE_FORMATS[self.image_format][2]
+
+    def submit(self, screenshot: bytes | str, path: Path, attachment: Path | None = None) -> None:
+        """
+        Queue a screenshot for encoding.
+
+        Args:
+            screenshot: PNG bytes, or the base64 string returned by the browser
+            path: Local destination, its suffix is replaced with the output format's extension
+            attachment: Reserved Allure attachment to fill (see attach_by_reference)
+        """
+        self._queue.put(
+            _ArtifactJob(screenshot, path.with_suffix(f".{self.extension}"), attachment, time.perf_counter())
+        )
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                self._write(job)
+            except Exception as e:
+                logger.error(f"Failed to write artifact {job.path}: {str(e)}.")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, job: _ArtifactJob) -> None:
+        png = base64.b64decode(job.screenshot) if isinstance(job.screenshot, str) else job.screenshot
+        data = encode_image(png, self.image_format, self.quality, self.scale)
+        if self.store is not None:
+            blob = self.store.put_bytes(data, self.extension)
+            self.store.link(blob.path, job.path)
+            if job.attachment is not None:
+                self.store.link(blob.path, job.attachment)
+        else:
+            job.path.parent.mkdir(parents=True, exist_ok=True)
+            job.path.write_bytes(data)
+            # The attachment shares the written file instead of holding a second copy
+            if job.attachment is not None:
+                link_reference(job.attachment, job.path)
+        logger.debug(
+            f"Artifact {job.path} written ({len(png)} -> {len(data)} bytes) "
+            f"{time.perf_counter() - job.submitted:.2f}s after capture."
+        )
+
+    def drain(self, timeout: int | float = DRAIN_TIMEOUT) -> bool:
+        """
+        Wait until all queued artifacts are written.
+
+        Returns:
+            bool: True if the queue drained within the timeout
+        """
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() > deadline:
+                logger.warning(f"{self._queue.unfinished_tasks} artifacts still pending after {timeout}s.")
+                return False
+            time.sleep(0.05)
+        return True
+
+
+_artifact_writer: ArtifactWriter | None = None
+_artifact_writer_lock = threading.Lock()
+
+
+def get_artifact_writer(
+    image_format: str = "webp", quality: int = 80, scale: float = 1.0, store: ArtifactStore | None = None
+) -> ArtifactWriter:
+    """Return the process-wide artifact writer, creating it on first use."""
+    global _artifact_writer
+    with _artifact_writer_lock:
+        if _artifact_writer is None:
+            _artifact_writer = ArtifactWriter(image_format, quality, scale, store)
+        return _artifact_writer
+
+
+def peek_artifact_writer() -> ArtifactWriter | None:
+    """Return the process-wide artifact writer if one was created."""
+    return _artifact_writer
@@ -0,0 +1,118 @@
+"""
+Concurrent reachability checks for page assets (images, download links, etc.).
+Checks run over a pooled HTTP session, outside the browser's command stream.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import requests
+
+from utils.http_client import DEFAULT_TIMEOUT
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+# HEAD responses that usually mean "server doesn't support HEAD here", not "asset missing"
+HEAD_FALLBACK_STATUSES = {403, 405, 501}
+
+
+@dataclass
+class AssetReport:
+    url: str
+    status: int | None
+    size: int | None = None
+    latency: float = 0.0
+    content_type: str = ""
+    method: str = "HEAD"
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status is not None and 200 <= self.status < 400
+
+
+def _report_from_response(url: str, response: requests.Response, method: str, started: float) -> AssetReport:
+    length = response.headers.get("Content-Length")
+    return AssetReport(
+        url=url,
+        status=response.status_code,
+        size=int(length) if length and length.isdigit() else None,
+        latency=time.perf_counter() - started,
+        content_type=response.headers.get("Content-Type", "").split(";")[0].strip(),
+        method=method,
+    )
+
+
+def check_asset(url: str, session: requests.Session, timeout: int | float = DEFAULT_TIMEOUT) -> AssetReport:
+    """
+    Check a single asset with HEAD, falling back to a streamed GET.
+
+    Args:
+        url: Absolute asset URL
+        session: Pooled HTTP session (typically carrying the browser's cookies)
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        AssetReport: Status, size, latency and content type of the asset
+    """
+    started = time.perf_counter()
+    try:
+        response = session.head(url, timeout=timeout, allow_redirects=True)
+        if response.status_code not in HEAD_FALLBACK_STATUSES:
+            return _report_from_response(url, response, "HEAD", started)
+    except requests.RequestException as e:
+        logger.debug(f"HEAD failed for {url}, falling back to GET: {str(e)}")
+
+    started = time.perf_counter()
+    try:
+        # stream=True reads headers only; the body is never downloaded
+        with session.get(url, timeout=timeout, allow_redirects=True, stream=True) as response:
+            return _report_from_response(url, response, "GET", started)
+    except requests.RequestException as e:
+        return AssetReport(url=url, status=None, latency=time.perf_counter() - started, method="GET", error=str(e))
+
+
+def validate_assets(
+    urls: Iterable[str],
+    session: requests.Session,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: int | float = DEFAULT_TIMEOUT,
+) -> list[AssetReport]:
+    """
+    Check all asset URLs concurrently as a single batch.
+
+    Args:
+        urls: Asset URLs to check, e.g. one per element (duplicates are requested once)
+        session: Pooled HTTP session, its pool should be at least `concurrency` wide
+        concurrency: Maximum number of requests in flight
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        list[AssetReport]: One report per input URL, in input order; duplicates share their URL's report
+    """
+    urls = list(urls)
+    unique_urls = list(dict.fromkeys(url for url in urls if url))
+    checked: dict[str, AssetReport] = {}
+    started = time.perf_counter()
+    if unique_urls:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(unique_urls))) as executor:
+            checked = dict(zip(unique_urls, executor.map(lambda url: check_asset(url, session, timeout), unique_urls)))
+
+    # An element without a URL (e.g. an <img> with no src) is as broken as one pointing nowhere
+    reports = [checked[url] if url else AssetReport(url="", status=None, error="No URL") for url in urls]
+    broken = sum(1 for report in reports if not report.ok)
+    if reports:
+        logger.info(
+            f"Validated {len(reports)} assets ({len(unique_urls)} unique URLs) in "
+            f"{time.perf_counter() - started:.2f}s ({broken} unreachable, concurrency={concurrency})."
+        )
+    return reports
@@ -0,0 +1,33 @@
+"""
+Minimal WebDriver BiDi client over the session's webSocketUrl (Firefox).
+Shares the threading and dispatch model of CdpClient; BiDi has no per-target sessions.
+Requires: websocket-client.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from utils.cdp_client import CdpClient, CdpError
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+
+class BidiClient(CdpClient):
+    """Thread-safe BiDi client; events are dispatched to callbacks registered with on(event, callback)."""
+
+    @classmethod
+    def from_driver(cls, driver: WebDriver) -> BidiClient:
+        """Open an extra connection to the BiDi endpoint of a session started with webSocketUrl enabled."""
+        ws_url = driver.capabilities.get("webSocketUrl")
+        if not isinstance(ws_url, str):
+            raise CdpError("Session has no BiDi webSocketUrl (enable_bidi not set)")
+        return cls(ws_url)
+
+    def subscribe(self, events: list[str]) -> None:
+        """Subscribe this connection to BiDi events (e.g. "log.entryAdded")."""
+        self.send("session.subscribe", {"events": events})
+
+    def _error_text(self, message: dict[str, Any]) -> str:
+        return f"{message.get('message')} ({message.get('error')})"
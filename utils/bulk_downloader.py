@@ -0,0 +1,129 @@
+"""
+Out-of-browser bulk file downloads over a pooled HTTP session.
+Files are streamed to disk in chunks and hashed as they arrive.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import requests
+
+from utils.http_client import DEFAULT_TIMEOUT
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+CHUNK_SIZE = 256 * 1024
+
+
+@dataclass
+class BulkDownloadResult:
+    name: str
+    url: str
+    path: Path
+    size: int = 0
+    expected_size: int | None = None
+    sha256: str = ""
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.error and (self.expected_size is None or self.size == self.expected_size)
+
+
+def _unique_file_name(name: str, used: set[str]) -> str:
+    safe = name.replace("/", "_").replace("\\", "_").strip() or "download"
+    candidate, idx = safe, 1
+    while candidate in used:
+        candidate = f"{idx}_{safe}"
+        idx += 1
+    used.add(candidate)
+    return candidate
+
+
+def download_file(
+    url: str, name: str, dest_dir: Path, session: requests.Session, timeout: int | float = DEFAULT_TIMEOUT
+) -> BulkDownloadResult:
+    """
+    Stream a single file to disk, hashing it chunk by chunk.
+
+    Args:
+        url: Absolute download URL
+        name: File name to write under dest_dir
+        dest_dir: Target directory
+        session: Pooled HTTP session (typically carrying the browser's cookies)
+        timeout: Connect/read timeout in seconds
+
+    Returns:
+        BulkDownloadResult: Written size, expected size (Content-Length) and sha256
+    """
+    path = dest_dir / name
+    result = BulkDownloadResult(name=name, url=url, path=path)
+    digest = hashlib.sha256()
+    try:
+        with session.get(url, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            length = response.headers.get("Content-Length")
+            # Content-Length describes the encoded body when the server compresses it
+            if length and length.isdigit() and not response.headers.get("Content-Encoding"):
+                result.expected_size = int(length)
+            with open(path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    result.size += len(chunk)
+        result.sha256 = digest.hexdigest()
+        if not result.ok:
+            result.error = f"Size mismatch: expected {result.expected_size} bytes, got {result.size}"
+    except (requests.RequestException, OSError) as e:
+        result.error = str(e)
+    return result
+
+
+def download_all(
+    files: Iterable[tuple[str, str]],
+    dest_dir: Path,
+    session: requests.Session,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: int | float = DEFAULT_TIMEOUT,
+) -> list[BulkDownloadResult]:
+    """
+    Download many files concurrently.
+
+    Args:
+        files: (url, file name) pairs; duplicate names are made unique
+        dest_dir: Target directory (created if missing)
+        session: Pooled HTTP session, its pool should be at least `concurrency` wide
+        concurrency: Maximum number of downloads in flight
+        timeout: Connect/read timeout in seconds
+
+    Returns:
+        list[BulkDownloadResult]: One result per file, in input order
+    """
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    used: set[str] = set()
+    jobs = [(url, _unique_file_name(name, used)) for url, name in files]
+    if not jobs:
+        return []
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(jobs))) as executor:
+        results = list(executor.map(lambda job: download_file(job[0], job[1], dest_dir, session, timeout), jobs))
+
+    total = sum(result.size for result in results)
+    failed = sum(1 for result in results if not result.ok)
+    logger.info(
+        f"Downloaded {len(results)} files ({total} bytes) in {time.perf_counter() - started:.2f}s "
+        f"({failed} failed, concurrency={concurrency})."
+    )
+    return results
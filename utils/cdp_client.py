@@ -0,0 +1,178 @@
+"""
+Minimal Chrome DevTools Protocol client over the browser's remote debugging websocket.
+Unlike driver.execute_cdp_cmd, it receives CDP events and doesn't share the WebDriver connection.
+Requires: websocket-client, requests.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import threading
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
+
+import requests
+import websocket
+
+logger = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT = 5
+COMMAND_TIMEOUT = 10
+READ_POLL_INTERVAL = 1.0
+
+EventCallback = Callable[[dict[str, Any]], None]
+
+
+class CdpError(RuntimeError):
+    """Raised when a CDP command returns an error or the connection is lost."""
+
+
+class CdpClient:
+    """
+    Thread-safe CDP client bound to the browser-level websocket endpoint.
+
+    Commands can target the browser itself or an attached page session (session_id).
+    Events are dispatched from a background reader thread to registered callbacks,
+    so callbacks must be quick and hand heavy work off to another thread.
+    """
+
+    def __init__(self, ws_url: str, timeout: int | float = CONNECT_TIMEOUT) -> None:
+        self.ws_url = ws_url
+        self._ws = websocket.create_connection(ws_url, timeout=timeout, suppress_origin=True)
+        self._ws.settimeout(READ_POLL_INTERVAL)
+        self._ids = itertools.count(1)
+        self._pending: dict[int, Future[dict[str, Any]]] = {}
+        self._listeners: dict[tuple[str, str | None], list[EventCallback]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._reader = threading.Thread(target=self._read_loop, name="cdp-reader", daemon=True)
+        self._reader.start()
+        logger.debug(f"CDP client connected to {ws_url}.")
+
+    @classmethod
+    def from_debug_port(cls, port: int, host: str = "127.0.0.1") -> CdpClient:
+        """Connect to the browser target exposed on a --remote-debugging-port."""
+        info = requests.get(f"http://{host}:{port}/json/version", timeout=CONNECT_TIMEOUT).json()
+        return cls(info["webSocketDebuggerUrl"])
+
+    @property
+    def closed(self) -> bool:
+        return self._closed.is_set()
+
+    def send_async(
+        self, method: str, params: dict[str, Any] | None = None, session_id: str | None = None
+    ) -> Future[dict[str, Any]]:
+        """Send a command without waiting; the returned future resolves to the command result."""
+        if self.closed:
+            raise CdpError(f"Cannot send {method}: CDP connection is closed")
+        message: dict[str, Any] = {"id": next(self._ids), "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        future: Future[dict[str, Any]] = Future()
+        with self._lock:
+            self._pending[message["id"]] = future
+        with self._send_lock:
+            self._ws.send(json.dumps(message))
+        return future
+
+    def send(
+        self,
+        method: str,
+        params: dict[str, Any] | None = None,
+        session_id: str | None = None,
+        timeout: int | float = COMMAND_TIMEOUT,
+    ) -> dict[str, Any]:
+        """Send a command and block until its result arrives."""
+        return self.send_async(method, params, session_id).result(timeout=timeout)
+
+    def on(self, event: str, callback: EventCallback, session_id: str | None = None) -> None:
+        """Register a callback for an event, optionally scoped to an attached session."""
+        with self._lock:
+            self._listeners[(event, session_id)].append(callback)
+
+    def off(self, event: str, callback: EventCallback, session_id: str | None = None) -> None:
+        """Remove a previously registered event callback."""
+        with self._lock:
+            callbacks = self._listeners.get((event, session_id), [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def attach_to_page(self, target_id: str | None = None) -> str:
+        """
+        Attach a flat session to a page target and return its session id.
+
+        Args:
+            target_id: Target to attach to, defaults to the first page target
+
+        Returns:
+            str: CDP session id to pass to send()/on()
+        """
+        if target_id is None:
+            targets = self.send("Target.getTargets")["targetInfos"]
+            pages = [t for t in targets if t.get("type") == "page"]
+            if not pages:
+                raise CdpError("No page target available to attach to")
+            target_id = pages[0]["targetId"]
+        return self.send("Target.attachToTarget", {"targetId": target_id, "flatten": True})["sessionId"]
+
+    def close(self) -> None:
+        """Close the websocket and fail any command still waiting for a result."""
+        if self.closed:
+            return
+        self._closed.set()
+        try:
+            self._ws.close()
+        except Exception as e:
+            logger.debug(f"Error closing CDP websocket: {str(e)}")
+        self._reader.join(timeout=READ_POLL_INTERVAL * 2)
+        self._fail_pending("CDP connection closed")
+
+    def _fail_pending(self, reason: str) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(CdpError(reason))
+
+    def _error_text(self, message: dict[str, Any]) -> str:
+        return f"{message['error'].get('message')} ({message['error'].get('code')})"
+
+    def _dispatch(self, message: dict[str, Any]) -> None:
+        if "id" in message:
+            with self._lock:
+                future = self._pending.pop(message["id"], None)
+            if future is None:
+                return
+            if "error" in message:
+                future.set_exception(CdpError(self._error_text(message)))
+            else:
+                future.set_result(message.get("result", {}))
+            return
+
+        with self._lock:
+            callbacks = list(self._listeners.get((message.get("method", ""), message.get("sessionId")), []))
+        for callback in callbacks:
+            try:
+                callback(message.get("params", {}))
+            except Exception as e:
+                logger.error(f"CDP event callback failed for {message.get('method')}: {str(e)}")
+
+    def _read_loop(self) -> None:
+        while not self.closed:
+            try:
+                raw = self._ws.recv()
+            except websocket.WebSocketTimeoutException:
+                continue
+            except Exception as e:
+                if not self.closed:
+                    logger.warning(f"CDP connection lost: {str(e)}")
+                    self._closed.set()
+                break
+            if raw:
+                self._dispatch(json.loads(raw))
+        self._fail_pending("CDP connection lost")
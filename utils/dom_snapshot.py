@@ -0,0 +1,139 @@
+"""
+Cached, structured DOM snapshots.
+The serialized DOM is fetched once per document version and queried locally with lxml
+(CSS via cssselect, XPath, text), instead of pulling page_source over the wire for every check.
+Requires: lxml, cssselect.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+import lxml.html
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+logger = logging.getLogger(__name__)
+
+MAX_SNAPSHOTS = 8
+MAX_CACHED_BYTES = 32 * 1024 * 1024
+
+# Version = document identity (timeOrigin changes on every navigation) + DOM mutation counter.
+# The serialized DOM is only returned when the caller doesn't already hold that version.
+SNAPSHOT_JS = """
+const known = arguments[0];
+if (window.__domSnapshotVersion === undefined) {
+    window.__domSnapshotVersion = 0;
+    new MutationObserver(() => { window.__domSnapshotVersion++; }).observe(
+        document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+const version = performance.timeOrigin + ':' + window.__domSnapshotVersion;
+return [version, known.includes(version) ? null : document.documentElement.outerHTML];
+"""
+
+# A null end (Python None) would slice to index 0, so it is passed as undefined
+SOURCE_SLICE_JS = "return document.documentElement.outerHTML.slice(arguments[0], arguments[1] ?? undefined);"
+
+
+class DomSnapshot:
+    """Immutable snapshot of one document version; parsed lazily on the first structured query."""
+
+    def __init__(self, version: str, source: str) -> None:
+        self.version = version
+        self.source = source
+        self._tree: Any = None
+        self._lower_source: str | None = None
+
+    @property
+    def size(self) -> int:
+        return len(self.source)
+
+    @property
+    def tree(self) -> Any:
+        if self._tree is None:
+            self._tree = lxml.html.fromstring(self.source)
+        return self._tree
+
+    def css(self, selector: str) -> list[Any]:
+        """Return elements matching a CSS selector."""
+        return list(self.tree.cssselect(selector))
+
+    def xpath(self, expression: str) -> Any:
+        """Return the result of an XPath expression (a node list, string, number or boolean)."""
+        return self.tree.xpath(expression)
+
+    def text(self, selector: str | None = None) -> str:
+        """Return the text content of the first element matching `selector`, or of the whole document."""
+        if selector is None:
+            return self.tree.text_content().strip()
+        matches = self.css(selector)
+        return matches[0].text_content().strip() if matches else ""
+
+    def contains(self, value: str, ignore_case: bool = False) -> bool:
+        """Check if the serialized DOM contains a string."""
+        if not ignore_case:
+            return value in self.source
+        if self._lower_source is None:
+            self._lower_source = self.source.lower()
+        return value.lower() in self._lower_source
+
+
+class DomSnapshotCache:
+    """
+    Per-process LRU of DOM snapshots keyed by WebDriver session and document version.
+    Bounded both by entry count and by total serialized size.
+    """
+
+    def __init__(self, max_snapshots: int = MAX_SNAPSHOTS, max_bytes: int = MAX_CACHED_BYTES) -> None:
+        self.max_snapshots = max_snapshots
+        self.max_bytes = max_bytes
+        self._snapshots: OrderedDict[tuple[str, str], DomSnapshot] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, driver: WebDriver) -> DomSnapshot:
+        """Return the snapshot of the driver's current document, fetching the DOM only if it changed."""
+        session_id = str(getattr(driver, "session_id", ""))
+        with self._lock:
+            known = [version for sid, version in self._snapshots if sid == session_id]
+
+        version, source = driver.execute_script(SNAPSHOT_JS, known)
+        key = (session_id, version)
+        with self._lock:
+            if source is None and key in self._snapshots:
+                self._snapshots.move_to_end(key)
+                logger.debug(f"DOM snapshot cache hit for version {version}.")
+                return self._snapshots[key]
+
+        if source is None:
+            # Evicted between the lookup and the script call - fetch the DOM explicitly
+            version, source = driver.execute_script(SNAPSHOT_JS, [])
+            key = (session_id, version)
+
+        snapshot = DomSnapshot(version, source)
+        with self._lock:
+            self._snapshots[key] = snapshot
+            self._evict()
+        logger.debug(f"Fetched DOM snapshot version {version} ({snapshot.size} chars).")
+        return snapshot
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+
+    def _evict(self) -> None:
+        total = sum(snapshot.size for snapshot in self._snapshots.values())
+        while self._snapshots and (len(self._snapshots) > self.max_snapshots or total > self.max_bytes):
+            _, evicted = self._snapshots.popitem(last=False)
+            total -= evicted.size
+
+
+snapshot_cache = DomSnapshotCache()
+
+
+def source_slice(driver: WebDriver, start: int = 0, end: int | None = None) -> str:
+    """Return a slice of the serialized DOM, computed in the browser so only the slice is transferred."""
+    return driver.execute_script(SOURCE_SLICE_JS, start, end)
@@ -0,0 +1,236 @@
+"""
+Event-driven browser download tracking.
+Chrome: Browser.setDownloadBehavior + Browser.downloadProgress events over CDP.
+Firefox: inotify-backed directory watching (watchdog) for completed renames.
+Requires: websocket-client, watchdog.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from selenium import webdriver
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.observers import Observer
+
+from utils.cdp_client import CdpClient
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+logger = logging.getLogger(__name__)
+
+PARTIAL_DOWNLOAD_SUFFIXES = (".crdownload", ".part", ".tmp")
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class DownloadedFile:
+    name: str
+    path: Path
+    size: int
+    sha256: str
+
+
+def is_partial_download(path: Path) -> bool:
+    """Check if a path is an in-progress download placeholder."""
+    return path.name.endswith(PARTIAL_DOWNLOAD_SUFFIXES)
+
+
+def hash_file(path: Path) -> str:
+    """Compute the sha256 hex digest of a file in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _DownloadDirHandler(FileSystemEventHandler):
+    """Resolves downloads when Firefox renames `<name>.part` to its final name or closes a written file."""
+
+    def __init__(self, manager: DownloadManager) -> None:
+        self.manager = manager
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        dest = Path(str(event.dest_path))
+        if not event.is_directory and not is_partial_download(dest):
+            self.manager._complete(dest)
+
+    def on_closed(self, event: FileSystemEvent) -> None:
+        path = Path(str(event.src_path))
+        if event.is_directory or is_partial_download(path):
+            return
+        # Firefox writes an empty placeholder next to the .part file - wait for the rename instead
+        if any(path.with_name(path.name + suffix).exists() for suffix in PARTIAL_DOWNLOAD_SUFFIXES):
+            return
+        if path.exists() and path.stat().st_size > 0:
+            self.manager._complete(path)
+
+
+class DownloadManager:
+    """
+    Tracks browser downloads into a directory and exposes one future per file.
+
+    Futures resolve with a DownloadedFile (size and sha256) once the browser reports
+    the download complete, so tests wait exactly as long as each download takes.
+    """
+
+    def __init__(self, driver: WebDriver, download_dir: Path, debug_port: int | None = None) -> None:
+        self.driver = driver
+        self.download_dir = download_dir
+        self.debug_port = debug_port
+        # Futures returned by expect() before their download began, and of downloads nobody expected yet
+        self._expected: dict[str, list[Future[DownloadedFile]]] = {}
+        self._unexpected: dict[str, list[Future[DownloadedFile]]] = {}
+        self._names: dict[Future[DownloadedFile], str] = {}
+        # In-flight CDP downloads by guid: several downloads may share a suggested filename
+        self._guid_futures: dict[str, tuple[str, Future[DownloadedFile]]] = {}
+        self._completed_paths: set[Path] = set()
+        self._lock = threading.Lock()
+        self._hash_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="download-hash")
+        self._cdp: CdpClient | None = None
+        self._observer: Any = None
+
+    def start(self) -> DownloadManager:
+        """Start tracking downloads for the current browser."""
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+        if isinstance(self.driver, webdriver.Chrome) and self.debug_port is not None:
+            self._start_cdp()
+        else:
+            self._start_watcher()
+        return self
+
+    def _start_cdp(self) -> None:
+        assert self.debug_port is not None
+        self._cdp = CdpClient.from_debug_port(self.debug_port)
+        self._cdp.on("Browser.downloadWillBegin", self._on_download_will_begin)
+        self._cdp.on("Browser.downloadProgress", self._on_download_progress)
+        self._cdp.send(
+            "Browser.setDownloadBehavior",
+            {"behavior": "allow", "downloadPath": str(self.download_dir.resolve()), "eventsEnabled": True},
+        )
+        logger.info(f"Tracking Chrome downloads via CDP into: {self.download_dir}")
+
+    def _start_watcher(self) -> None:
+        self._observer = Observer()
+        self._observer.schedule(_DownloadDirHandler(self), str(self.download_dir), recursive=False)
+        self._observer.start()
+        logger.info(f"Watching download directory: {self.download_dir}")
+
+    def _on_download_will_begin(self, params: dict[str, Any]) -> None:
+        name = params.get("suggestedFilename", "")
+        with self._lock:
+            self._guid_futures[params["guid"]] = (name, self._bind(name))
+        logger.debug(f"Download started: {name} ({params.get('url')})")
+
+    def _on_download_progress(self, params: dict[str, Any]) -> None:
+        state = params.get("state")
+        if state == "inProgress":
+            return
+        with self._lock:
+            entry = self._guid_futures.pop(params["guid"], None)
+        if entry is None:
+            return
+        name, future = entry
+        if state == "completed":
+            file_path = params.get("filePath")
+            self._resolve(future, Path(file_path) if file_path else self.download_dir / name, name)
+        elif state == "canceled" and not future.done():
+            future.set_exception(RuntimeError(f"Download canceled: {name}"))
+
+    def _bind(self, name: str) -> Future[DownloadedFile]:
+        """Future for a download that just began: the oldest expect() still waiting for the name, else a new one."""
+        expected = self._expected.get(name)
+        if expected:
+            return expected.pop(0)
+        future: Future[DownloadedFile] = Future()
+        self._names[future] = name
+        self._unexpected.setdefault(name, []).append(future)
+        return future
+
+    def _complete(self, path: Path) -> None:
+        """A file finished downloading into the watched directory (no download events for this browser)."""
+        with self._lock:
+            # The rename and the close of one file may both report it
+            if path in self._completed_paths:
+                return
+            self._completed_paths.add(path)
+            future = self._bind(path.name)
+        self._resolve(future, path, path.name)
+
+    def _resolve(self, future: Future[DownloadedFile], path: Path, name: str) -> None:
+        if future.done():
+            return
+
+        def resolve() -> None:
+            try:
+                future.set_result(
+                    DownloadedFile(name=name, path=path, size=path.stat().st_size, sha256=hash_file(path))
+                )
+                logger.info(f"Download completed: {path.name}")
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+
+        # Hash off the CDP reader / inotify thread so other events keep flowing
+        self._hash_executor.submit(resolve)
+
+    def expect(self, file_name: str) -> Future[DownloadedFile]:
+        """
+        Return the future for a file download, creating it if the download hasn't started yet.
+        Downloads sharing a file name resolve the futures expected for it in the order they begin.
+        """
+        with self._lock:
+            unexpected = self._unexpected.get(file_name)
+            if unexpected:
+                return unexpected.pop(0)
+            future: Future[DownloadedFile] = Future()
+            self._names[future] = file_name
+            self._expected.setdefault(file_name, []).append(future)
+            return future
+
+    def wait_all(self, futures: Iterable[Future[DownloadedFile]], timeout: int | float) -> list[DownloadedFile]:
+        """
+        Wait for downloads to complete.
+
+        Args:
+            futures: Futures returned by expect()
+            timeout: Overall timeout in seconds
+
+        Returns:
+            list[DownloadedFile]: Completed downloads (failed or pending ones are logged and left out)
+        """
+        done, not_done = wait(list(futures), timeout=timeout)
+        for future in not_done:
+            logger.warning(f"Download not completed after {timeout}s: {self._names.get(future, '?')}")
+        results = []
+        for future in done:
+            if future.exception() is not None:
+                logger.warning(f"Download failed: {future.exception()}")
+            else:
+                results.append(future.result())
+        return results
+
+    def close(self) -> None:
+        """Stop tracking and restore Chrome's default download behavior."""
+        if self._cdp is not None:
+            try:
+                self._cdp.send("Browser.setDownloadBehavior", {"behavior": "default"})
+            except Exception as e:
+                logger.debug(f"Failed to reset download behavior: {str(e)}")
+            self._cdp.close()
+            self._cdp = None
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
+        self._hash_executor.shutdown(wait=False, cancel_futures=True)
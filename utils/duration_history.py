@@ -0,0 +1,269 @@
+"""
+Persistent per-test duration history (SQLite).
+One row per test and session: nodeid, browser, worker, setup/call/teardown durations, outcome
+and rerun count. Written once at the end of each session by the controller process, read by
+the query CLI and by duration-aware scheduling.
+
+Usage:
+    python -m utils.duration_history slowest [--limit 20] [--browser chrome] [--runs 20]
+    python -m utils.duration_history stats <nodeid substring> [--browser chrome] [--runs 20]
+    python -m utils.duration_history trend [--runs 10] [--browser chrome]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import statistics
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+DEFAULT_DB = Path("test_history") / "durations.sqlite"
+DEFAULT_RUNS = 20
+# Recent/older windows (in runs) compared by the regression report
+TREND_RECENT_RUNS = 3
+REGRESSION_RATIO = 1.5
+REGRESSION_MIN_SECONDS = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    finished_at REAL NOT NULL,
+    browser TEXT NOT NULL,
+    exit_status INTEGER
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    nodeid TEXT NOT NULL,
+    browser TEXT NOT NULL,
+    worker TEXT NOT NULL,
+    setup_seconds REAL NOT NULL,
+    call_seconds REAL NOT NULL,
+    teardown_seconds REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    reruns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_nodeid ON results (nodeid, browser);
+"""
+
+
+@dataclass
+class DurationRecord:
+    nodeid: str
+    worker: str = "local"
+    setup_seconds: float = 0.0
+    call_seconds: float = 0.0
+    teardown_seconds: float = 0.0
+    outcome: str = "passed"
+    reruns: int = 0
+
+    @property
+    def total_seconds(self) -> float:
+        return self.setup_seconds + self.call_seconds + self.teardown_seconds
+
+
+@dataclass
+class SessionDurations:
+    """Collects phase durations from test reports during one session."""
+
+    browser: str
+    started_at: float = field(default_factory=time.time)
+    tests: dict[str, DurationRecord] = field(default_factory=dict)
+
+    def record(self, nodeid: str, when: str, duration: float, outcome: str, worker: str) -> None:
+        """
+        Record one phase report.
+
+        A rerun report (pytest-rerunfailures) restarts the test's timings, so the stored
+        durations are those of the final attempt.
+        """
+        test = self.tests.setdefault(nodeid, DurationRecord(nodeid))
+        test.worker = worker
+        if outcome == "rerun":
+            test.reruns += 1
+            test.setup_seconds = test.call_seconds = test.teardown_seconds = 0.0
+            return
+        setattr(test, f"{when}_seconds", duration)
+        # Setup/teardown failures and skips decide the outcome; a passing teardown keeps the call outcome
+        if when == "call" or outcome != "passed":
+            test.outcome = "error" if when != "call" and outcome == "failed" else outcome
+
+    def write(self, db_path: Path = DEFAULT_DB, exit_status: int | None = None) -> str:
+        """Append this session to the history database and return its run id."""
+        run_id = uuid.uuid4().hex
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        with connect(db_path) as conn:
+            conn.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?)",
+                (run_id, self.started_at, time.time(), self.browser, exit_status),
+            )
+            conn.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id,
+                        t.nodeid,
+                        self.browser,
+                        t.worker,
+                        t.setup_seconds,
+                        t.call_seconds,
+                        t.teardown_seconds,
+                        t.outcome,
+                        t.reruns,
+                    )
+                    for t in self.tests.values()
+                ],
+            )
+        return run_id
+
+
+@contextmanager
+def connect(db_path: Path = DEFAULT_DB) -> Generator[sqlite3.Connection, None, None]:
+    """Open the history database (creating the schema), commit on success and close."""
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        conn.executescript(SCHEMA)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _recent_run_ids(conn: sqlite3.Connection, browser: str | None, runs: int) -> list[str]:
+    query = "SELECT run_id FROM runs" + (" WHERE browser = ?" if browser else "") + " ORDER BY started_at DESC LIMIT ?"
+    params: tuple[object, ...] = (browser, runs) if browser else (runs,)
+    return [row[0] for row in conn.execute(query, params)]
+
+
+def load_samples(
+    db_path: Path = DEFAULT_DB, browser: str | None = None, runs: int = DEFAULT_RUNS
+) -> dict[str, list[float]]:
+    """
+    Total durations (setup + call + teardown) per nodeid over the most recent runs.
+    Skipped tests are left out, their durations say nothing about a real run.
+
+    Returns:
+        dict: nodeid -> durations, most recent first
+    """
+    if not db_path.exists():
+        return {}
+    with connect(db_path) as conn:
+        run_ids = _recent_run_ids(conn, browser, runs)
+        if not run_ids:
+            return {}
+        placeholders = ",".join("?" * len(run_ids))
+        rows = conn.execute(
+            f"SELECT r.nodeid, r.setup_seconds + r.call_seconds + r.teardown_seconds FROM results r "
+            f"JOIN runs USING (run_id) WHERE r.run_id IN ({placeholders}) AND r.outcome != 'skipped' "
+            f"ORDER BY runs.started_at DESC",
+            run_ids,
+        ).fetchall()
+    samples: dict[str, list[float]] = defaultdict(list)
+    for nodeid, total in rows:
+        samples[nodeid].append(total)
+    return dict(samples)
+
+
+def load_durations(
+    db_path: Path = DEFAULT_DB, browser: str | None = None, runs: int = DEFAULT_RUNS
+) -> dict[str, float]:
+    """Median total duration per nodeid over the most recent runs (the scheduling estimate)."""
+    return {nodeid: statistics.median(values) for nodeid, values in load_samples(db_path, browser, runs).items()}
+
+
+def percentile(values: list[float], pct: int) -> float:
+    """Inclusive percentile (pct in 1-99); the single value for one sample."""
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+
+def _print_stats_table(samples: dict[str, list[float]]) -> None:
+    print(f"{'p50':>8} {'p95':>8} {'max':>8} {'runs':>5}  nodeid")
+    for nodeid, values in samples.items():
+        print(
+            f"{percentile(values, 50):8.2f} {percentile(values, 95):8.2f} {max(values):8.2f} {len(values):5d}  {nodeid}"
+        )
+
+
+def cmd_slowest(args: argparse.Namespace) -> None:
+    samples = load_samples(args.db, args.browser, args.runs)
+    ranked = sorted(samples.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    _print_stats_table(dict(ranked[: args.limit]))
+
+
+def cmd_stats(args: argparse.Namespace) -> None:
+    samples = {k: v for k, v in load_samples(args.db, args.browser, args.runs).items() if args.nodeid in k}
+    if not samples:
+        print(f"No history for tests matching '{args.nodeid}'.")
+        return
+    _print_stats_table(samples)
+
+
+def cmd_trend(args: argparse.Namespace) -> None:
+    with connect(args.db) as conn:
+        run_ids = _recent_run_ids(conn, args.browser, args.runs)
+        print(f"{'started':19} {'browser':8} {'tests':>6} {'failed':>6} {'reruns':>6} {'test time':>10} {'wall':>8}")
+        for run_id in reversed(run_ids):
+            started, finished, browser, tests, failed, reruns, total = conn.execute(
+                "SELECT runs.started_at, runs.finished_at, runs.browser, COUNT(*), "
+                "SUM(outcome IN ('failed', 'error')), SUM(reruns), "
+                "SUM(setup_seconds + call_seconds + teardown_seconds) "
+                "FROM runs JOIN results USING (run_id) WHERE run_id = ?",
+                (run_id,),
+            ).fetchone()
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(started))
+            print(f"{stamp:19} {browser:8} {tests:6d} {failed:6d} {reruns:6d} {total:10.1f} {finished - started:8.1f}")
+
+    # Per-test regressions: median of the most recent runs against the older ones
+    regressions = []
+    for nodeid, values in load_samples(args.db, args.browser, args.runs).items():
+        recent, older = values[:TREND_RECENT_RUNS], values[TREND_RECENT_RUNS:]
+        if not older:
+            continue
+        recent_median, older_median = statistics.median(recent), statistics.median(older)
+        if recent_median - older_median >= REGRESSION_MIN_SECONDS and recent_median >= older_median * REGRESSION_RATIO:
+            regressions.append((recent_median / max(older_median, 1e-6), older_median, recent_median, nodeid))
+    if regressions:
+        print(f"\nSlower in the last {TREND_RECENT_RUNS} runs:")
+        for ratio, older_median, recent_median, nodeid in sorted(regressions, reverse=True):
+            print(f"{older_median:8.2f} -> {recent_median:8.2f} (x{ratio:.1f})  {nodeid}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Query the per-test duration history.")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="History database path")
+    parser.add_argument("--browser", default=None, help="Only runs of this browser")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="Number of most recent runs to consider")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    slowest = commands.add_parser("slowest", help="Slowest tests by median duration, with p50/p95")
+    slowest.add_argument("--limit", type=int, default=20)
+    slowest.set_defaults(func=cmd_slowest)
+
+    stats = commands.add_parser("stats", help="p50/p95 of tests matching a nodeid substring")
+    stats.add_argument("nodeid")
+    stats.set_defaults(func=cmd_stats)
+
+    trend = commands.add_parser("trend", help="Per-run totals and tests that got slower")
+    trend.set_defaults(func=cmd_trend)
+
+    args = parser.parse_args(argv)
+    if not args.db.exists():
+        parser.error(f"No history database at {args.db}")
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Duration-aware xdist scheduler.
+Tests are grouped into affinity chunks (same file/class, or the same xdist_group), so a worker
+keeps reusing the page its session driver is already on; chunks are capped in estimated
+duration, so one heavy parametrized file can't pin a single worker. Chunks are assigned
+longest-processing-time first from the duration history, and idle workers steal the tail of
+the queue with the most estimated work left.
+Requires: pytest-xdist.
+"""
+
+from __future__ import annotations
+
+import heapq
+import statistics
+import time
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any
+
+from xdist.scheduler.worksteal import MIN_PENDING, NodePending, WorkStealingScheduling
+
+if TYPE_CHECKING:
+    import pytest
+    from xdist.remote import Producer
+    from xdist.workermanage import WorkerController
+
+DEFAULT_ESTIMATE = 5.0
+# Floor of every estimate: tests recorded at 0s still count as work, so the steal always takes some
+MIN_ESTIMATE = 0.01
+AFFINITY_MAX_SECONDS = 60.0
+
+
+def affinity_key(nodeid: str) -> str:
+    """Tests sharing the key run on one worker when possible: the xdist_group, else file::Class."""
+    if "@" in nodeid:
+        return "@" + nodeid.rsplit("@", 1)[1]
+    return nodeid.split("[", 1)[0].rsplit("::", 1)[0]
+
+
+def build_chunks(
+    collection: Sequence[str], estimates: Sequence[float], max_chunk_seconds: float = AFFINITY_MAX_SECONDS
+) -> list[tuple[float, list[int]]]:
+    """
+    Split the collection into affinity chunks, each within max_chunk_seconds of estimated time
+    (xdist_group chunks are never split). Collection order is kept inside a chunk.
+
+    Returns:
+        list: (estimated seconds, item indices) per chunk
+    """
+    groups: dict[str, list[int]] = {}
+    for index, nodeid in enumerate(collection):
+        groups.setdefault(affinity_key(nodeid), []).append(index)
+
+    chunks: list[tuple[float, list[int]]] = []
+    for key, indices in groups.items():
+        splittable = not key.startswith("@")
+        current: list[int] = []
+        current_seconds = 0.0
+        for index in indices:
+            if splittable and current and current_seconds + estimates[index] > max_chunk_seconds:
+                chunks.append((current_seconds, current))
+                current, current_seconds = [], 0.0
+            current.append(index)
+            current_seconds += estimates[index]
+        chunks.append((current_seconds, current))
+    return chunks
+
+
+def lpt_assign(chunks: list[tuple[float, list[int]]], bins: int) -> list[tuple[float, list[int]]]:
+    """
+    Longest-processing-time-first: each chunk, longest first, goes to the least loaded bin.
+
+    Returns:
+        list: (estimated seconds, item indices) per bin
+    """
+    loads: list[tuple[float, int]] = [(0.0, b) for b in range(bins)]
+    assigned: list[list[int]] = [[] for _ in range(bins)]
+    totals = [0.0] * bins
+    for seconds, indices in sorted(chunks, key=lambda chunk: (-chunk[0], chunk[1][0])):
+        load, b = heapq.heappop(loads)
+        assigned[b].extend(indices)
+        totals[b] = load + seconds
+        heapq.heappush(loads, (totals[b], b))
+    return list(zip(totals, assigned))
+
+
+class DurationScheduling(WorkStealingScheduling):
+    """
+    Work-stealing scheduler with an LPT initial assignment from historical durations.
+    Projected (from the estimates) and actual makespan are reported by summary().
+    """
+
+    # Set by WorkStealingScheduling
+    collection: list[str] | None
+    steal_requested_from_node: WorkerController | None
+
+    def __init__(
+        self,
+        config: pytest.Config,
+        log: Producer | None = None,
+        durations: dict[str, float] | None = None,
+        max_chunk_seconds: float = AFFINITY_MAX_SECONDS,
+    ) -> None:
+        super().__init__(config, log)
+        self.durations = durations or {}
+        self.max_chunk_seconds = max_chunk_seconds
+        self.default_estimate = statistics.median(self.durations.values()) if self.durations else DEFAULT_ESTIMATE
+        self.estimates: list[float] = []
+        self.projected: dict[str, float] = {}
+        self.busy: dict[str, float] = {}
+        self.known = 0
+        self.steals = 0
+        self._started: float | None = None
+        self._finished: float | None = None
+
+    def schedule(self) -> None:
+        assert self.collection_is_completed
+        if self.collection is not None:
+            self.check_schedule()
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = next(iter(self.node2collection.values()))
+        if not self.collection:
+            return
+        self.estimates = [
+            max(self.durations.get(nodeid, self.default_estimate), MIN_ESTIMATE) for nodeid in self.collection
+        ]
+        self.known = sum(1 for nodeid in self.collection if nodeid in self.durations)
+
+        nodes = [node for node in self.nodes if not node.shutting_down]
+        chunks = build_chunks(self.collection, self.estimates, self.max_chunk_seconds)
+        self._started = time.monotonic()
+        for node, (seconds, indices) in zip(nodes, lpt_assign(chunks, len(nodes))):
+            self.projected[node.gateway.id] = seconds
+            if indices:
+                self.node2pending[node].extend(indices)
+                node.send_runtest_some(indices)
+        self.check_schedule()
+
+    def mark_test_complete(self, node: WorkerController, item_index: int, duration: float | None = None) -> None:
+        worker = node.gateway.id
+        self.busy[worker] = self.busy.get(worker, 0.0) + (duration or 0.0)
+        self._finished = time.monotonic()
+        super().mark_test_complete(node, item_index, duration)
+
+    def _remaining(self, pending: list[int]) -> float:
+        # The first pending item is already running
+        return sum(self.estimates[index] for index in pending[1:])
+
+    def check_schedule(self) -> None:
+        """Hand out returned/stolen tests to idle nodes, else steal from the node with the most estimated work."""
+        nodes_up = [NodePending(node, pending) for node, pending in self.node2pending.items() if not node.shutting_down]
+
+        def get_idle_nodes() -> list[WorkerController]:
+            return [node for node, pending in nodes_up if len(pending) < MIN_PENDING]
+
+        idle_nodes = get_idle_nodes()
+        if not idle_nodes:
+            return
+
+        if self.pending:
+            for i, node in enumerate(idle_nodes):
+                self._send_tests(node, len(self.pending) // (len(idle_nodes) - i))
+            idle_nodes = get_idle_nodes()
+            if not idle_nodes:
+                return
+
+        if self.steal_requested_from_node is not None:
+            return
+
+        busy_nodes = [node_pending for node_pending in nodes_up if len(node_pending.pending) > MIN_PENDING]
+        steal_from = max(busy_nodes, key=lambda node_pending: self._remaining(node_pending.pending), default=None)
+
+        # Take the tail holding about half of the victim's remaining estimated work
+        num_steal, stolen_seconds = 0, 0.0
+        if steal_from is not None:
+            pending = steal_from.pending
+            target = self._remaining(pending) / 2
+            while num_steal < len(pending) - MIN_PENDING and stolen_seconds < target:
+                num_steal += 1
+                stolen_seconds += self.estimates[pending[-num_steal]]
+        if steal_from is None or num_steal == 0:
+            # Nothing to steal - shut idle nodes down so they run their last test now
+            for node in idle_nodes:
+                node.shutdown()
+            return
+        steal_from.node.send_steal(pending[-num_steal:])
+        self.steal_requested_from_node = steal_from.node
+        self.steals += 1
+
+    def summary(self) -> dict[str, Any]:
+        """Projected vs actual makespan and per-worker load."""
+        actual = (self._finished - self._started) if self._started is not None and self._finished is not None else 0.0
+        return {
+            "tests": len(self.collection or []),
+            "tests_with_history": self.known,
+            "workers": len(self.projected),
+            "projected_makespan_seconds": round(max(self.projected.values(), default=0.0), 2),
+            "actual_makespan_seconds": round(actual, 2),
+            "steals": self.steals,
+            "projected_seconds_per_worker": {k: round(v, 2) for k, v in sorted(self.projected.items())},
+            "busy_seconds_per_worker": {k: round(v, 2) for k, v in sorted(self.busy.items())},
+        }
@@ -0,0 +1,175 @@
+"""
+Background queue for video encoding jobs, kept off the test's critical path.
+Jobs run on a small per-worker thread pool (each job drives an ffmpeg process), and a
+machine-wide cap on concurrent encodes is enforced with file-lock slots shared by all
+xdist workers and concurrent runs, so encoding can't starve the browsers of CPU.
+Requires: filelock.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+from filelock import FileLock, Timeout
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SLOTS_DIR = Path(tempfile.gettempdir()) / "selenium-python-encode-slots"
+SLOT_POLL_INTERVAL = 0.1
+DRAIN_TIMEOUT = 300
+
+
+def default_slot_count() -> int:
+    """Concurrent encodes allowed per machine: a quarter of the CPUs, at least one."""
+    return max(1, (os.cpu_count() or 1) // 4)
+
+
+class MachineSlots:
+    """Counting semaphore across processes, built from N lock files in a shared directory."""
+
+    def __init__(self, count: int, directory: Path = SLOTS_DIR) -> None:
+        self.count = count
+        directory.mkdir(parents=True, exist_ok=True)
+        self._locks = [FileLock(directory / f"slot_{idx}.lock") for idx in range(count)]
+
+    def acquire(self) -> FileLock:
+        """Block until a slot is free and return its held lock."""
+        while True:
+            for lock in self._locks:
+                try:
+                    lock.acquire(timeout=0)
+                    return lock
+                except Timeout:
+                    continue
+            time.sleep(SLOT_POLL_INTERVAL)
+
+
+@dataclass
+class EncodeJobMetrics:
+    label: str
+    queue_depth: int
+    wait_seconds: float = 0.0
+    encode_seconds: float = 0.0
+    latency_seconds: float = 0.0
+    error: str = ""
+
+
+class EncodeQueue:
+    """
+    Runs encode jobs in the background and tracks queue depth and latency.
+
+    Latency is measured from submit to completion; wait is the time spent queued or
+    waiting for a machine-wide slot.
+    """
+
+    def __init__(self, slots: int | None = None, slots_dir: Path = SLOTS_DIR) -> None:
+        self.slots = MachineSlots(slots or default_slot_count(), slots_dir)
+        self._executor = ThreadPoolExecutor(max_workers=self.slots.count, thread_name_prefix="video-encode")
+        self._futures: set[Future[Any]] = set()
+        self._metrics: list[EncodeJobMetrics] = []
+        self._lock = threading.Lock()
+
+    @property
+    def depth(self) -> int:
+        """Jobs submitted but not finished yet."""
+        with self._lock:
+            return len(self._futures)
+
+    def submit(self, job: Callable[[], T], label: str = "") -> Future[T]:
+        """Queue a job; the returned future resolves to its result."""
+        submitted = time.perf_counter()
+        with self._lock:
+            metrics = EncodeJobMetrics(label=label, queue_depth=len(self._futures) + 1)
+            self._metrics.append(metrics)
+
+        def run() -> T:
+            slot = self.slots.acquire()
+            started = time.perf_counter()
+            metrics.wait_seconds = started - submitted
+            try:
+                return job()
+            except Exception as e:
+                metrics.error = str(e)
+                raise
+            finally:
+                slot.release()
+                metrics.encode_seconds = time.perf_counter() - started
+                metrics.latency_seconds = time.perf_counter() - submitted
+                logger.debug(
+                    f"Encode job '{label}' finished in {metrics.latency_seconds:.2f}s "
+                    f"(waited {metrics.wait_seconds:.2f}s, queue depth {metrics.queue_depth})."
+                )
+
+        future = self._executor.submit(run)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._discard)
+        return future
+
+    def _discard(self, future: Future[Any]) -> None:
+        with self._lock:
+            self._futures.discard(future)
+
+    def drain(self, timeout: int | float = DRAIN_TIMEOUT) -> bool:
+        """
+        Wait for all queued jobs to finish.
+
+        Returns:
+            bool: True if the queue drained within the timeout
+        """
+        with self._lock:
+            pending = list(self._futures)
+        if pending:
+            logger.info(f"Draining {len(pending)} pending encode jobs.")
+        _, not_done = wait(pending, timeout=timeout)
+        if not_done:
+            logger.warning(f"{len(not_done)} encode jobs still running after {timeout}s.")
+        return not not_done
+
+    def summary(self) -> dict[str, Any]:
+        """Aggregate queue depth and latency metrics of all submitted jobs."""
+        with self._lock:
+            metrics = list(self._metrics)
+        latencies = sorted(m.latency_seconds for m in metrics)
+        return {
+            "jobs": len(metrics),
+            "failed": sum(1 for m in metrics if m.error),
+            "slots": self.slots.count,
+            "max_queue_depth": max((m.queue_depth for m in metrics), default=0),
+            "mean_wait_seconds": round(statistics.fmean(m.wait_seconds for m in metrics), 3) if metrics else 0.0,
+            "p50_latency_seconds": round(statistics.median(latencies), 3) if latencies else 0.0,
+            "max_latency_seconds": round(latencies[-1], 3) if latencies else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_encode_queue: EncodeQueue | None = None
+_encode_queue_lock = threading.Lock()
+
+
+def get_encode_queue(slots: int | None = None) -> EncodeQueue:
+    """Return the process-wide encode queue, creating it on first use."""
+    global _encode_queue
+    with _encode_queue_lock:
+        if _encode_queue is None:
+            _encode_queue = EncodeQueue(slots)
+        return _encode_queue
+
+
+def peek_encode_queue() -> EncodeQueue | None:
+    """Return the process-wide encode queue if one was created."""
+    return _encode_queue
@@ -0,0 +1,66 @@
+"""
+Pooled HTTP session helpers for tests and page objects that talk to the application
+without going through the browser.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import requests
+from requests.adapters import HTTPAdapter
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_TIMEOUT = 10
+
+
+def create_http_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """
+    Create a keep-alive requests.Session backed by a connection pool.
+
+    Args:
+        pool_size: Maximum number of pooled connections kept open per host
+
+    Returns:
+        requests.Session: Session reusing TCP/TLS connections across requests
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
+def copy_driver_cookies(driver: WebDriver, session: requests.Session) -> requests.Session:
+    """
+    Copy the browser's cookies and user agent into an HTTP session.
+
+    Lets out-of-browser requests reuse the browser's authenticated state.
+
+    Args:
+        driver: WebDriver whose cookies should be reused
+        session: Session to receive the cookies
+
+    Returns:
+        requests.Session: The same session, for chaining
+    """
+    for cookie in driver.get_cookies():
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain", ""),
+            path=cookie.get("path", "/"),
+        )
+    user_agent = driver.execute_script("return navigator.userAgent")
+    if user_agent:
+        session.headers["User-Agent"] = user_agent
+    return session
+
+
+def create_session_from_driver(driver: WebDriver, pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """Create a pooled HTTP session that carries over the driver's cookies and user agent."""
+    return copy_driver_cookies(driver, create_http_session(pool_size))
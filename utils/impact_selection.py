@@ -0,0 +1,270 @@
+"""
+Change-based test impact selection.
+A static import graph of the project, plus the page objects each test reaches through
+PageManager.get_*_page(), maps every test file to the modules it depends on; the files changed
+since a git base then select only the test files depending on them. PageManager and MainPage
+import every page just to route to it, so those edges are not followed. A change to anything
+the whole suite depends on (BasePage, fixtures and plugins, config, conftest.py, dependencies)
+selects everything.
+
+Usage:
+    python -m utils.impact_selection [--base origin/main] [--browser chrome]
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import subprocess
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+PROJECT_PACKAGES = ("pages", "tests", "utils", "config", "pytest_plugins", "conftest")
+PAGE_MANAGER = "pages.base.page_manager"
+# Modules importing every page only to navigate to it
+ROUTER_MODULES = (PAGE_MANAGER, "pages.common.main_page.main_page")
+# The whole suite depends on these (and everything they import)
+GLOBAL_ROOTS = ("conftest", "pytest_plugins", "config", "pages.base", "pages.common")
+GLOBAL_FILES = ("requirements.txt", "pyproject.toml", ".env")
+TESTS_DIR = "tests"
+
+
+@dataclass
+class ImpactSelection:
+    changed: list[str]
+    run_all: bool = False
+    reason: str = ""
+    test_files: list[str] = field(default_factory=list)
+
+
+def module_name(path: Path) -> str:
+    """Dotted module name of a project file path relative to the repo root."""
+    parts = list(path.with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def project_modules(root: Path) -> dict[str, Path]:
+    modules: dict[str, Path] = {}
+    for package in PROJECT_PACKAGES:
+        candidates = [root / f"{package}.py"] + sorted((root / package).rglob("*.py"))
+        for path in candidates:
+            if path.is_file() and "__pycache__" not in path.parts:
+                modules[module_name(path.relative_to(root))] = path
+    return modules
+
+
+def _imports(tree: ast.AST, module: str, is_package: bool, modules: dict[str, Path]) -> set[str]:
+    """Project modules imported by a module, TYPE_CHECKING imports included (they change with the module)."""
+    imported: set[str] = set()
+    package = module if is_package else module.rpartition(".")[0]
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                anchor = package.split(".")[: len(package.split(".")) - node.level + 1]
+                base = ".".join(anchor + ([base] if base else []))
+            # `from package import module` imports the submodule, `from module import name` the module
+            names = [f"{base}.{alias.name}" for alias in node.names] + [base]
+        else:
+            continue
+        for name in names:
+            # `import pages.base.base_page` also runs the parent packages, which are rarely interesting here
+            while name and name not in modules:
+                name = name.rpartition(".")[0]
+            if name:
+                imported.add(name)
+    imported.discard(module)
+    return imported
+
+
+def build_import_graph(root: Path, modules: dict[str, Path]) -> dict[str, set[str]]:
+    graph: dict[str, set[str]] = {}
+    for module, path in modules.items():
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        edges = _imports(tree, module, path.name == "__init__.py", modules)
+        if module in ROUTER_MODULES:
+            edges = {edge for edge in edges if not edge.startswith("pages.features.")}
+        graph[module] = edges
+    return graph
+
+
+def page_getters(modules: dict[str, Path]) -> dict[str, str]:
+    """PageManager.get_*_page method name -> module of the page class it returns."""
+    tree = ast.parse(modules[PAGE_MANAGER].read_text(encoding="utf-8"))
+    class_modules = {
+        alias.asname or alias.name: node.module
+        for node in tree.body
+        if isinstance(node, ast.ImportFrom) and node.module
+        for alias in node.names
+    }
+    getters: dict[str, str] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef) and node.name.startswith("get_") and node.returns is not None:
+            returned = ast.unparse(node.returns).strip("'\"")
+            if returned in class_modules:
+                getters[node.name] = class_modules[returned]
+    return getters
+
+
+def closure(graph: dict[str, set[str]], roots: set[str]) -> set[str]:
+    seen: set[str] = set()
+    stack = list(roots)
+    while stack:
+        module = stack.pop()
+        if module in seen:
+            continue
+        seen.add(module)
+        stack.extend(graph.get(module, ()))
+    return seen
+
+
+def is_global_module(module: str) -> bool:
+    return any(module == root or module.startswith(f"{root}.") for root in GLOBAL_ROOTS)
+
+
+def dependencies_by_test_file(root: Path) -> tuple[dict[str, set[str]], set[str], dict[str, Path]]:
+    """
+    Map every test file to the project modules it depends on.
+
+    Returns:
+        tuple: test file path -> modules, modules the whole suite depends on, module name -> file path
+    """
+    modules = project_modules(root)
+    graph = build_import_graph(root, modules)
+    getters = page_getters(modules)
+    global_deps = closure(graph, {module for module in modules if is_global_module(module)})
+
+    dependencies: dict[str, set[str]] = {}
+    for module, path in modules.items():
+        relative = path.relative_to(root)
+        if relative.parts[0] != TESTS_DIR or not path.name.startswith("test_"):
+            continue
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+        roots = {module}
+        # Pages reached through the page_manager fixture
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Attribute) and node.attr in getters:
+                roots.add(getters[node.attr])
+        # conftest.py files of the enclosing test directories
+        for parent in relative.parents:
+            conftest = module_name(parent / "conftest.py")
+            if conftest in modules:
+                roots.add(conftest)
+        dependencies[relative.as_posix()] = closure(graph, roots)
+    return dependencies, global_deps, modules
+
+
+def changed_files(base: str | None, root: Path = Path(".")) -> list[str]:
+    """
+    Files changed since `base` (committed, staged, unstaged and untracked); only uncommitted ones without it.
+
+    Raises:
+        ValueError: If git fails, e.g. on an unknown base ref or outside a repository
+    """
+
+    def git(*args: str) -> list[str]:
+        result = subprocess.run(["git", *args], cwd=root, capture_output=True, text=True)
+        if result.returncode != 0:
+            message = next(iter(result.stderr.strip().splitlines()), f"exit status {result.returncode}")
+            raise ValueError(f"git {' '.join(args)} failed: {message}")
+        return [line for line in result.stdout.splitlines() if line]
+
+    changed = set(git("diff", "--name-only", "HEAD"))
+    changed.update(git("ls-files", "--others", "--exclude-standard"))
+    if base:
+        changed.update(git("diff", "--name-only", f"{base}...HEAD"))
+    return sorted(changed)
+
+
+def _run_all_reason(changed_path: str, global_deps: set[str]) -> str | None:
+    path = Path(changed_path)
+    if changed_path in GLOBAL_FILES:
+        return f"{changed_path} affects every test"
+    if path.suffix == ".py" and path.parts[0] in PROJECT_PACKAGES + ("conftest.py",):
+        module = module_name(path)
+        if is_global_module(module):
+            return f"{changed_path} is a fixture, plugin, config or base page module"
+        if module in global_deps:
+            return f"{changed_path} is used by fixtures or base pages"
+    elif path.parts[0] == "pages":
+        return f"{changed_path} is a page resource"
+    return None
+
+
+def tests_for_data_file(path: Path, test_files: Iterable[str]) -> list[str]:
+    """Test files a test data file (repo-relative, under tests/) belongs to: the nearest directory's holding any."""
+    test_files = list(test_files)
+    directory = path.parent
+    while directory.as_posix() != TESTS_DIR and not any(
+        test.startswith(f"{directory.as_posix()}/") for test in test_files
+    ):
+        directory = directory.parent
+    return [test for test in test_files if test.startswith(f"{directory.as_posix()}/")]
+
+
+def select_tests(changed: list[str], root: Path = Path(".")) -> ImpactSelection:
+    """Test files affected by the changed files (repo-relative paths)."""
+    dependencies, global_deps, _ = dependencies_by_test_file(root)
+    selection = ImpactSelection(changed=changed)
+    affected: set[str] = set()
+    selected: set[str] = set()
+
+    for changed_path in changed:
+        reason = _run_all_reason(changed_path, global_deps)
+        if reason is not None:
+            selection.run_all, selection.reason = True, reason
+            selection.test_files = sorted(dependencies)
+            return selection
+        path = Path(changed_path)
+        if path.suffix == ".py":
+            # Deleted modules are in no test's dependencies: their importers changed too, or fail to import
+            affected.add(module_name(path))
+        elif path.parts[0] == TESTS_DIR:
+            selected.update(tests_for_data_file(path, dependencies))
+
+    selected.update(test for test, deps in dependencies.items() if deps & affected)
+    selection.test_files = sorted(selected)
+    return selection
+
+
+def estimate_seconds(nodeids: list[str], durations: dict[str, float], default: float) -> float:
+    return sum(durations.get(nodeid, default) for nodeid in nodeids)
+
+
+def main(argv: list[str] | None = None) -> None:
+    from utils.duration_history import DEFAULT_DB, load_durations
+
+    parser = argparse.ArgumentParser(description="Select the test files affected by changes since a git base.")
+    parser.add_argument("--base", default=None, help="Git ref to diff against (default: uncommitted changes only)")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="Duration history for the time estimate")
+    parser.add_argument("--browser", default=None, help="Only history of this browser")
+    args = parser.parse_args(argv)
+
+    try:
+        changed = changed_files(args.base)
+    except ValueError as e:
+        parser.error(str(e))
+    selection = select_tests(changed)
+    print(f"Changed: {', '.join(selection.changed) or 'nothing'}")
+    if selection.run_all:
+        print(f"Running everything: {selection.reason}.")
+    # Only tests with history count here; the --changed-since run reports the estimate for its collection
+    durations = load_durations(args.db, args.browser)
+    selected = set(selection.test_files)
+    kept = [nodeid for nodeid in durations if nodeid.split("::", 1)[0] in selected]
+    total_seconds = estimate_seconds(list(durations), durations, 0.0)
+    kept_seconds = estimate_seconds(kept, durations, 0.0)
+    print(
+        f"Selected {len(selection.test_files)} test files: estimated {kept_seconds:.0f}s of {total_seconds:.0f}s, "
+        f"saving {total_seconds - kept_seconds:.0f}s."
+    )
+    print(" ".join(selection.test_files))
+
+
+if __name__ == "__main__":
+    main()
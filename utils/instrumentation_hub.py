@@ -0,0 +1,221 @@
+"""
+Per-worker instrumentation channel, separate from the test's WebDriver connection.
+Chrome: one CDP websocket on the worker's remote debugging port, attached to the test's page target.
+Firefox: an extra connection to the session's WebDriver BiDi endpoint.
+Screenshots, console logs, network events, metrics and emulation overrides go through it,
+so background work never queues behind (or blocks) the test's WebDriver commands.
+Requires: websocket-client, requests.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from selenium import webdriver
+
+from utils.bidi_client import BidiClient
+from utils.cdp_client import CdpClient
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+logger = logging.getLogger(__name__)
+
+MAX_EVENTS = 1000
+
+
+class InstrumentationHub:
+    """
+    Owns the instrumentation connection for one browser and buffers its events.
+
+    Console messages and network responses are kept in bounded buffers; take_console_messages()
+    and take_network_events() return and clear them, e.g. once per test.
+    """
+
+    def __init__(self, driver: WebDriver, debug_port: int | None = None) -> None:
+        self.driver = driver
+        self.debug_port = debug_port
+        self.context_id = driver.current_window_handle
+        self.client: CdpClient | None = None
+        self.page_session = ""
+        self._console: deque[dict[str, Any]] = deque(maxlen=MAX_EVENTS)
+        self._network: deque[dict[str, Any]] = deque(maxlen=MAX_EVENTS)
+        self._lock = threading.Lock()
+
+    @property
+    def is_cdp(self) -> bool:
+        return self.client is not None and not isinstance(self.client, BidiClient)
+
+    @property
+    def available(self) -> bool:
+        return self.client is not None and not self.client.closed
+
+    def start(self) -> InstrumentationHub:
+        """Open the channel and subscribe to console and network events."""
+        try:
+            if isinstance(self.driver, webdriver.Chrome) and self.debug_port is not None:
+                self._start_cdp()
+            else:
+                self._start_bidi()
+        except Exception:
+            # Don't leak the connection (and its reader thread) when attaching or subscribing failed
+            self.close()
+            raise
+        return self
+
+    def _start_cdp(self) -> None:
+        assert self.debug_port is not None
+        client = self.client = CdpClient.from_debug_port(self.debug_port)
+        self.page_session = client.attach_to_page(self.context_id)
+        client.on("Runtime.consoleAPICalled", self._on_cdp_console, self.page_session)
+        client.on("Network.responseReceived", self._on_cdp_response, self.page_session)
+        for domain in ("Runtime", "Network", "Performance"):
+            client.send(f"{domain}.enable", session_id=self.page_session)
+        logger.info(f"Instrumentation hub connected over CDP to target {self.context_id}.")
+
+    def _start_bidi(self) -> None:
+        client = self.client = BidiClient.from_driver(self.driver)
+        client.on("log.entryAdded", self._on_bidi_log)
+        client.on("network.responseCompleted", self._on_bidi_response)
+        client.subscribe(["log.entryAdded", "network.responseCompleted"])
+        logger.info(f"Instrumentation hub connected over BiDi to context {self.context_id}.")
+
+    # ============================================================================
+    # EVENT BUFFERS
+    # ============================================================================
+
+    def _on_cdp_console(self, params: dict[str, Any]) -> None:
+        text = " ".join(str(arg.get("value", arg.get("description", ""))) for arg in params.get("args", []))
+        with self._lock:
+            self._console.append({"level": params.get("type"), "text": text, "timestamp": params.get("timestamp")})
+
+    def _on_cdp_response(self, params: dict[str, Any]) -> None:
+        response = params.get("response", {})
+        with self._lock:
+            self._network.append(
+                {
+                    "url": response.get("url"),
+                    "status": response.get("status"),
+                    "mime_type": response.get("mimeType"),
+                    "type": params.get("type"),
+                    "timestamp": params.get("timestamp"),
+                }
+            )
+
+    def _on_bidi_log(self, params: dict[str, Any]) -> None:
+        with self._lock:
+            self._console.append(
+                {"level": params.get("level"), "text": params.get("text"), "timestamp": params.get("timestamp")}
+            )
+
+    def _on_bidi_response(self, params: dict[str, Any]) -> None:
+        response = params.get("response", {})
+        with self._lock:
+            self._network.append(
+                {
+                    "url": response.get("url"),
+                    "status": response.get("status"),
+                    "mime_type": response.get("mimeType"),
+                    "type": params.get("request", {}).get("destination"),
+                    "timestamp": params.get("timestamp"),
+                }
+            )
+
+    def take_console_messages(self) -> list[dict[str, Any]]:
+        """Return buffered console messages and clear the buffer."""
+        with self._lock:
+            messages = list(self._console)
+            self._console.clear()
+        return messages
+
+    def take_network_events(self) -> list[dict[str, Any]]:
+        """Return buffered network responses and clear the buffer."""
+        with self._lock:
+            events = list(self._network)
+            self._network.clear()
+        return events
+
+    # ============================================================================
+    # COMMANDS
+    # ============================================================================
+
+    def screenshot_base64(self, image_format: str = "png", quality: int | None = None) -> str:
+        """
+        Capture the visible viewport without going through WebDriver.
+
+        Args:
+            image_format: "png" or "jpeg"
+            quality: JPEG quality (0-100), ignored for PNG
+
+        Returns:
+            str: Base64 encoded image
+        """
+        assert self.client is not None
+        if self.is_cdp:
+            params: dict[str, Any] = {"format": image_format, "fromSurface": True}
+            if image_format == "jpeg" and quality is not None:
+                params["quality"] = quality
+            return self.client.send("Page.captureScreenshot", params, self.page_session)["data"]
+
+        params = {"context": self.context_id, "origin": "viewport"}
+        if image_format == "jpeg":
+            params["format"] = {"type": "image/jpeg", "quality": (quality or 80) / 100}
+        return self.client.send("browsingContext.captureScreenshot", params)["data"]
+
+    def screenshot(self, image_format: str = "png", quality: int | None = None) -> bytes:
+        """Capture the visible viewport as image bytes."""
+        return base64.b64decode(self.screenshot_base64(image_format, quality))
+
+    def metrics(self) -> dict[str, float]:
+        """Return page performance metrics (Chrome Performance domain; Firefox navigation timing)."""
+        assert self.client is not None
+        if self.is_cdp:
+            result = self.client.send("Performance.getMetrics", session_id=self.page_session)
+            return {metric["name"]: metric["value"] for metric in result.get("metrics", [])}
+
+        result = self.client.send(
+            "script.evaluate",
+            {
+                "expression": "JSON.stringify(performance.getEntriesByType('navigation')[0] || {})",
+                "target": {"context": self.context_id},
+                "awaitPromise": False,
+            },
+        )
+        entry = json.loads(result.get("result", {}).get("value") or "{}")
+        return {key: value for key, value in entry.items() if isinstance(value, (int, float))}
+
+    def set_geolocation(self, latitude: float, longitude: float, accuracy: float = 100, origin: str = "") -> None:
+        """
+        Grant geolocation (for `origin`) and override the reported position.
+        Firefox (BiDi emulation module, Firefox 134+) takes the permission from its profile preferences.
+
+        Raises:
+            CdpError: If the browser doesn't support the override
+        """
+        assert self.client is not None
+        if not self.is_cdp:
+            self.client.send(
+                "emulation.setGeolocationOverride",
+                {
+                    "coordinates": {"latitude": latitude, "longitude": longitude, "accuracy": accuracy},
+                    "contexts": [self.context_id],
+                },
+            )
+            return
+        if origin:
+            self.client.send("Browser.grantPermissions", {"origin": origin, "permissions": ["geolocation"]})
+        self.client.send(
+            "Emulation.setGeolocationOverride",
+            {"latitude": latitude, "longitude": longitude, "accuracy": accuracy},
+            self.page_session,
+        )
+
+    def close(self) -> None:
+        if self.client is not None:
+            self.client.close()
+            self.client = None
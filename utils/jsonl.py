@@ -0,0 +1,20 @@
+"""
+Append-only JSON Lines files shared by xdist workers and concurrent runs (benchmarks, metrics).
+Requires: filelock.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from filelock import FileLock
+
+
+def append_jsonl(path: Path, record: dict[str, Any]) -> None:
+    """Append `record` as one line, under a lock next to `path` so lines of several processes never interleave."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with FileLock(path.with_suffix(".lock")):
+        with open(path, "a") as f:
+            f.write(json.dumps(record) + "\n")
@@ -0,0 +1,240 @@
+"""
+Per-process log files with a per-test byte-offset index.
+Each process (xdist worker or the main process) writes its own log file through a buffered
+writer, so lines from different workers never interleave. Whenever the test id injected by
+TestNameFilter changes, the byte range of the finished test's lines is appended to an index next
+to the log, so one test's log is a seek and a read instead of a grep over the whole file.
+Each process holds a lock next to its log while it runs, so the logs of processes that have
+exited (earlier runs) can be told apart from those of concurrent ones and removed.
+Requires: filelock.
+
+Usage:
+    python -m utils.log_index slice <nodeid substring> [--dir test_logs]
+    python -m utils.log_index merge [--dir test_logs] [--out test_logs/merged.log]
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import logging
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO
+
+from filelock import FileLock, Timeout
+
+LOG_SUFFIX = ".log"
+INDEX_SUFFIX = ".idx.jsonl"
+LOCK_SUFFIX = ".log.lock"
+MERGED_LOG = "merged.log"
+BUFFER_SIZE = 64 * 1024
+# Records at or above this level are flushed right away, so a crash doesn't lose them
+FLUSH_LEVEL = logging.ERROR
+# Log lines start with an asctime ("2025-01-01 12:00:00,000"), continuation lines don't
+TIMESTAMP_LENGTH = 23
+
+
+def index_path(log_path: Path) -> Path:
+    return log_path.with_name(log_path.name.removesuffix(LOG_SUFFIX) + INDEX_SUFFIX)
+
+
+def lock_path(log_path: Path) -> Path:
+    return log_path.with_name(log_path.name.removesuffix(LOG_SUFFIX) + LOCK_SUFFIX)
+
+
+class IndexedFileHandler(logging.Handler):
+    """Buffered file handler recording the byte ranges logged while each test id was current."""
+
+    def __init__(self, log_path: str | Path, buffer_size: int = BUFFER_SIZE) -> None:
+        super().__init__()
+        self.log_path = Path(log_path)
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        # Held while the process runs: remove_stale_logs() leaves a locked log alone
+        self.owner_lock = FileLock(lock_path(self.log_path))
+        try:
+            self.owner_lock.acquire(timeout=0)
+        except Timeout:
+            pass
+        # One file per process and session: offsets are only meaningful within one run
+        self.stream: IO[bytes] = open(self.log_path, "wb", buffering=buffer_size)
+        self.index_stream: IO[str] = open(index_path(self.log_path), "w", buffering=buffer_size)
+        self.offset = 0
+        self.index: dict[str, list[tuple[int, int]]] = {}
+        self._segment_id = ""
+        self._segment_start = 0
+
+    def _close_segment(self) -> None:
+        if self._segment_id and self.offset > self._segment_start:
+            self.index.setdefault(self._segment_id, []).append((self._segment_start, self.offset))
+            self.index_stream.write(
+                json.dumps({"test": self._segment_id, "start": self._segment_start, "end": self.offset}) + "\n"
+            )
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            data = (self.format(record) + "\n").encode("utf-8", errors="replace")
+            test_id = getattr(record, "test_id", "")
+            if test_id != self._segment_id:
+                self._close_segment()
+                self._segment_id, self._segment_start = test_id, self.offset
+            self.stream.write(data)
+            self.offset += len(data)
+            if record.levelno >= FLUSH_LEVEL:
+                self.stream.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        with self.lock:  # type: ignore[union-attr]
+            if not self.stream.closed:
+                self.stream.flush()
+                self.index_stream.flush()
+
+    def close(self) -> None:
+        with self.lock:  # type: ignore[union-attr]
+            if not self.stream.closed:
+                self._close_segment()
+                self._segment_id = ""
+                self.stream.close()
+                self.index_stream.close()
+                self.owner_lock.release(force=True)
+        super().close()
+
+    def read_test(self, test_id: str) -> bytes:
+        """This process's log lines for a test, including the segment still being written."""
+        with self.lock:  # type: ignore[union-attr]
+            ranges = list(self.index.get(test_id, []))
+            if test_id and self._segment_id == test_id:
+                ranges.append((self._segment_start, self.offset))
+            if not self.stream.closed:
+                self.stream.flush()
+        return read_ranges(self.log_path, ranges)
+
+
+def read_ranges(log_path: Path, ranges: list[tuple[int, int]]) -> bytes:
+    chunks = []
+    with open(log_path, "rb") as f:
+        for start, end in ranges:
+            f.seek(start)
+            chunks.append(f.read(end - start))
+    return b"".join(chunks)
+
+
+def get_indexed_handler(logger: logging.Logger | None = None) -> IndexedFileHandler | None:
+    """The root logger's IndexedFileHandler, if it has one."""
+    for handler in (logger or logging.getLogger()).handlers:
+        if isinstance(handler, IndexedFileHandler):
+            return handler
+    return None
+
+
+def load_index(log_path: Path) -> dict[str, list[tuple[int, int]]]:
+    """Test id -> byte ranges, from the index file next to a log."""
+    index: dict[str, list[tuple[int, int]]] = {}
+    path = index_path(log_path)
+    if not path.exists():
+        return index
+    with open(path) as f:
+        for line in f:
+            entry = json.loads(line)
+            index.setdefault(entry["test"], []).append((entry["start"], entry["end"]))
+    return index
+
+
+def _log_files(directory: Path) -> list[Path]:
+    return sorted(path for path in directory.glob(f"*{LOG_SUFFIX}") if path.name != MERGED_LOG)
+
+
+def remove_stale_logs(directory: Path) -> list[Path]:
+    """
+    Delete the logs (and indexes) of processes that are no longer running, e.g. the per-pid
+    logs of earlier runs, so they don't pile up or end up in a merge with the current run's.
+
+    Returns:
+        list[Path]: The removed log files
+    """
+    removed = []
+    for log_path in _log_files(directory):
+        lock = FileLock(lock_path(log_path))
+        try:
+            lock.acquire(timeout=0)
+        except Timeout:
+            continue  # Its process is still writing it
+        try:
+            log_path.unlink(missing_ok=True)
+            index_path(log_path).unlink(missing_ok=True)
+            removed.append(log_path)
+            try:
+                lock_path(log_path).unlink(missing_ok=True)
+            except OSError:
+                pass  # Windows keeps a held lock file
+        finally:
+            lock.release(force=True)
+    return removed
+
+
+def _records(log_path: Path) -> Iterator[tuple[str, str]]:
+    """(timestamp, record text) per record; continuation lines (tracebacks) stay with their record."""
+    timestamp = ""
+    lines: list[str] = []
+    with open(log_path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            stamp = line[:TIMESTAMP_LENGTH]
+            if len(stamp) == TIMESTAMP_LENGTH and stamp[:4].isdigit() and stamp[4] == "-":
+                if lines:
+                    yield timestamp, "".join(lines)
+                timestamp, lines = stamp, [line]
+            else:
+                lines.append(line)
+    if lines:
+        yield timestamp, "".join(lines)
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+
+def cmd_slice(args: argparse.Namespace) -> None:
+    found = False
+    for log_path in _log_files(args.dir):
+        for test_id, ranges in load_index(log_path).items():
+            if args.test in test_id:
+                found = True
+                print(f"===== {test_id} ({log_path.name}) =====")
+                print(read_ranges(log_path, ranges).decode("utf-8", errors="replace"), end="")
+    if not found:
+        print(f"No indexed log for tests matching '{args.test}'.")
+
+
+def cmd_merge(args: argparse.Namespace) -> None:
+    merged = heapq.merge(*(_records(path) for path in _log_files(args.dir)), key=lambda record: record[0])
+    with open(args.out, "w", encoding="utf-8") as f:
+        for _, text in merged:
+            f.write(text)
+    print(f"Merged logs into {args.out}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Slice or merge per-process test logs.")
+    parser.add_argument("--dir", type=Path, default=Path("test_logs"), help="Log directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    slice_parser = commands.add_parser("slice", help="Print the log lines of tests matching a nodeid substring")
+    slice_parser.add_argument("test")
+    slice_parser.set_defaults(func=cmd_slice)
+
+    merge = commands.add_parser("merge", help="Merge all process logs in time order")
+    merge.add_argument("--out", type=Path, default=None, help="Output file (default: <dir>/merged.log)")
+    merge.set_defaults(func=cmd_merge)
+
+    args = parser.parse_args(argv)
+    if args.command == "merge" and args.out is None:
+        args.out = args.dir / MERGED_LOG
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
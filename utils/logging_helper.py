@@ -1,13 +1,17 @@
 import logging
 from contextvars import ContextVar
 
-# Context variable that holds the current test name for the running context
+from utils.log_index import IndexedFileHandler
+
+# Context variables that hold the current test name and nodeid for the running context
 current_test_name: ContextVar[str] = ContextVar("current_test_name", default="")
+current_test_id: ContextVar[str] = ContextVar("current_test_id", default="")
 
 
 class TestNameFilter(logging.Filter):
     """
-    Logging filter that injects the current test name into LogRecord as `test_name`.
+    Logging filter that injects the current test name into LogRecord as `test_name`
+    (and its nodeid as `test_id`, which keys the per-test log index).
 
     This avoids KeyError when format strings reference %(test_name)s and works with
     pytest and threaded/async code because it uses ContextVar.
@@ -15,12 +19,14 @@ class TestNameFilter(logging.Filter):
 
     def filter(self, record: logging.LogRecord) -> bool:
         record.test_name = current_test_name.get()
+        record.test_id = current_test_id.get()
         return True
 
 
 def configure_root_logger(log_file: str = "test_logs.log", level: int = logging.INFO) -> logging.Logger:
     """
     Configure the root logger with a file and stream handler and attach TestNameFilter.
+    The file is written through a buffered IndexedFileHandler, so it should be per process.
 
     Returns the root logger instance.
     """
@@ -46,7 +52,7 @@ def configure_root_logger(log_file: str = "test_logs.log", level: int = logging.
 
     formatter = SafeFormatter("%(asctime)s - %(levelname)s - [%(test_name)s] %(message)s")
 
-    file_handler = logging.FileHandler(log_file)
+    file_handler = IndexedFileHandler(log_file)
     file_handler.setLevel(level)
     file_handler.setFormatter(formatter)
     file_handler.addFilter(TestNameFilter())
@@ -62,14 +68,16 @@ def configure_root_logger(log_file: str = "test_logs.log", level: int = logging.
     return logger
 
 
-def set_current_test(name: str | None) -> None:
+def set_current_test(name: str | None, test_id: str | None = None) -> None:
     """
-    Set the current test name for logging. Pass None or empty string to clear.
+    Set the current test name (and nodeid) for logging. Pass None or empty string to clear.
     """
     if name:
         current_test_name.set(name)
+        current_test_id.set(test_id or name)
     else:
         current_test_name.set("")
+        current_test_id.set("")
 
 
 def get_logger(name: str | None = None) -> logging.Logger:
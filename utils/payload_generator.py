@@ -0,0 +1,69 @@
+"""
+On-demand synthetic upload payloads.
+Files are created sparse (only a small random header is actually written), so multi-GB
+payloads cost almost no disk space or generation time and never live in git.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+
+SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3}
+MIN_PAYLOAD_SIZE = 1024
+MAX_PAYLOAD_SIZE = 2 * 1024**3
+HEADER_SIZE = 4096
+
+
+def parse_size(size: str | int) -> int:
+    """
+    Parse a human readable size ("1KB", "250MB", "2GB") into bytes.
+
+    Raises:
+        ValueError: If the format is invalid or the size is outside 1KB-2GB
+    """
+    if isinstance(size, int):
+        size_bytes = size
+    else:
+        match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?B)\s*", size.upper())
+        if not match:
+            raise ValueError(f"Invalid size '{size}'. Use e.g. '1KB', '10MB' or '2GB'.")
+        size_bytes = int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+    if not MIN_PAYLOAD_SIZE <= size_bytes <= MAX_PAYLOAD_SIZE:
+        raise ValueError(f"Payload size must be between 1KB and 2GB, got {size_bytes} bytes.")
+    return size_bytes
+
+
+def format_size(size_bytes: int) -> str:
+    """Format a byte count using the largest whole unit (e.g. 1048576 -> '1MB')."""
+    for unit in ("GB", "MB", "KB"):
+        if size_bytes >= SIZE_UNITS[unit] and size_bytes % SIZE_UNITS[unit] == 0:
+            return f"{size_bytes // SIZE_UNITS[unit]}{unit}"
+    return f"{size_bytes}B"
+
+
+def create_payload(directory: Path, size: str | int, suffix: str = ".bin") -> Path:
+    """
+    Create a sparse payload file of the given size.
+
+    Args:
+        directory: Directory to create the file in
+        size: Size in bytes or as a string ("1KB" to "2GB")
+        suffix: File extension
+
+    Returns:
+        Path: Path of the generated file
+    """
+    size_bytes = parse_size(size)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"payload_{format_size(size_bytes)}{suffix}"
+    if path.exists() and path.stat().st_size == size_bytes:
+        return path
+
+    with open(path, "wb") as f:
+        # Random header so payloads aren't trivially compressible; the rest is a sparse hole
+        f.write(os.urandom(min(HEADER_SIZE, size_bytes)))
+        f.truncate(size_bytes)
+    return path
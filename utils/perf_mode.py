@@ -0,0 +1,125 @@
+"""
+Performance mode (--perf-mode / PERF_MODE): strips reporting overhead from test runs.
+Allure steps turn into plain calls (no parameter formatting, no step objects), logging drops
+to WARNING, video recording is off and failure screenshots are sampled.
+The step switch is checked on every call, so it can be flipped at runtime (e.g. by benchmarks).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any
+
+try:
+    from allure_commons import _allure
+except ImportError:  # allure-pytest reorganized its internals: steps stay on
+    _allure = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+PERF_LOG_LEVEL = logging.WARNING
+# StepContext methods the switch wraps; private allure-pytest API, checked before patching
+_STEP_CONTEXT_METHODS = ("__call__", "__enter__", "__exit__")
+
+_enabled = False
+_installed = False
+_normal_log_level = logging.INFO
+_normal_handler_levels: dict[logging.Handler, int] = {}
+_screenshot_counter = 0
+_lock = threading.Lock()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def install_step_switch() -> None:
+    """
+    Route allure.step through the perf-mode switch.
+    Must run before page objects are imported, since @allure.step wraps methods at import time.
+    If allure-pytest no longer has the private StepContext it patches, steps are left untouched
+    and perf mode only lowers logging and skips recordings.
+    """
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    step_context = getattr(_allure, "StepContext", None)
+    if step_context is None or not all(name in vars(step_context) for name in _STEP_CONTEXT_METHODS):
+        logger.warning("allure_commons._allure.StepContext not found: perf mode keeps Allure steps.")
+        return
+    original_call = _allure.StepContext.__call__
+    original_enter = _allure.StepContext.__enter__
+    original_exit = _allure.StepContext.__exit__
+
+    def switched_call(self: _allure.StepContext, func: Callable[..., Any]) -> Callable[..., Any]:
+        step_impl = original_call(self, func)
+
+        @wraps(func)
+        def impl(*args: Any, **kwargs: Any) -> Any:
+            __tracebackhide__ = True
+            if _enabled:
+                return func(*args, **kwargs)
+            return step_impl(*args, **kwargs)
+
+        return impl
+
+    def switched_enter(self: _allure.StepContext) -> None:
+        # Remember the decision, so a switch flipped inside the step can't unbalance start/stop
+        self._perf_skipped = _enabled  # type: ignore[attr-defined]
+        if not self._perf_skipped:  # type: ignore[attr-defined]
+            original_enter(self)
+
+    def switched_exit(self: _allure.StepContext, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        if not getattr(self, "_perf_skipped", False):
+            original_exit(self, exc_type, exc_val, exc_tb)
+
+    _allure.StepContext.__call__ = switched_call  # type: ignore[method-assign, assignment]
+    _allure.StepContext.__enter__ = switched_enter  # type: ignore[method-assign]
+    _allure.StepContext.__exit__ = switched_exit  # type: ignore[method-assign]
+
+
+def apply(enabled: bool) -> None:
+    """Switch perf mode on or off: Allure steps and the root logger level."""
+    global _enabled, _normal_log_level, _normal_handler_levels
+    if enabled == _enabled:
+        return
+    root = logging.getLogger()
+    _enabled = enabled
+    if enabled:
+        # Handlers keep their own levels (e.g. a DEBUG file handler under an INFO console), restored on the way out
+        _normal_log_level = root.level
+        _normal_handler_levels = {handler: handler.level for handler in root.handlers}
+        root.setLevel(PERF_LOG_LEVEL)
+        for handler in root.handlers:
+            handler.setLevel(PERF_LOG_LEVEL)
+        return
+    root.setLevel(_normal_log_level)
+    for handler, level in _normal_handler_levels.items():
+        handler.setLevel(level)
+    _normal_handler_levels = {}
+
+
+@contextmanager
+def override(enabled: bool) -> Generator[None, None, None]:
+    """Temporarily switch perf mode on or off."""
+    previous = _enabled
+    apply(enabled)
+    try:
+        yield
+    finally:
+        apply(previous)
+
+
+def sample_screenshot(every: int) -> bool:
+    """In perf mode, allow only every `every`-th failure screenshot (the first one included)."""
+    global _screenshot_counter
+    if not _enabled:
+        return True
+    with _lock:
+        _screenshot_counter += 1
+        return every > 0 and (_screenshot_counter - 1) % every == 0
@@ -0,0 +1,151 @@
+"""
+Cache of passed test results, keyed on everything the result depends on: the contents of the
+test's transitive project modules (see utils.impact_selection) and of its test data files, of the
+modules every test depends on and of the dependency files, the browser and its version, and a
+fingerprint of the application under test (a deployed-version response header, or a hash of the
+main page).
+A pass is reused until it expires; anything else always runs again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+
+import requests
+from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
+
+from utils.impact_selection import GLOBAL_FILES, TESTS_DIR, dependencies_by_test_file, tests_for_data_file
+from utils.logging_helper import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_DB = Path("test_history") / "result_cache.sqlite"
+AUT_TIMEOUT = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS passed (
+    key TEXT PRIMARY KEY,
+    nodeid TEXT NOT NULL,
+    passed_at REAL NOT NULL,
+    seconds REAL NOT NULL
+);
+"""
+
+_BROWSER_TYPES = {"chrome": ChromeType.GOOGLE, "firefox": "firefox"}
+
+
+def _file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _test_data_files(root: Path) -> list[Path]:
+    """Non-Python files under tests/ (repo-relative), e.g. files the tests upload or compare against."""
+    return sorted(
+        path.relative_to(root)
+        for path in (root / TESTS_DIR).rglob("*")
+        if path.is_file() and path.suffix not in (".py", ".pyc") and "__pycache__" not in path.parts
+    )
+
+
+def code_fingerprints(root: Path) -> dict[str, str]:
+    """
+    Fingerprint of the code each test file depends on, and of its test data (the non-Python files
+    that would select it in impact selection).
+
+    Returns:
+        dict: test file path (repo-relative) -> hex digest
+    """
+    dependencies, global_deps, modules = dependencies_by_test_file(root)
+    data_files: dict[str, list[Path]] = {}
+    for data_file in _test_data_files(root):
+        for test_file in tests_for_data_file(data_file, dependencies):
+            data_files.setdefault(test_file, []).append(data_file)
+    digests = {module: _file_digest(path) for module, path in modules.items()}
+    shared = hashlib.sha256()
+    for module in sorted(global_deps):
+        shared.update(f"{module}:{digests[module]}\n".encode())
+    for name in GLOBAL_FILES:
+        if (root / name).is_file():
+            shared.update(f"{name}:{_file_digest(root / name)}\n".encode())
+
+    fingerprints: dict[str, str] = {}
+    for test_file, modules_used in dependencies.items():
+        digest = shared.copy()
+        for module in sorted(modules_used - global_deps):
+            digest.update(f"{module}:{digests[module]}\n".encode())
+        for data_file in data_files.get(test_file, []):
+            digest.update(f"{data_file.as_posix()}:{_file_digest(root / data_file)}\n".encode())
+        fingerprints[test_file] = digest.hexdigest()
+    return fingerprints
+
+
+def browser_version(browser: str) -> str:
+    """Installed browser version, 'unknown' if it can't be determined (the key then changes when it can)."""
+    try:
+        version = OperationSystemManager().get_browser_version_from_os(_BROWSER_TYPES.get(browser, browser))
+    except Exception as e:
+        logger.debug(f"Could not determine the {browser} version: {str(e)}")
+        version = None
+    return version or "unknown"
+
+
+def aut_fingerprint(base_url: str, version_header: str = "") -> str:
+    """
+    Fingerprint of the application under test: the deployed-version header if the AUT sends one,
+    else a hash of the main page.
+
+    Raises:
+        requests.RequestException: If the AUT can't be reached
+    """
+    response = requests.get(base_url, timeout=AUT_TIMEOUT)
+    response.raise_for_status()
+    if version_header and version_header in response.headers:
+        return f"{version_header}:{response.headers[version_header]}"
+    return hashlib.sha256(response.content).hexdigest()
+
+
+def cache_key(nodeid: str, code: str, browser: str, version: str, aut: str) -> str:
+    return hashlib.sha256(f"{nodeid}\0{code}\0{browser}\0{version}\0{aut}".encode()).hexdigest()
+
+
+class ResultCache:
+    """Passed results by cache key, in SQLite (shared by xdist workers)."""
+
+    def __init__(self, db_path: Path = DEFAULT_DB, max_age_seconds: float = 24 * 3600) -> None:
+        self.db_path = db_path
+        self.max_age_seconds = max_age_seconds
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def _connect(self) -> Generator[sqlite3.Connection, None, None]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.executescript(SCHEMA)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> tuple[float, float] | None:
+        """Age and original duration (seconds) of an unexpired cached pass, else None."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT passed_at, seconds FROM passed WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        age = time.time() - row[0]
+        return (age, row[1]) if age < self.max_age_seconds else None
+
+    def put(self, key: str, nodeid: str, seconds: float) -> None:
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO passed VALUES (?, ?, ?, ?)", (key, nodeid, time.time(), seconds))
+
+    def prune(self) -> int:
+        """Drop expired entries; returns how many."""
+        with self._connect() as conn:
+            expired_before = time.time() - self.max_age_seconds
+            return conn.execute("DELETE FROM passed WHERE passed_at < ?", (expired_before,)).rowcount
@@ -0,0 +1,66 @@
+"""
+Deterministic duration-balanced sharding of a test collection across CI nodes.
+Every node computes the same plan on its own from the sorted nodeids and the duration history,
+so no coordinator is needed; without history the shards are balanced by test count.
+Affinity chunks (same file/class or xdist_group) stay within one shard.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import statistics
+from dataclasses import dataclass, field
+
+from utils.duration_scheduler import DEFAULT_ESTIMATE, build_chunks, lpt_assign
+
+
+@dataclass
+class ShardPlan:
+    count: int
+    shards: list[list[str]] = field(default_factory=list)
+    predicted_seconds: list[float] = field(default_factory=list)
+    tests_with_history: int = 0
+    # Identical on every node only if they saw the same collection and history
+    fingerprint: str = ""
+
+    def summary(self, index: int) -> dict[str, object]:
+        return {
+            "shard_index": index,
+            "shard_count": self.count,
+            "tests": len(self.shards[index]),
+            "predicted_seconds": round(self.predicted_seconds[index], 2),
+            "predicted_seconds_per_shard": [round(seconds, 2) for seconds in self.predicted_seconds],
+            "tests_per_shard": [len(shard) for shard in self.shards],
+            "tests_with_history": self.tests_with_history,
+            "fingerprint": self.fingerprint,
+        }
+
+
+def plan_shards(nodeids: list[str], durations: dict[str, float], count: int) -> ShardPlan:
+    """
+    Partition nodeids into `count` shards, longest affinity chunk first into the least loaded shard.
+
+    Args:
+        nodeids: Selected test nodeids (order doesn't matter, they are sorted)
+        durations: Estimated seconds per nodeid, e.g. from load_durations()
+        count: Number of shards
+
+    Returns:
+        ShardPlan: Shards with their predicted durations
+    """
+    ordered = sorted(nodeids)
+    known = [durations[nodeid] for nodeid in ordered if nodeid in durations]
+    # Without any history every test weighs the same, so shards balance by count
+    default = statistics.median(known) if known else DEFAULT_ESTIMATE
+    estimates = [durations.get(nodeid, default) for nodeid in ordered]
+
+    plan = ShardPlan(count=count, tests_with_history=len(known))
+    for seconds, indices in lpt_assign(build_chunks(ordered, estimates), count):
+        plan.shards.append([ordered[index] for index in sorted(indices)])
+        plan.predicted_seconds.append(seconds)
+
+    digest = hashlib.sha256()
+    for nodeid, estimate in zip(ordered, estimates):
+        digest.update(f"{nodeid}\0{estimate:.3f}\n".encode())
+    plan.fingerprint = digest.hexdigest()[:12]
+    return plan
@@ -0,0 +1,55 @@
+"""
+Columnar in-memory representation of an HTML table.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class TableData:
+    """
+    Table contents stored column by column (header -> list of cell strings).
+
+    Header and per-column value indexes are built once, so header, cell and row lookups are
+    dictionary operations regardless of the number of rows.
+    """
+
+    headers: list[str]
+    columns: list[list[str]]
+    header_index: dict[str, int] = field(init=False)
+    _value_index: dict[int, dict[str, int]] = field(init=False, default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        self.header_index = {}
+        for idx, header in enumerate(self.headers):
+            self.header_index.setdefault(header, idx)
+
+    @property
+    def row_count(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def column(self, header: str) -> list[str] | None:
+        """Return all cell values of a column, or None if the header doesn't exist."""
+        idx = self.header_index.get(header)
+        return self.columns[idx] if idx is not None else None
+
+    def find_row(self, header: str, value: str) -> int | None:
+        """Return the 0-based index of the first row whose cell under `header` equals `value`."""
+        idx = self.header_index.get(header)
+        if idx is None:
+            return None
+        if idx not in self._value_index:
+            index: dict[str, int] = {}
+            for row, cell in enumerate(self.columns[idx]):
+                index.setdefault(cell, row)
+            self._value_index[idx] = index
+        return self._value_index[idx].get(value)
+
+    def cell(self, header: str, row: int) -> str | None:
+        """Return the cell value at a row under a header, or None if out of range."""
+        values = self.column(header)
+        if values is None or not 0 <= row < len(values):
+            return None
+        return values[row]
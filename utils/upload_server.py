@@ -0,0 +1,121 @@
+"""
+Local upload endpoint mirroring the markup of the application's /upload page.
+Request bodies are streamed and discarded, so multi-GB uploads use constant memory.
+"""
+
+from __future__ import annotations
+
+import html
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 1024 * 1024
+UPLOAD_PATH = "/upload"
+
+UPLOAD_FORM_HTML = """<!DOCTYPE html>
+<html><body><div class="example">
+<h3>File Uploader</h3>
+<form method="POST" action="/upload" enctype="multipart/form-data">
+<input id="file-upload" type="file" name="file">
+<input id="file-submit" type="submit" value="Upload">
+</form>
+<div id="drag-drop-upload"></div>
+</div></body></html>"""
+
+UPLOADED_HTML = """<!DOCTYPE html>
+<html><body><div class="example">
+<h3>File Uploaded!</h3>
+<div id="uploaded-files">{file_name}</div>
+</div></body></html>"""
+
+
+@dataclass
+class UploadRecord:
+    file_name: str
+    bytes_received: int
+    duration: float
+
+    @property
+    def throughput(self) -> float:
+        """Received bytes per second."""
+        return self.bytes_received / self.duration if self.duration else 0.0
+
+
+class _UploadHandler(BaseHTTPRequestHandler):
+    server: UploadServer
+
+    def log_message(self, format: str, *args: object) -> None:
+        logger.debug(format % args)
+
+    def _send_html(self, body: str) -> None:
+        payload = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") != UPLOAD_PATH:
+            self.send_error(404)
+            return
+        self._send_html(UPLOAD_FORM_HTML)
+
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") != UPLOAD_PATH:
+            self.send_error(404)
+            return
+
+        started = time.perf_counter()
+        remaining = int(self.headers.get("Content-Length", 0))
+        received = 0
+        file_name = ""
+        while remaining > 0:
+            chunk = self.rfile.read(min(READ_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            if not file_name:
+                match = re.search(rb'filename="([^"]*)"', chunk)
+                file_name = match.group(1).decode(errors="replace") if match else ""
+            received += len(chunk)
+            remaining -= len(chunk)
+
+        record = UploadRecord(file_name=file_name, bytes_received=received, duration=time.perf_counter() - started)
+        self.server.records.append(record)
+        logger.info(f"Received upload '{file_name}' ({received} bytes in {record.duration:.2f}s).")
+        self._send_html(UPLOADED_HTML.format(file_name=html.escape(file_name)))
+
+
+class UploadServer(ThreadingHTTPServer):
+    """Threaded HTTP server exposing GET/POST /upload on localhost."""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        super().__init__((host, port), _UploadHandler)
+        self.records: list[UploadRecord] = []
+        self._thread = threading.Thread(target=self.serve_forever, name="upload-server", daemon=True)
+
+    @property
+    def upload_url(self) -> str:
+        host, port = self.server_address[:2]
+        # socketserver types the address loosely; an AF_INET server always has a str host
+        if isinstance(host, bytes):
+            host = host.decode()
+        return f"http://{host}:{port}{UPLOAD_PATH}"
+
+    def start(self) -> UploadServer:
+        self._thread.start()
+        logger.info(f"Local upload server listening on {self.upload_url}")
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        self._thread.join(timeout=5)
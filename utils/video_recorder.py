@@ -1,117 +1,794 @@
 """
 Module for recording test videos using Selenium WebDriver and ffmpeg.
 Supports parallel execution, headless mode, and CI environments.
-Requires: ffmpeg, filelock, selenium, pytest-xdist.
+Frame sources:
+    screencast - Chrome pushes JPEG frames via Page.startScreencast over a dedicated CDP websocket,
+                 timestamped by the browser and independent of the test's WebDriver commands.
+    polling    - screenshots are taken through the driver in a loop (Firefox, or Chrome without a debug port).
+Recorder modes:
+    pipe   - frames are streamed into a long-lived ffmpeg process over stdin (a Matroska stream carrying
+             each frame's capture timestamp) and encoded as they arrive, no frame files touch disk.
+    frames - every unique frame is written as an image file and assembled by ffmpeg at teardown.
+    on_failure - the last RING_SECONDS of compressed frames are kept in a bounded in-memory ring buffer,
+             encoded only if the test is kept (failed or rerun) and dropped otherwise.
+Consecutive duplicate frames are dropped and the output is variable frame rate with the real capture timestamps.
+Requires: ffmpeg, filelock, selenium, websocket-client, pytest-xdist.
 """
 
 from __future__ import annotations
 
 import base64
+import hashlib
 import logging
+import os
+import queue
+import shutil
+import statistics
+import struct
 import subprocess
 import threading
 import time
+from collections import deque
 from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from selenium import webdriver
 
+from utils.cdp_client import CdpClient
+
 if TYPE_CHECKING:
     from selenium.webdriver.remote.webdriver import WebDriver
 
+    from utils.artifact_store import ArtifactStore
+    from utils.encode_queue import EncodeQueue
+    from utils.instrumentation_hub import InstrumentationHub
+
 logger = logging.getLogger(__name__)
 
 FPS = 15
 INTERVAL = 1.0 / FPS
+MIN_FPS = 2
+MIN_SCALE = 0.5
+SCALE_STEP = 0.75
+SCREENCAST_SOURCE_FPS = 60
+# Adaptive rate: re-evaluated once per ADJUST_INTERVAL from the median capture latency
+# (relative to the frame interval) and the 1-minute load average per CPU
+ADJUST_INTERVAL = 1.0
+BACKOFF_LATENCY_RATIO = 0.5
+RECOVER_LATENCY_RATIO = 0.2
+HIGH_LOAD = 1.0
+LOW_LOAD = 0.7
 MIN_FRAME_SIZE = 512
-MAX_FRAMES = 2000
 JPEG_QUALITY = 80
+MAX_WIDTH = 1920
+MAX_HEIGHT = 1080
+FRAME_QUEUE_SIZE = 4 * FPS
+FFMPEG_EXIT_TIMEOUT = 60
+RING_SECONDS = 30
+RING_MAX_BYTES = 64 * 1024 * 1024
 
+RECORDER_MODES = ("pipe", "frames", "on_failure")
 
-def start_video_recording(
-    driver: WebDriver, test_name: str, worker_id: str = "local"
-) -> tuple[Callable[[], None], str]:
+# Frame files are fed through the concat demuxer with per-frame durations,
+# producing variable frame rate output with the capture timestamps
+CONCAT_INPUT_ARGS = ["-f", "concat", "-safe", "0"]
+
+# Streamed frames travel as a live Matroska stream with a millisecond timestamp per frame; ffmpeg
+# starts decoding from the first frame instead of probing a few seconds of input
+PIPE_INPUT_ARGS = ["-probesize", "32", "-analyzeduration", "0", "-f", "matroska"]
+MATROSKA_TIMESTAMP_SCALE = 1_000_000  # ns per timestamp unit
+MATROSKA_CLUSTER_MS = 30_000  # block timestamps are 16-bit offsets from their cluster's
+# PNG has no native Matroska codec id; it travels as a VFW track (BITMAPINFOHEADER with the MPNG fourcc)
+_PNG_BITMAPINFOHEADER = struct.pack("<IiiHH4sIiiII", 40, 0, 0, 1, 24, b"MPNG", 0, 0, 0, 0, 0)
+MATROSKA_CODECS = {"image/jpeg": (b"V_MJPEG", b""), "image/png": (b"V_MS/VFW/FOURCC", _PNG_BITMAPINFOHEADER)}
+
+ENCODER_ARGS = [
+    "-fps_mode",
+    "vfr",
+    "-vf",
+    "scale=trunc(iw/2)*2:trunc(ih/2)*2,format=yuv420p",
+    "-c:v",
+    "libx264",
+    "-pix_fmt",
+    "yuv420p",
+]
+
+# Sessions whose frames are captured through the WebDriver connection; commands such as
+# screenshots fail (or dismiss the prompt) while an alert is open on those sessions.
+_polling_sessions: set[str] = set()
+
+
+def is_polling_driver(driver: WebDriver) -> bool:
+    """Check if a video recorder is currently taking screenshots through this driver."""
+    return str(getattr(driver, "session_id", "")) in _polling_sessions
+
+
+def system_load() -> float:
+    """1-minute load average per CPU (0.0 where unavailable)."""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return 0.0
+
+
+class AdaptiveRate:
     """
-    Starts background video recording for a test.
-    Returns: (stop_func, video_path)
+    Adjusts capture FPS and resolution scale from measured capture latency and system load.
+    Backs off by halving FPS first and then reducing resolution; recovers in the opposite order.
     """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    base_dir = Path("tests_recordings") / worker_id / f"{test_name}_{timestamp}"
-    frames_dir = base_dir / "frames"
-    video_path = base_dir / f"{test_name}_{timestamp}.mp4"
 
-    frames_dir.mkdir(parents=True, exist_ok=True)
+    def __init__(self, max_fps: float = FPS, min_fps: float = MIN_FPS, min_scale: float = MIN_SCALE) -> None:
+        self.max_fps = max_fps
+        self.min_fps = min_fps
+        self.min_scale = min_scale
+        self.fps = float(max_fps)
+        self.scale = 1.0
+        self.lowest_fps = self.fps
+        self.lowest_scale = self.scale
+        self._latencies: list[float] = []
+        self._last_adjust = time.monotonic()
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.fps
+
+    def record(self, latency: float) -> bool:
+        """
+        Record one capture latency and re-evaluate the rate when due.
+
+        Returns:
+            bool: True if FPS or scale changed
+        """
+        self._latencies.append(latency)
+        now = time.monotonic()
+        if now - self._last_adjust < ADJUST_INTERVAL:
+            return False
+        self._last_adjust = now
+        median_latency = statistics.median(self._latencies)
+        self._latencies.clear()
+        load = system_load()
+
+        before = (self.fps, self.scale)
+        if median_latency > self.interval * BACKOFF_LATENCY_RATIO or load > HIGH_LOAD:
+            if self.fps > self.min_fps:
+                self.fps = max(self.min_fps, self.fps / 2)
+            else:
+                self.scale = max(self.min_scale, self.scale * SCALE_STEP)
+        elif median_latency < self.interval * RECOVER_LATENCY_RATIO and load < LOW_LOAD:
+            if self.scale < 1.0:
+                self.scale = min(1.0, self.scale / SCALE_STEP)
+            else:
+                self.fps = min(self.max_fps, self.fps + 1)
+        self.lowest_fps = min(self.lowest_fps, self.fps)
+        self.lowest_scale = min(self.lowest_scale, self.scale)
+
+        if (self.fps, self.scale) == before:
+            return False
+        logger.debug(
+            f"Capture rate adjusted to {self.fps:.1f} FPS at {self.scale:.2f} scale "
+            f"(latency {median_latency * 1000:.0f}ms, load {load:.2f})."
+        )
+        return True
+
+
+@dataclass
+class RecordingStats:
+    source: str = ""
+    frames: int = 0
+    duplicate_frames: int = 0
+    captured_frames: int = 0
+    dropped_frames: int = 0
+    effective_fps: float = 0.0
+    lowest_fps: float = 0.0
+    lowest_scale: float = 0.0
+    disk_bytes_written: int = 0
+    teardown_seconds: float = 0.0
+    encode_seconds: float = 0.0
+
+
+def _ebml_size(size: int) -> bytes:
+    for length in range(1, 9):
+        # All ones is reserved for "unknown size"
+        if size < (1 << (7 * length)) - 1:
+            return ((1 << (7 * length)) | size).to_bytes(length, "big")
+    raise ValueError(f"EBML element too large: {size}")
+
+
+# Size of the live segment and clusters, which end with the stream
+_EBML_UNKNOWN_SIZE = b"\x01\xff\xff\xff\xff\xff\xff\xff"
+
+
+def _ebml(element_id: int, payload: bytes | int) -> bytes:
+    if isinstance(payload, int):
+        payload = payload.to_bytes(max(1, (payload.bit_length() + 7) // 8), "big")
+    return element_id.to_bytes((element_id.bit_length() + 7) // 8, "big") + _ebml_size(len(payload)) + payload
+
+
+def _matroska_header(mime_type: str) -> bytes:
+    """EBML header, the start of a live segment and a single video track of still-image frames."""
+    codec_id, codec_private = MATROSKA_CODECS[mime_type]
+    track = _ebml(0xD7, 1) + _ebml(0x73C5, 1) + _ebml(0x83, 1) + _ebml(0x86, codec_id)
+    if codec_private:
+        track += _ebml(0x63A2, codec_private)
+    return (
+        _ebml(0x1A45DFA3, _ebml(0x4286, 1) + _ebml(0x42F7, 1) + _ebml(0x4282, b"matroska") + _ebml(0x4287, 4))
+        + (0x18538067).to_bytes(4, "big")
+        + _EBML_UNKNOWN_SIZE
+        + _ebml(0x1549A966, _ebml(0x2AD7B1, MATROSKA_TIMESTAMP_SCALE) + _ebml(0x4D80, b"video_recorder"))
+        + _ebml(0x1654AE6B, _ebml(0xAE, track))
+    )
+
+
+def _concat_entry(file_ref: str, duration: float | None) -> str:
+    entry = f"file '{file_ref}'\n"
+    return entry if duration is None else entry + f"duration {duration:.6f}\n"
+
+
+class FrameDirSink:
+    """
+    Writes each unique frame as an image file and encodes them at close with the concat demuxer.
+    With an artifact store, frames are stored there (identical frames across tests are kept once)
+    and the concat script references the blobs directly.
+    """
+
+    def __init__(
+        self, frames_dir: Path, video_path: Path, extension: str = "png", store: ArtifactStore | None = None
+    ) -> None:
+        self.frames_dir = frames_dir
+        self.video_path = video_path
+        self.extension = extension
+        self.store = store
+        self.frames = 0
+        self._timestamps: list[float] = []
+        self._frame_files: list[Path] = []
+        self._stored_bytes = 0
+        self.frames_dir.mkdir(parents=True, exist_ok=True)
+
+    def write(self, frame: bytes, timestamp: float) -> None:
+        if self.store is not None:
+            blob = self.store.put_bytes(frame, self.extension)
+            self._stored_bytes += blob.size if blob.new else 0
+            frame_file = blob.path.resolve()
+        else:
+            frame_file = self.frames_dir / f"frame_{self.frames:06d}.{self.extension}"
+            frame_file.write_bytes(frame)
+        self._frame_files.append(frame_file)
+        self._timestamps.append(timestamp)
+        self.frames += 1
+
+    def close(self, end_timestamp: float) -> int:
+        """Encode the written frames and return the number of bytes written to disk."""
+        frame_files = self._frame_files
+        logger.info(f"Found {len(frame_files)} unique frames.")
+        disk_bytes = self._stored_bytes if self.store is not None else sum(f.stat().st_size for f in frame_files)
+
+        if not frame_files:
+            logger.warning(f"No valid frames in {self.frames_dir}")
+            return disk_bytes
+
+        end_timestamp = max(end_timestamp, self._timestamps[-1] + INTERVAL)
+        ends = [*self._timestamps[1:], end_timestamp]
+        script = "ffconcat version 1.0\n" + "".join(
+            _concat_entry(self._file_ref(f), end - start) for f, start, end in zip(frame_files, self._timestamps, ends)
+        )
+        # The concat demuxer only honours the last duration when the last file is listed again
+        script += _concat_entry(self._file_ref(frame_files[-1]), None)
+        concat_file = self.frames_dir / "frames.ffconcat"
+        concat_file.write_text(script)
+
+        ffmpeg_cmd = ["ffmpeg", "-y", *CONCAT_INPUT_ARGS, "-i", str(concat_file), *ENCODER_ARGS, str(self.video_path)]
+
+        try:
+            subprocess.run(ffmpeg_cmd, check=True, capture_output=True, text=True)
+            logger.info(f"Video created: {self.video_path}")
+        except Exception as e:
+            logger.error(f"ffmpeg failed: {e}")
+        disk_bytes += concat_file.stat().st_size
+        return disk_bytes + (self.video_path.stat().st_size if self.video_path.exists() else 0)
+
+    def _file_ref(self, frame_file: Path) -> str:
+        # Paths in the script are resolved relative to the script's directory
+        return str(frame_file) if self.store is not None else frame_file.name
+
+    def discard(self) -> int:
+        """Delete the written frames without encoding them and return the bytes that had been written."""
+        if self.store is not None:
+            disk_bytes = self._stored_bytes
+        else:
+            disk_bytes = sum(f.stat().st_size for f in self.frames_dir.glob(f"frame_*.{self.extension}"))
+        shutil.rmtree(self.frames_dir, ignore_errors=True)
+        return disk_bytes
+
+
+class FfmpegPipeSink:
+    """
+    Streams unique frames into a single ffmpeg process over stdin, encoded while the test runs.
+    Each frame is a Matroska block carrying its capture timestamp, so the variable frame rate
+    (duplicates dropped, adaptive rate changes) needs no per-frame durations.
+    """
+
+    def __init__(self, video_path: Path, mime_type: str = "image/png") -> None:
+        self.video_path = video_path
+        self.mime_type = mime_type
+        self.frames = 0
+        self._first_timestamp: float | None = None
+        self._last: tuple[bytes, int] | None = None
+        self._cluster_ms: int | None = None
+        self.video_path.parent.mkdir(parents=True, exist_ok=True)
+        ffmpeg_cmd = [
+            "ffmpeg",
+            "-y",
+            "-loglevel",
+            "error",
+            *PIPE_INPUT_ARGS,
+            "-i",
+            "-",
+            *ENCODER_ARGS,
+            str(self.video_path),
+        ]
+        self._proc = subprocess.Popen(
+            ffmpeg_cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
+        self._write_stream(_matroska_header(mime_type))
+
+    def _write_stream(self, data: bytes) -> None:
+        assert self._proc.stdin is not None
+        self._proc.stdin.write(data)
+
+    def _write_block(self, frame: bytes, timestamp_ms: int) -> None:
+        data = b""
+        if self._cluster_ms is None or timestamp_ms - self._cluster_ms >= MATROSKA_CLUSTER_MS:
+            self._cluster_ms = timestamp_ms
+            data += (0x1F43B675).to_bytes(4, "big") + _EBML_UNKNOWN_SIZE + _ebml(0xE7, timestamp_ms)
+        # SimpleBlock: track 1, timestamp relative to the cluster, keyframe
+        block = b"\x81" + struct.pack(">hB", timestamp_ms - self._cluster_ms, 0x80) + frame
+        self._write_stream(data + _ebml(0xA3, block))
+        self._last = (frame, timestamp_ms)
+
+    def write(self, frame: bytes, timestamp: float) -> None:
+        if self._first_timestamp is None:
+            self._first_timestamp = timestamp
+        timestamp_ms = round((timestamp - self._first_timestamp) * 1000)
+        # Timestamps must not go backwards (wall clock adjustments while polling)
+        if self._last is not None:
+            timestamp_ms = max(timestamp_ms, self._last[1] + 1)
+        self._write_block(frame, timestamp_ms)
+        self.frames += 1
+
+    def discard(self) -> int:
+        """Stop ffmpeg without producing a video."""
+        self._proc.kill()
+        self._proc.communicate()
+        self.video_path.unlink(missing_ok=True)
+        return 0
+
+    def close(self, end_timestamp: float) -> int:
+        """End the stream, wait for the encode to finish and return the bytes written to disk."""
+        if self._last is None or self._first_timestamp is None:
+            logger.warning(f"No frames recorded for {self.video_path.name}")
+            return self.discard()
+        try:
+            # The last frame stays on screen until the recording ended
+            frame, timestamp_ms = self._last
+            end_ms = round((end_timestamp - self._first_timestamp) * 1000)
+            self._write_block(frame, max(end_ms, timestamp_ms + round(INTERVAL * 1000)))
+            _, stderr = self._proc.communicate(timeout=FFMPEG_EXIT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            _, stderr = self._proc.communicate()
+        except BrokenPipeError:
+            _, stderr = self._proc.communicate()
+        if self._proc.returncode != 0:
+            logger.error(f"ffmpeg failed ({self._proc.returncode}): {stderr.decode(errors='replace').strip()}")
+        else:
+            logger.info(f"Video created: {self.video_path}")
+        return self.video_path.stat().st_size if self.video_path.exists() else 0
+
+
+class RingBufferSink:
+    """
+    Keeps the most recent unique frames in memory, bounded by duration and total size.
+    Nothing is written or encoded unless close() is called; discard() just drops the buffer.
+    """
+
+    def __init__(
+        self, video_path: Path, mime_type: str, max_seconds: float = RING_SECONDS, max_bytes: int = RING_MAX_BYTES
+    ) -> None:
+        self.video_path = video_path
+        self.mime_type = mime_type
+        self.max_seconds = max_seconds
+        self.max_bytes = max_bytes
+        self.frames = 0
+        self._buffer: deque[tuple[bytes, float]] = deque()
+        self._bytes = 0
+
+    def write(self, frame: bytes, timestamp: float) -> None:
+        self._buffer.append((frame, timestamp))
+        self._bytes += len(frame)
+        self.frames += 1
+        # The oldest frame stays while it is still on screen at the start of the window
+        while len(self._buffer) > 1 and (
+            self._buffer[1][1] <= timestamp - self.max_seconds or self._bytes > self.max_bytes
+        ):
+            self._bytes -= len(self._buffer.popleft()[0])
+
+    def discard(self) -> int:
+        self._buffer.clear()
+        self._bytes = 0
+        return 0
+
+    def close(self, end_timestamp: float) -> int:
+        """Encode the buffered window and return the bytes written to disk."""
+        if not self._buffer:
+            logger.warning(f"No frames recorded for {self.video_path.name}")
+            return 0
+        window_start = max(self._buffer[-1][1], end_timestamp) - self.max_seconds
+        logger.info(f"Encoding the last {len(self._buffer)} buffered frames ({self._bytes} bytes).")
+        sink = FfmpegPipeSink(self.video_path, self.mime_type)
+        try:
+            for frame, timestamp in self._buffer:
+                sink.write(frame, max(timestamp, window_start))
+        except BrokenPipeError:
+            logger.error("ffmpeg closed its input while encoding the ring buffer.")
+        self.discard()
+        return sink.close(end_timestamp)
+
+
+@dataclass
+class _QueuedFrame:
+    timestamp: float
+    frame: bytes | str
+    queued_at: float
+    on_processed: Callable[[float], None] | None = None
+
+
+class _FrameWriter:
+    """
+    Consumes timestamped frames on its own thread, drops consecutive duplicates by content hash
+    and passes unique frames with their capture timestamp to the sink.
+    """
+
+    def __init__(self, sink: FrameDirSink | FfmpegPipeSink | RingBufferSink) -> None:
+        self.sink = sink
+        self.captured = 0
+        self.dropped = 0
+        self.duplicates = 0
+        self._queue: queue.Queue[_QueuedFrame | None] = queue.Queue(maxsize=FRAME_QUEUE_SIZE)
+        self._last_digest = b""
+        self._thread = threading.Thread(target=self._run, name="video-writer", daemon=True)
+        self._thread.start()
 
-    stop_event = threading.Event()
+    @property
+    def backlogged(self) -> bool:
+        """True when the writer is falling behind and capture should back off."""
+        return self._queue.qsize() >= FRAME_QUEUE_SIZE // 2
+
+    def put(self, timestamp: float, frame: bytes | str, on_processed: Callable[[float], None] | None = None) -> None:
+        """
+        Queue a frame (raw bytes or base64); dropped and counted if the writer is behind.
+        on_processed is called from the writer thread with the frame's queueing lag once it was handled.
+        """
+        self.captured += 1
+        try:
+            self._queue.put_nowait(_QueuedFrame(timestamp, frame, time.monotonic(), on_processed))
+        except queue.Full:
+            self.dropped += 1
+            logger.debug("Video writer is behind, frame dropped.")
+            if on_processed is not None:
+                on_processed(0.0)
+
+    def skip(self) -> None:
+        """Count a capture skipped because the writer is behind, like a frame dropped from a full queue."""
+        self.captured += 1
+        self.dropped += 1
+
+    def _run(self) -> None:
+        broken = False
+        while (item := self._queue.get()) is not None:
+            try:
+                if not broken:
+                    self._process(item.timestamp, item.frame)
+            except BrokenPipeError:
+                logger.error("ffmpeg closed its input, discarding further frames.")
+                broken = True
+            except Exception as e:
+                logger.error(f"Video writer error: {e}")
+            if item.on_processed is not None:
+                item.on_processed(time.monotonic() - item.queued_at)
 
-    def capture_loop() -> None:
+    def _process(self, timestamp: float, frame: bytes | str) -> None:
+        raw = base64.b64decode(frame) if isinstance(frame, str) else frame
+        if len(raw) <= MIN_FRAME_SIZE:
+            logger.debug(f"Frame skipped (size: {len(raw)})")
+            return
+        digest = hashlib.blake2b(raw, digest_size=16).digest()
+        if digest == self._last_digest:
+            self.duplicates += 1
+            return
+        self._last_digest = digest
+        self.sink.write(raw, timestamp)
+
+    def finish(self) -> None:
+        """Flush queued frames to the sink."""
+        self._queue.put(None)
+        self._thread.join(timeout=10)
+
+
+class _PollingSource:
+    """
+    Takes screenshots in a loop, through the instrumentation hub when one is connected
+    (so the test's WebDriver connection stays free), otherwise through the WebDriver.
+    The loop rate adapts to the screenshot latency; ticks are skipped (and counted as dropped)
+    while the writer is backlogged. Resolution isn't adjustable for driver screenshots.
+    """
+
+    name = "polling"
+    extension = "png"
+    mime_type = "image/png"
+
+    def __init__(self, driver: WebDriver, hub: InstrumentationHub | None = None) -> None:
+        self.driver = driver
+        self.hub = hub if hub is not None and hub.available else None
+        self.rate = AdaptiveRate()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self, writer: _FrameWriter) -> None:
+        if self.hub is None:
+            _polling_sessions.add(str(self.driver.session_id))
+        self._thread = threading.Thread(target=self._capture_loop, args=(writer,), daemon=True)
+        self._thread.start()
+
+    def _capture_loop(self, writer: _FrameWriter) -> None:
         logger.info("Capture loop started.")
-        idx = 0
-        while not stop_event.is_set():
+        while not self._stop_event.is_set():
+            tick = time.monotonic()
             try:
-                if not getattr(driver, "session_id", None):
+                if not getattr(self.driver, "session_id", None):
                     break
 
-                if isinstance(driver, webdriver.Chrome):
-                    res = driver.execute_cdp_cmd("Page.captureScreenshot", {"format": "png", "fromSurface": True})
+                if writer.backlogged:
+                    writer.skip()
+                elif self.hub is not None:
+                    writer.put(time.time(), self.hub.screenshot_base64())
+                elif isinstance(self.driver, webdriver.Chrome):
+                    res = self.driver.execute_cdp_cmd("Page.captureScreenshot", {"format": "png", "fromSurface": True})
                     data = res.get("data")
                     if data:
-                        raw = base64.b64decode(data)
-                else:
-                    logger.info("Using Firefox screenshot method.")
-                    raw = driver.get_screenshot_as_png()
-
-                if len(raw) > MIN_FRAME_SIZE and (not MAX_FRAMES or idx < MAX_FRAMES):
-                    frame_file = frames_dir / f"frame_{idx:06d}.png"
-                    frame_file.write_bytes(raw)
-                    idx += 1
+                        writer.put(time.time(), data)
                 else:
-                    logger.debug(f"Frame {idx} skipped (size: {len(raw)})")
+                    writer.put(time.time(), self.driver.get_screenshot_as_png())
+                self.rate.record(time.monotonic() - tick)
             except Exception as e:
                 logger.error(f"Capture error: {e}")
                 if "invalid session id" in str(e).lower():
                     break
-            time.sleep(INTERVAL)
+            self._stop_event.wait(max(0.0, self.rate.interval - (time.monotonic() - tick)))
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        _polling_sessions.discard(str(self.driver.session_id))
+
+
+class _ScreencastSource:
+    """
+    Receives frames pushed by Chrome via Page.startScreencast on a dedicated CDP connection,
+    the instrumentation hub's when one is connected (it is left open on stop).
+    Frames are acked only once the writer handled them, so Chrome never runs ahead of the writer.
+    The writer lag drives the adaptive rate, applied by restarting the screencast with a new
+    everyNthFrame and maximum frame size.
+    """
 
-    thread = threading.Thread(target=capture_loop, daemon=True)
-    thread.start()
+    name = "screencast"
+    extension = "jpg"
+    mime_type = "image/jpeg"
 
-    def stop_and_assemble() -> None:
-        logger.info("Stopping video recording and assembling.")
-        stop_event.set()
-        thread.join(timeout=5)
-        logger.info(f"Thread joined. Frames dir: {frames_dir}")
+    def __init__(
+        self,
+        driver: WebDriver,
+        debug_port: int,
+        quality: int,
+        max_width: int,
+        max_height: int,
+        hub: InstrumentationHub | None = None,
+    ) -> None:
+        self.hub = hub if hub is not None and hub.available and hub.is_cdp else None
+        self.target_id = driver.current_window_handle
+        self.debug_port = debug_port
+        self.quality = quality
+        self.max_width = max_width
+        self.max_height = max_height
+        self.rate = AdaptiveRate()
+        self._cdp: CdpClient | None = None
+        self._session_id = ""
+        self._writer: _FrameWriter | None = None
 
-        frame_files = sorted(frames_dir.glob("frame_*.png"))
-        valid_frames = [f for f in frame_files if f.stat().st_size > MIN_FRAME_SIZE]
-        logger.info(f"Found {len(valid_frames)} valid frames.")
+    @property
+    def params(self) -> dict[str, Any]:
+        return {
+            "format": "jpeg",
+            "quality": self.quality,
+            "maxWidth": int(self.max_width * self.rate.scale),
+            "maxHeight": int(self.max_height * self.rate.scale),
+            "everyNthFrame": max(1, round(SCREENCAST_SOURCE_FPS / self.rate.fps)),
+        }
 
-        if not valid_frames:
-            logger.warning(f"No valid frames for {test_name}")
+    def start(self, writer: _FrameWriter) -> None:
+        self._writer = writer
+        if self.hub is not None:
+            assert self.hub.client is not None
+            self._cdp = self.hub.client
+            self._session_id = self.hub.page_session
+            self._cdp.on("Page.screencastFrame", self._on_frame, self._session_id)
+            self._cdp.send("Page.startScreencast", self.params, self._session_id)
+            logger.info(f"Screencast started on target {self.target_id} over the instrumentation hub.")
             return
+        self._cdp = CdpClient.from_debug_port(self.debug_port)
+        try:
+            self._session_id = self._cdp.attach_to_page(self.target_id)
+            self._cdp.on("Page.screencastFrame", self._on_frame, self._session_id)
+            self._cdp.send("Page.startScreencast", self.params, self._session_id)
+        except Exception:
+            self._cdp.close()
+            raise
+        logger.info(f"Screencast started on target {self.target_id}.")
 
-        ffmpeg_cmd = [
-            "ffmpeg",
-            "-y",
-            "-framerate",
-            str(FPS),
-            "-i",
-            str(frames_dir / "frame_%06d.png"),
-            "-vf",
-            "scale=trunc(iw/2)*2:trunc(ih/2)*2,format=yuv420p",
-            "-c:v",
-            "libx264",
-            "-pix_fmt",
-            "yuv420p",
-            str(video_path),
-        ]
+    def _on_frame(self, params: dict[str, Any]) -> None:
+        assert self._writer is not None
+        timestamp = params.get("metadata", {}).get("timestamp") or time.time()
+        self._writer.put(timestamp, params["data"], partial(self._on_processed, params["sessionId"]))
 
+    def _on_processed(self, frame_id: int, lag: float) -> None:
+        if self._cdp is None or self._cdp.closed:
+            return
         try:
-            subprocess.run(ffmpeg_cmd, check=True, capture_output=True, text=True)
-            logger.info(f"Video created: {video_path}")
+            if self.rate.record(lag):
+                # Restart with the new rate/size; commands are sent in order on the same connection
+                self._cdp.send_async("Page.stopScreencast", session_id=self._session_id)
+                self._cdp.send_async("Page.startScreencast", self.params, self._session_id)
+            else:
+                self._cdp.send_async("Page.screencastFrameAck", {"sessionId": frame_id}, self._session_id)
         except Exception as e:
-            logger.error(f"ffmpeg failed: {e}")
+            logger.debug(f"Failed to ack screencast frame: {str(e)}")
+
+    def stop(self) -> None:
+        if self._cdp is None:
+            return
+        try:
+            self._cdp.send("Page.stopScreencast", session_id=self._session_id)
+        except Exception as e:
+            logger.debug(f"Failed to stop screencast: {str(e)}")
+        if self.hub is not None:
+            self._cdp.off("Page.screencastFrame", self._on_frame, self._session_id)
+        else:
+            self._cdp.close()
+
+
+def _create_source(
+    driver: WebDriver,
+    debug_port: int | None,
+    quality: int,
+    max_width: int,
+    max_height: int,
+    hub: InstrumentationHub | None,
+) -> _PollingSource | _ScreencastSource:
+    if isinstance(driver, webdriver.Chrome) and debug_port is not None:
+        return _ScreencastSource(driver, debug_port, quality, max_width, max_height, hub)
+    return _PollingSource(driver, hub)
+
+
+def start_video_recording(
+    driver: WebDriver,
+    test_name: str,
+    worker_id: str = "local",
+    mode: str = "pipe",
+    debug_port: int | None = None,
+    quality: int = JPEG_QUALITY,
+    max_width: int = MAX_WIDTH,
+    max_height: int = MAX_HEIGHT,
+    ring_seconds: float = RING_SECONDS,
+    hub: InstrumentationHub | None = None,
+    store: ArtifactStore | None = None,
+) -> tuple[Callable[[bool, EncodeQueue | None], tuple[RecordingStats, Future[RecordingStats]]], str]:
+    """
+    Starts background video recording for a test.
+
+    Args:
+        driver: WebDriver to record
+        test_name: Name used for the output directory and file
+        worker_id: xdist worker id
+        mode: Recorder mode, "pipe", "frames" or "on_failure"
+        debug_port: Chrome remote debugging port, enables the screencast source
+        quality: Screencast JPEG quality (0-100)
+        max_width: Maximum screencast frame width
+        max_height: Maximum screencast frame height
+        ring_seconds: Seconds of video kept in memory in "on_failure" mode
+        hub: Instrumentation hub of the driver; frames are captured over its connection when given
+        store: Artifact store holding the frames in "frames" mode
+
+    Returns:
+        tuple: (stop_func, video_path), stop_func(keep, encode_queue) stops capturing and encodes the video
+            (or discards it when keep is False). Encoding runs on encode_queue when given. It returns the
+            RecordingStats with the capture figures filled in, and a future resolving to the same stats
+            once encoding finished
+    """
+    if mode not in RECORDER_MODES:
+        raise ValueError(f"Unknown recorder mode '{mode}'. Options: {', '.join(RECORDER_MODES)}")
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    base_dir = Path("tests_recordings") / worker_id / f"{test_name}_{timestamp}"
+    video_path = base_dir / f"{test_name}_{timestamp}.mp4"
+
+    source = _create_source(driver, debug_port, quality, max_width, max_height, hub)
+
+    def create_writer() -> _FrameWriter:
+        if mode == "pipe":
+            return _FrameWriter(FfmpegPipeSink(video_path, source.mime_type))
+        if mode == "on_failure":
+            return _FrameWriter(RingBufferSink(video_path, source.mime_type, ring_seconds))
+        return _FrameWriter(FrameDirSink(base_dir / "frames", video_path, source.extension, store))
+
+    writer = create_writer()
+    try:
+        source.start(writer)
+    except Exception as e:
+        if not isinstance(source, _ScreencastSource):
+            raise
+        logger.warning(f"Screencast unavailable, falling back to screenshot polling: {str(e)}")
+        writer.finish()
+        writer.sink.discard()
+        source = _PollingSource(driver, hub)
+        writer = create_writer()
+        source.start(writer)
+    recording_started = time.time()
+
+    def stop_and_assemble(
+        keep: bool = True, encode_queue: EncodeQueue | None = None
+    ) -> tuple[RecordingStats, Future[RecordingStats]]:
+        logger.info("Stopping video recording and assembling." if keep else "Stopping and discarding video recording.")
+        started = time.perf_counter()
+        source.stop()
+        writer.finish()
+        end_timestamp = time.time()
+        duration = max(end_timestamp - recording_started, INTERVAL)
+        stats = RecordingStats(
+            source=source.name,
+            frames=writer.sink.frames,
+            duplicate_frames=writer.duplicates,
+            captured_frames=writer.captured,
+            dropped_frames=writer.dropped,
+            effective_fps=round((writer.captured - writer.dropped) / duration, 2),
+            lowest_fps=source.rate.lowest_fps,
+            lowest_scale=source.rate.lowest_scale,
+        )
+
+        def encode() -> RecordingStats:
+            encode_started = time.perf_counter()
+            stats.disk_bytes_written = writer.sink.close(end_timestamp) if keep else writer.sink.discard()
+            stats.encode_seconds = time.perf_counter() - encode_started
+            logger.info(
+                f"Recording finished: {stats.frames} unique frames ({stats.duplicate_frames} duplicates, "
+                f"{stats.dropped_frames} dropped, {stats.effective_fps} effective FPS), "
+                f"{stats.disk_bytes_written} bytes written to disk, encode {stats.encode_seconds:.2f}s "
+                f"({source.name} source, {mode} mode)."
+            )
+            return stats
+
+        if keep and encode_queue is not None:
+            queued = encode_queue.submit(encode, label=video_path.name)
+            stats.teardown_seconds = time.perf_counter() - started
+            return stats, queued
+
+        encoded: Future[RecordingStats] = Future()
+        encoded.set_result(encode())
+        stats.teardown_seconds = time.perf_counter() - started
+        return stats, encoded
 
     return stop_and_assemble, str(video_path)
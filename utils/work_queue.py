@@ -0,0 +1,305 @@
+"""
+Work queue shared by pytest processes on any number of hosts (dynamic distribution of one run).
+Every process seeds the queue with its collection (longest tests first, from the duration
+history) and then claims one nodeid at a time; a failed attempt is put back for any process to
+rerun. The queue is an SQLite file on a shared volume, or the same queue served over XML-RPC
+by `serve` when the hosts share no volume.
+Claims expire after a lease, so tests of a crashed process are handed out again; only the
+consumer holding a claim can renew or complete it.
+
+Usage:
+    python -m utils.work_queue serve --db test_history/queue.sqlite [--host 0.0.0.0] [--port 8765]
+    python -m utils.work_queue status --db test_history/queue.sqlite --run <run id>
+    python -m utils.work_queue merge --allure host1/allure-results host2/allure-results --allure-out merged
+    python -m utils.work_queue merge --junit host1.xml host2.xml --junit-out merged.xml
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import shutil
+import sqlite3
+import time
+import xml.etree.ElementTree as ET
+import xmlrpc.client
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+from xmlrpc.server import SimpleXMLRPCServer
+
+DEFAULT_PORT = 8765
+DEFAULT_LEASE_SECONDS = 900
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue_runs (
+    run_id TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS work (
+    run_id TEXT NOT NULL,
+    nodeid TEXT NOT NULL,
+    priority REAL NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    consumer TEXT,
+    claimed_at REAL,
+    outcome TEXT,
+    seconds REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (run_id, nodeid)
+);
+CREATE INDEX IF NOT EXISTS work_state ON work (run_id, state, priority);
+"""
+
+# JUnit outcome elements, worst first: of duplicate testcases (reruns) the worst one is kept
+_JUNIT_SEVERITY = ("error", "failure", "skipped")
+
+
+def collection_fingerprint(nodeids: list[str]) -> str:
+    """Processes of one run must have collected exactly the same tests."""
+    return hashlib.sha256("\n".join(sorted(nodeids)).encode()).hexdigest()[:16]
+
+
+class WorkQueue:
+    """
+    SQLite-backed queue of test nodeids per run. Every method is one short transaction, so any
+    number of processes can share the file; the XML-RPC server exposes the same methods.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def _transaction(self) -> Generator[sqlite3.Connection, None, None]:
+        conn = sqlite3.connect(self.db_path, timeout=60, isolation_level=None)
+        try:
+            conn.executescript(SCHEMA)
+            # Take the write lock up front so two claims can't read the same pending row
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def seed(self, run_id: str, fingerprint: str, items: list[list[Any]]) -> bool:
+        """
+        Add the run's tests once; later processes of the same run only check their collection.
+
+        Args:
+            run_id: Identifies the run shared by all processes (e.g. the CI build id)
+            fingerprint: collection_fingerprint() of the process's collection
+            items: [nodeid, priority] pairs; higher priority is handed out first
+
+        Returns:
+            bool: False if the run was seeded with a different collection
+        """
+        with self._transaction() as conn:
+            row = conn.execute("SELECT fingerprint FROM queue_runs WHERE run_id = ?", (run_id,)).fetchone()
+            if row is not None:
+                return row[0] == fingerprint
+            conn.execute("INSERT INTO queue_runs VALUES (?, ?, ?)", (run_id, fingerprint, time.time()))
+            conn.executemany(
+                "INSERT INTO work (run_id, nodeid, priority) VALUES (?, ?, ?)",
+                [(run_id, nodeid, priority) for nodeid, priority in items],
+            )
+            return True
+
+    def claim(self, run_id: str, consumer: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> str | None:
+        """Hand out the next pending test (or one whose claim expired), None when there is none right now."""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT nodeid FROM work WHERE run_id = ? AND "
+                "(state = 'pending' OR (state = 'running' AND claimed_at < ?)) "
+                "ORDER BY priority DESC, nodeid LIMIT 1",
+                (run_id, now - lease_seconds),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE work SET state = 'running', consumer = ?, claimed_at = ? WHERE run_id = ? AND nodeid = ?",
+                (consumer, now, run_id, row[0]),
+            )
+            return row[0]
+
+    def attempts(self, run_id: str, nodeid: str) -> int:
+        """Finished attempts of a test so far (a running attempt is not counted)."""
+        with self._transaction() as conn:
+            row = conn.execute("SELECT attempts FROM work WHERE run_id = ? AND nodeid = ?", (run_id, nodeid)).fetchone()
+        return row[0] if row else 0
+
+    def renew(self, run_id: str, nodeid: str, consumer: str) -> bool:
+        """
+        Restart the lease of a test claimed ahead of time, so it doesn't expire while an earlier one runs.
+
+        Returns:
+            bool: False if the claim expired and another consumer has claimed the test since
+        """
+        with self._transaction() as conn:
+            return (
+                conn.execute(
+                    "UPDATE work SET claimed_at = ? WHERE run_id = ? AND nodeid = ? AND state = 'running' "
+                    "AND consumer = ?",
+                    (time.time(), run_id, nodeid, consumer),
+                ).rowcount
+                == 1
+            )
+
+    def complete(self, run_id: str, nodeid: str, consumer: str, outcome: str, seconds: float) -> bool | None:
+        """
+        Record an attempt. A "rerun" outcome puts the test back in the queue for any process.
+        Only the consumer holding the claim can complete it: after an expired lease the test
+        belongs to whoever claimed it next, and a late result must not overwrite theirs.
+
+        Returns:
+            bool | None: True if the test was requeued, None if the consumer no longer held the claim
+        """
+        requeue = outcome == "rerun"
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE work SET state = ?, attempts = attempts + 1, outcome = ?, seconds = seconds + ?, "
+                "consumer = CASE WHEN ? THEN NULL ELSE consumer END "
+                "WHERE run_id = ? AND nodeid = ? AND state = 'running' AND consumer = ?",
+                ("pending" if requeue else "done", outcome, seconds, requeue, run_id, nodeid, consumer),
+            ).rowcount
+        return requeue if updated else None
+
+    def progress(self, run_id: str) -> dict[str, int]:
+        """Test counts per state and per final outcome, plus the number of attempts that were rerun."""
+        with self._transaction() as conn:
+            counts = dict(conn.execute("SELECT state, COUNT(*) FROM work WHERE run_id = ? GROUP BY state", (run_id,)))
+            outcomes = conn.execute(
+                "SELECT outcome, COUNT(*) FROM work WHERE run_id = ? AND state = 'done' GROUP BY outcome", (run_id,)
+            ).fetchall()
+            reruns = conn.execute(
+                "SELECT COALESCE(SUM(attempts - (state = 'done')), 0) FROM work WHERE run_id = ?", (run_id,)
+            ).fetchone()[0]
+        progress = {state: counts.get(state, 0) for state in ("pending", "running", "done")}
+        progress.update({outcome: count for outcome, count in outcomes})
+        progress["reruns"] = reruns
+        return progress
+
+
+def open_queue(address: str) -> Any:
+    """A WorkQueue for a database path, or an XML-RPC proxy to a `serve` process for an http:// address."""
+    if address.startswith(("http://", "https://")):
+        return xmlrpc.client.ServerProxy(address, allow_none=True)
+    return WorkQueue(Path(address))
+
+
+# ============================================================================
+# Merging per-host results
+# ============================================================================
+
+
+def merge_allure(sources: list[Path], destination: Path) -> int:
+    """Copy Allure result directories into one; result and attachment files are uuid-named, so none collide."""
+    destination.mkdir(parents=True, exist_ok=True)
+    copied = 0
+    for source in sources:
+        for path in source.iterdir():
+            if path.is_file():
+                shutil.copy2(path, destination / path.name)
+                copied += 1
+    return copied
+
+
+def _junit_severity(testcase: ET.Element) -> int:
+    for rank, tag in enumerate(_JUNIT_SEVERITY):
+        if testcase.find(tag) is not None:
+            return rank
+    return len(_JUNIT_SEVERITY)
+
+
+def merge_junit(sources: list[Path], destination: Path) -> int:
+    """
+    Merge JUnit XML files into one testsuite. A rerun attempt leaves a testcase without an outcome
+    element, so of duplicates the worst one (the final failure, if any) is kept.
+
+    Returns:
+        int: Number of testcases written
+    """
+    testcases: dict[tuple[str, str], ET.Element] = {}
+    for source in sources:
+        for testcase in ET.parse(source).getroot().iter("testcase"):
+            key = (testcase.get("classname", ""), testcase.get("name", ""))
+            if key not in testcases or _junit_severity(testcase) < _junit_severity(testcases[key]):
+                testcases[key] = testcase
+
+    cases = list(testcases.values())
+    suite = ET.Element(
+        "testsuite",
+        name="pytest",
+        tests=str(len(cases)),
+        errors=str(sum(case.find("error") is not None for case in cases)),
+        failures=str(sum(case.find("failure") is not None for case in cases)),
+        skipped=str(sum(case.find("skipped") is not None for case in cases)),
+        time=f"{sum(float(case.get('time', 0)) for case in cases):.3f}",
+    )
+    suite.extend(cases)
+    root = ET.Element("testsuites")
+    root.append(suite)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(root).write(destination, encoding="utf-8", xml_declaration=True)
+    return len(cases)
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+
+def cmd_serve(args: argparse.Namespace) -> None:
+    # Requests are handled one at a time, so the queue needs no further locking
+    server = SimpleXMLRPCServer((args.host, args.port), allow_none=True, logRequests=False)
+    server.register_instance(WorkQueue(args.db))
+    print(f"Serving work queue {args.db} on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+def cmd_status(args: argparse.Namespace) -> None:
+    print(WorkQueue(args.db).progress(args.run))
+
+
+def cmd_merge(args: argparse.Namespace) -> None:
+    if args.allure:
+        print(f"Merged {merge_allure(args.allure, args.allure_out)} Allure files into {args.allure_out}")
+    if args.junit:
+        print(f"Merged {merge_junit(args.junit, args.junit_out)} JUnit testcases into {args.junit_out}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Multi-host test work queue.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Serve a queue database over XML-RPC")
+    serve.add_argument("--db", type=Path, required=True, help="Queue database path")
+    serve.add_argument("--host", default="0.0.0.0")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.set_defaults(func=cmd_serve)
+
+    status = commands.add_parser("status", help="Progress of a run")
+    status.add_argument("--db", type=Path, required=True, help="Queue database path")
+    status.add_argument("--run", required=True, help="Run id")
+    status.set_defaults(func=cmd_status)
+
+    merge = commands.add_parser("merge", help="Merge Allure result directories and/or JUnit files of all hosts")
+    merge.add_argument("--allure", type=Path, nargs="*", default=[], help="Allure result directories")
+    merge.add_argument("--allure-out", type=Path, default=Path("reports") / "allure-results")
+    merge.add_argument("--junit", type=Path, nargs="*", default=[], help="JUnit XML files")
+    merge.add_argument("--junit-out", type=Path, default=Path("reports") / "junit.xml")
+    merge.set_defaults(func=cmd_merge)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()